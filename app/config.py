@@ -13,6 +13,47 @@ JIRA_ADMIN_GROUP = os.getenv("JIRA_BASE_URL", "jira-admins-de101")
 JIRA_PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "DATA")
 JIRA_MAX_RESULTS = 500
 JIRA_TICKETS_PER_PAGE = 10
+JIRA_PII_FIELD = "customfield_10071"  # PII_YN custom field
+JIRA_APPROVE_TRANSITION_NAME = "Approve Data Extraction Request"
+JIRA_BULK_APPROVE_CONCURRENCY = int(os.getenv("JIRA_BULK_APPROVE_CONCURRENCY", 8))
+JIRA_APPROVED_STATUS_NAME = os.getenv("JIRA_APPROVED_STATUS_NAME", "Request Approved")
+JIRA_ATTACHMENT_MAX_BYTES = int(
+    os.getenv("JIRA_ATTACHMENT_MAX_BYTES", 100 * 1024 * 1024)
+)  # archives larger than 100MB are split into multiple volumes
+JIRA_UPLOAD_CONCURRENCY = int(os.getenv("JIRA_UPLOAD_CONCURRENCY", 4))
+JIRA_UPLOAD_RETRIES = 3
+JIRA_UPLOAD_BACKOFF_SECONDS = 1.0
+
+# jira service account, used by extractions queued from jira webhooks
+JIRA_SERVICE_EMAIL = os.getenv("JIRA_SERVICE_EMAIL")
+JIRA_SERVICE_API_TOKEN = os.getenv("JIRA_SERVICE_API_TOKEN")
+JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+
+# extraction queue
+EXTRACTION_QUEUE_KEY = "extraction:queue"
+EXTRACTION_QUEUED_KEY_PREFIX = "extraction:queued"
+EXTRACTION_QUEUED_EXPIRE_SECONDS = 6 * 3600  # dedupe window of a queued ticket
+EXTRACTION_QUEUE_POLL_SECONDS = 1  # must stay below redis socket_timeout
+ENABLE_EXTRACTION_WORKER = os.getenv("ENABLE_EXTRACTION_WORKER", "true") == "true"
+EXTRACTION_BATCH_MAX_TICKETS = int(
+    os.getenv("EXTRACTION_BATCH_MAX_TICKETS", 20)
+)  # queued tickets extracted together in one batch
+EXTRACTION_BATCH_LOOKUP_SIZE = int(
+    os.getenv("EXTRACTION_BATCH_LOOKUP_SIZE", 50000)
+)  # keys per users query of a batch lookup
+
+# jira rate limit shared by all workers
+JIRA_RATE_LIMIT_KEY_PREFIX = "jira:rate_limit"
+JIRA_RATE_LIMIT_PER_SECOND = float(os.getenv("JIRA_RATE_LIMIT_PER_SECOND", 10))
+JIRA_RATE_LIMIT_BURST = int(os.getenv("JIRA_RATE_LIMIT_BURST", 20))
+JIRA_CONCURRENCY_MIN = 1
+JIRA_CONCURRENCY_MAX = int(
+    os.getenv("JIRA_CONCURRENCY_MAX", 16)
+)  # in-flight jira requests grow by ~1 per window of successes up to this
+JIRA_CONCURRENCY_DECREASE_COOLDOWN_SECONDS = 1  # one halving per burst of 429s
+JIRA_REQUEST_SLOT_TTL_SECONDS = 300  # in-flight slot of a crashed worker expires
+JIRA_THROTTLE_RETRIES = 5
+JIRA_RETRY_AFTER_DEFAULT_SECONDS = 5  # used when 429 has no Retry-After header
 
 # MySQL
 MYSQL_HOST = os.getenv("MYSQL_HOST", "127.0.0.1")
@@ -21,15 +62,179 @@ MYSQL_USER = os.getenv("MYSQL_USER", "root")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "root")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "data_request")
 ALLOW_LOCAL_INFILE = True
+MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", 5))
+MYSQL_REPLICA_HOSTS = [
+    host.strip()
+    for host in os.getenv("MYSQL_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+]  # comma separated "host" or "host:port" list of read replicas
+MYSQL_REPLICA_MAX_LAG_SECONDS = int(os.getenv("MYSQL_REPLICA_MAX_LAG_SECONDS", 30))
+MYSQL_REPLICA_LAG_CHECK_SECONDS = 10  # cache replica lag check results
+
+# schema migrations
+MIGRATIONS_PATH = os.path.join(os.path.dirname(__file__), "migrations")
+MIGRATIONS_TABLE = "schema_migrations"
+MIGRATION_LOCK_NAME = "data_request_schema_migrations"
+MIGRATION_LOCK_TIMEOUT_SECONDS = 60  # wait for migrations run by another worker
+# off by default, migrations on the users table run as an explicit deploy step
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "false") == "true"
+MIGRATION_STARTUP_TIMEOUT_SECONDS = int(
+    os.getenv("MIGRATION_STARTUP_TIMEOUT_SECONDS", 60)
+)  # keep retrying while mysql is still starting
+
+# readiness probes and startup warm-up
+READINESS_CACHE_SECONDS = int(
+    os.getenv("READINESS_CACHE_SECONDS", 5)
+)  # load balancer polls are answered from cache within this window
+READINESS_PROBE_TIMEOUT_SECONDS = float(os.getenv("READINESS_PROBE_TIMEOUT_SECONDS", 2))
+READINESS_REQUIRED_CHECKS = [
+    name.strip()
+    for name in os.getenv("READINESS_REQUIRED_CHECKS", "redis,mysql").split(",")
+    if name.strip()
+]  # jira is probed and reported, but an atlassian outage should not drain every worker
+ENABLE_STARTUP_WARM_UP = os.getenv("ENABLE_STARTUP_WARM_UP", "true") == "true"
+
+# audit log and extraction history
+AUDIT_LOG_BATCH_SIZE = 500  # maximum rows per multi-row insert
+AUDIT_LOG_FLUSH_SECONDS = 2  # flush buffered rows at least this often
+AUDIT_LOG_MAX_FLUSH_ATTEMPTS = 3
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 500
 
 # file related
 FILE_PATH = "/app/file_path/"
 SAMPLE_NUM_USERS = 1000000
 CHUNK_SIZE = 100000
+MIN_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 500000
+CHUNK_MEMORY_FACTOR = 4  # copies of a chunk alive at once (chunk, db rows, merge)
+ATTACHMENT_DOWNLOAD_CHUNK_BYTES = 1024 * 1024  # stream attachments in 1MB blocks
+VOLUME_WRITE_BLOCK_BYTES = 1024 * 1024  # write csv rows into zip volumes in 1MB blocks
+VOLUME_SIZE_MARGIN_BYTES = (
+    4 * 1024 * 1024
+)  # headroom for data still buffered in the compressor when a volume is rolled over
 SAMPLE_DATA_PATH = "data/users.csv"
 
+# extracted data
+PII_COLUMNS = ["username", "email", "gender"]  # columns looked up from users table
+PII_CATEGORY_COLUMNS = ["gender"]  # low-cardinality pii columns kept as categoricals
+STRING_DTYPE = "string[pyarrow]"  # arrow-backed strings instead of python objects
+REJECTS_FILE_SUFFIX = "_rejects.csv"  # report of rows whose identifier was rejected
+
+# memory budget
+EXTRACTION_MEMORY_BUDGET_BYTES = int(
+    os.getenv("EXTRACTION_MEMORY_BUDGET_BYTES", 1024 * 1024 * 1024)
+)  # 1GB per extraction job
+HOST_MEMORY_BUDGET_BYTES = int(
+    os.getenv("HOST_MEMORY_BUDGET_BYTES", 0)
+)  # 0 uses 80% of physical memory
+EXTRACTION_MEMORY_KEY_PREFIX = "extraction:memory"
+EXTRACTION_MEMORY_RESERVATION_SECONDS = 6 * 3600  # reservations of crashed jobs expire
+EXTRACTION_ADMISSION_TIMEOUT_SECONDS = 300
+EXTRACTION_ADMISSION_POLL_SECONDS = 5
+
+# extraction checkpoint
+CHECKPOINT_KEY_PREFIX = "extraction:checkpoint"
+CHECKPOINT_EXPIRE_SECONDS = int(
+    os.getenv("CHECKPOINT_EXPIRE_SECONDS", 7 * 24 * 3600)
+)  # keep progress for a week so failed tickets can be resumed
+WORK_DIR_KEY_PREFIX = "extraction:work_dir"  # job dir reused when a ticket resumes
+
+# scratch space of extraction jobs: attachments, extracted csvs and zips
+SCRATCH_PATH = os.getenv("SCRATCH_PATH", FILE_PATH)  # e.g. local ssd
+SCRATCH_QUOTA_BYTES = int(
+    os.getenv("SCRATCH_QUOTA_BYTES", 50 * 1024 * 1024 * 1024)
+)  # 50GB shared by all jobs on this host
+SCRATCH_SMALL_JOB_PATH = os.getenv(
+    "SCRATCH_SMALL_JOB_PATH", ""
+)  # e.g. tmpfs mount for small jobs, unset puts every job on SCRATCH_PATH
+SCRATCH_SMALL_JOB_MAX_BYTES = int(
+    os.getenv("SCRATCH_SMALL_JOB_MAX_BYTES", 256 * 1024 * 1024)
+)
+SCRATCH_SMALL_JOB_QUOTA_BYTES = int(
+    os.getenv("SCRATCH_SMALL_JOB_QUOTA_BYTES", 1024 * 1024 * 1024)
+)
+SCRATCH_BYTES_PER_INPUT_BYTE = 4  # extracted csv with pii columns plus its zip
+SCRATCH_KEY_PREFIX = "extraction:scratch"
+SCRATCH_TTL_SECONDS = int(
+    os.getenv("SCRATCH_TTL_SECONDS", CHECKPOINT_EXPIRE_SECONDS)
+)  # job dirs are kept as long as their checkpoints can resume them
+SCRATCH_GC_INTERVAL_SECONDS = 3600
+ENABLE_SCRATCH_GC = os.getenv("ENABLE_SCRATCH_GC", "true") == "true"
+
+# extraction progress, published to subscribers on any worker
+EXTRACTION_PROGRESS_KEY_PREFIX = "extraction:progress"  # latest event of a ticket
+EXTRACTION_PROGRESS_CHANNEL_PREFIX = "extraction:progress:events"
+EXTRACTION_PROGRESS_EXPIRE_SECONDS = 3600
+PROGRESS_KEEPALIVE_SECONDS = (
+    15  # comment line keeps idle proxies from closing the stream
+)
+
+# per-ticket extraction lock shared by all workers
+TICKET_LOCK_KEY_PREFIX = "extraction:lock"
+TICKET_LOCK_LEASE_SECONDS = int(
+    os.getenv("TICKET_LOCK_LEASE_SECONDS", 60)
+)  # lock expires this long after its owner stops renewing it
+TICKET_LOCK_RENEW_SECONDS = int(os.getenv("TICKET_LOCK_RENEW_SECONDS", 20))
+
+# extraction result cache
+RESULT_CACHE_PATH = os.path.join(FILE_PATH, "result_cache")
+RESULT_CACHE_KEY_PREFIX = "extraction:result_cache"  # index of each host's cache dir
+RESULT_CACHE_MAX_AGE_SECONDS = int(
+    os.getenv("RESULT_CACHE_MAX_AGE_SECONDS", 24 * 3600)
+)  # cached results older than a day are considered stale
+RESULT_CACHE_MAX_BYTES = int(
+    os.getenv("RESULT_CACHE_MAX_BYTES", 5 * 1024 * 1024 * 1024)
+)  # 5GB
+
+# pre-flight estimate of extraction size and runtime
+ESTIMATE_SAMPLE_ROWS = 10000  # rows read from the start of each attachment
+ESTIMATE_SAMPLE_BYTES = 8 * 1024 * 1024  # bytes streamed from the start of a csv
+ESTIMATE_MAX_EXCEL_BYTES = int(
+    os.getenv("ESTIMATE_MAX_EXCEL_BYTES", 100 * 1024 * 1024)
+)  # excel files cannot be read from a prefix, larger ones are not sampled
+ESTIMATE_LOOKUP_SAMPLE_SIZE = 1000  # sampled keys looked up to measure match rate
+ESTIMATE_DEFAULT_ROWS_PER_SECOND = int(
+    os.getenv("ESTIMATE_DEFAULT_ROWS_PER_SECOND", 50000)
+)  # used until throughput of finished extractions is recorded
+ESTIMATE_LARGE_JOB_ROWS = int(
+    os.getenv("ESTIMATE_LARGE_JOB_ROWS", 5000000)
+)  # jobs above this are flagged as large
+EXTRACTION_THROUGHPUT_KEY = "extraction:throughput"
+EXTRACTION_THROUGHPUT_SAMPLES = 50  # recent files the recorded throughput is based on
+EXTRACTION_THROUGHPUT_MIN_ROWS = 1000  # smaller files are dominated by fixed overhead
+
+# per-request profiling, admins only
+PROFILE_HEADER = "X-Profile"  # header or ?profile=true query flag turns it on
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_PATH = os.path.join(FILE_PATH, "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", 20))
+PROFILE_MAX_AGE_SECONDS = int(
+    os.getenv("PROFILE_MAX_AGE_SECONDS", 7 * 24 * 3600)
+)  # profiles older than a week are deleted
+PROFILE_TEXT_LINES = 50  # functions listed in the text report
+
 # slack
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL", "secret")
+SLACK_OUTBOX_KEY = "slack:outbox"
+SLACK_OUTBOX_PROCESSING_KEY_PREFIX = "slack:outbox:processing"  # one list per sender
+SLACK_OUTBOX_SENDERS_KEY = "slack:outbox:senders"  # lease deadline of each sender
+SLACK_OUTBOX_DEAD_LETTER_KEY = "slack:outbox:dead"
+SLACK_RATE_LIMIT_KEY_PREFIX = "slack:ratelimit"
+SLACK_OUTBOX_BATCH_SIZE = 50  # messages claimed per drain
+SLACK_OUTBOX_POLL_SECONDS = 1
+SLACK_SENDER_LEASE_SECONDS = 300  # claimed messages of a silent sender are recovered
+SLACK_MESSAGE_TTL_SECONDS = int(
+    os.getenv("SLACK_MESSAGE_TTL_SECONDS", 24 * 3600)
+)  # messages hold archive passwords, undelivered ones are dropped after a day
+SLACK_DEAD_LETTER_TTL_SECONDS = 7 * 24 * 3600  # redacted dead letters kept a week
+SLACK_MAX_RETRIES = 5
+SLACK_RETRY_BACKOFF_SECONDS = 2.0
+SLACK_MIN_SEND_INTERVAL_SECONDS = (
+    1  # slack allows about 1 message per second per webhook
+)
+SLACK_MAX_TEXT_LENGTH = 4000  # coalesced message length limit
+ENABLE_SLACK_SENDER = os.getenv("ENABLE_SLACK_SENDER", "true") == "true"
 
 # logging configuration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import shutil
+
+from app.config import ATTACHMENT_DOWNLOAD_CHUNK_BYTES, SCRATCH_PATH
+from app.core.checkpoint import clear_attachment_checkpoint
+from app.core.logger import logger
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+# per-ticket directory where jira attachments are stored
+def get_ticket_attachment_dir(ticket_key: str, root: str | None = None) -> str:
+    return os.path.join(root or SCRATCH_PATH, ticket_key, "attachments")
+
+
+# sha256 checksum of a local file
+def compute_file_checksum(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(ATTACHMENT_DOWNLOAD_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# jira attachment id of a stored attachment, each is kept in a dir named after it
+def get_attachment_id(file_path: str) -> str:
+    return os.path.basename(os.path.dirname(file_path))
+
+
+# sha256 of a stored attachment, from the manifest when the sync recorded it
+def get_attachment_checksum(file_path: str) -> str:
+    entry = load_manifest(os.path.dirname(os.path.dirname(file_path))).get(
+        get_attachment_id(file_path)
+    )
+    if entry and entry["path"] == file_path:
+        return entry["checksum"]
+    return compute_file_checksum(file_path)
+
+
+# load {attachment_id: metadata} of previously downloaded attachments
+def load_manifest(attachment_dir: str) -> dict:
+    manifest_path = os.path.join(attachment_dir, MANIFEST_FILE_NAME)
+    if not os.path.isfile(manifest_path):
+        return {}
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# write manifest atomically so a crash never leaves a half-written file
+def save_manifest(attachment_dir: str, manifest: dict):
+    manifest_path = os.path.join(attachment_dir, MANIFEST_FILE_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+# check whether local copy still matches recorded metadata
+def is_attachment_unchanged(attachment, entry: dict | None) -> bool:
+    if not entry or not os.path.isfile(entry["path"]):
+        return False
+    if entry["size"] != attachment.size or entry["filename"] != attachment.filename:
+        return False
+    if os.path.getsize(entry["path"]) != entry["size"]:
+        return False
+    return compute_file_checksum(entry["path"]) == entry["checksum"]
+
+
+# file name of an attachment safe to join onto its dir, uploader controls it
+def get_safe_filename(filename: str) -> str:
+    name = os.path.basename(str(filename).replace("\\", "/")).strip()
+    if name in ("", ".", ".."):
+        return "attachment"
+    return name
+
+
+# stream attachment to disk and return its metadata
+def download_attachment(attachment, attachment_dir: str) -> dict:
+    target_dir = os.path.join(attachment_dir, str(attachment.id))
+    os.makedirs(target_dir, exist_ok=True)
+    local_path = os.path.join(target_dir, get_safe_filename(attachment.filename))
+    tmp_path = f"{local_path}.part"
+
+    digest = hashlib.sha256()
+    with open(tmp_path, "wb") as f:
+        for block in attachment.iter_content(ATTACHMENT_DOWNLOAD_CHUNK_BYTES):
+            f.write(block)
+            digest.update(block)
+    os.replace(tmp_path, local_path)
+
+    return {
+        "filename": attachment.filename,
+        "path": local_path,
+        "size": os.path.getsize(local_path),
+        "checksum": digest.hexdigest(),
+    }
+
+
+# stream the first complete lines of a text attachment, up to max_bytes
+def download_attachment_head(attachment, target_dir: str, max_bytes: int) -> str:
+    """
+    Only the start of the attachment is fetched, the download stops once
+    max_bytes were read. A cut-off last line is dropped.
+
+    Returns:
+        str: local path of the head, in a dir named after the attachment id
+    """
+    target_dir = os.path.join(target_dir, str(attachment.id))
+    os.makedirs(target_dir, exist_ok=True)
+    local_path = os.path.join(target_dir, get_safe_filename(attachment.filename))
+
+    head = bytearray()
+    for block in attachment.iter_content(ATTACHMENT_DOWNLOAD_CHUNK_BYTES):
+        head += block[: max_bytes - len(head)]
+        if len(head) >= max_bytes:
+            break
+    if len(head) < attachment.size:
+        del head[head.rfind(b"\n") + 1 :]
+
+    with open(local_path, "wb") as f:
+        f.write(head)
+    return local_path
+
+
+# download only new or changed attachments of a ticket
+def sync_ticket_attachments(ticket_key: str, attachments: list) -> list[str]:
+    """
+    Sync jira attachments into a per-ticket directory keyed by attachment id.
+
+    Args:
+        ticket_key (str): jira issue key
+        attachments (list): jira Attachment resources of the issue
+    Returns:
+        list[str]: local paths of all current attachments
+    """
+    attachment_dir = get_ticket_attachment_dir(ticket_key)
+    os.makedirs(attachment_dir, exist_ok=True)
+    manifest = load_manifest(attachment_dir)
+
+    synced_manifest = {}
+    for attachment in attachments:
+        attachment_id = str(attachment.id)
+        entry = manifest.get(attachment_id)
+
+        if is_attachment_unchanged(attachment, entry):
+            logger.info(f"[Jira {ticket_key}] {attachment.filename} is up to date")
+        else:
+            # rows committed from an earlier copy do not belong to the new content
+            clear_attachment_checkpoint(ticket_key, attachment_id)
+            entry = download_attachment(attachment, attachment_dir)
+            logger.info(f"[Jira {ticket_key}] downloaded {attachment.filename}")
+
+        synced_manifest[attachment_id] = entry
+
+    # remove attachments that were deleted from the ticket
+    for attachment_id in manifest.keys() - synced_manifest.keys():
+        shutil.rmtree(os.path.join(attachment_dir, attachment_id), ignore_errors=True)
+
+    save_manifest(attachment_dir, synced_manifest)
+    return [entry["path"] for entry in synced_manifest.values()]
@@ -0,0 +1,208 @@
+import base64
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.config import (
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_FLUSH_SECONDS,
+    AUDIT_LOG_MAX_FLUSH_ATTEMPTS,
+)
+from app.core.db_connection import get_db_connection
+from app.core.logger import logger
+
+INSERT_LOG_SQL = """
+    INSERT INTO data_extraction_history (
+        extractor_id, ticket_key, file_name, file_path, created_at
+    )
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+# rows waiting to be flushed by the audit log writer
+audit_log_queue: queue.Queue = queue.Queue()
+writer_thread: threading.Thread | None = None
+writer_stop_event = threading.Event()
+
+
+# insert rows in a single multi-row insert
+def insert_log_rows(rows: list[tuple]):
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            # mysql-connector rewrites executemany INSERT into one multi-row INSERT
+            cursor.executemany(INSERT_LOG_SQL, rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# save data-extraction log to mysql
+def save_log_to_mysql(
+    extractor_id: str,
+    ticket_key: str,
+    file_path: str,
+):
+    """
+    Buffer log row, the audit log writer flushes it in batches.
+    Row is written immediately if the writer is not running (e.g. scripts).
+    """
+    row = (
+        extractor_id,
+        ticket_key,
+        os.path.basename(file_path) if file_path else None,
+        file_path,
+        datetime.now(timezone.utc),  # created_at
+    )
+
+    if writer_thread and writer_thread.is_alive():
+        audit_log_queue.put(row)
+        return
+
+    try:
+        insert_log_rows([row])
+        logger.info(f"[Jira {ticket_key}] data-extraction log has been saved!: ")
+    except Exception as e:
+        logger.error(f"[MySQL ERROR] Failed to save log: {e}")
+
+
+# flush buffered rows, failed rows are kept for the next flush
+def flush_log_rows(rows: list[tuple], attempts: int) -> tuple[list[tuple], int]:
+    """
+    Returns:
+        (rows, attempts): rows still waiting to be written and failed attempts
+    """
+    if not rows:
+        return [], 0
+
+    try:
+        insert_log_rows(rows)
+        logger.info(f"{len(rows)} data-extraction logs have been saved!")
+        return [], 0
+    except Exception as e:
+        attempts += 1
+        logger.error(f"[MySQL ERROR] Failed to save {len(rows)} logs: {e}")
+        if attempts >= AUDIT_LOG_MAX_FLUSH_ATTEMPTS:
+            logger.error(
+                f"[MySQL ERROR] Dropping logs after {attempts} attempts: {rows}"
+            )
+            return [], 0
+        return rows, attempts
+
+
+# collect buffered rows and flush them by batch size or flush interval
+def audit_log_writer_loop():
+    rows = []
+    attempts = 0
+    last_flush = time.monotonic()
+
+    while not writer_stop_event.is_set():
+        try:
+            rows.append(audit_log_queue.get(timeout=AUDIT_LOG_FLUSH_SECONDS))
+        except queue.Empty:
+            pass
+
+        is_due = time.monotonic() - last_flush >= AUDIT_LOG_FLUSH_SECONDS
+        if len(rows) >= AUDIT_LOG_BATCH_SIZE or (rows and is_due):
+            batch, rows = rows[:AUDIT_LOG_BATCH_SIZE], rows[AUDIT_LOG_BATCH_SIZE:]
+            failed_rows, attempts = flush_log_rows(batch, attempts)
+            rows = failed_rows + rows
+            last_flush = time.monotonic()
+
+    # flush remaining rows on shutdown
+    while not audit_log_queue.empty():
+        rows.append(audit_log_queue.get_nowait())
+    while rows:
+        batch, rows = rows[:AUDIT_LOG_BATCH_SIZE], rows[AUDIT_LOG_BATCH_SIZE:]
+        failed_rows, attempts = flush_log_rows(batch, attempts)
+        rows = failed_rows + rows
+
+
+# run audit log writer in a background thread
+def start_audit_log_writer():
+    global writer_thread
+
+    writer_stop_event.clear()
+    writer_thread = threading.Thread(
+        target=audit_log_writer_loop, name="audit-log-writer", daemon=True
+    )
+    writer_thread.start()
+
+
+# stop audit log writer and wait until buffered rows are flushed
+def stop_audit_log_writer(timeout: float = 30):
+    writer_stop_event.set()
+    if writer_thread:
+        writer_thread.join(timeout)
+
+
+# encode keyset pagination position of the last returned row
+def encode_history_cursor(created_at: datetime, row_id: int) -> str:
+    value = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(value.encode("utf-8")).decode("utf-8")
+
+
+# decode keyset pagination cursor
+def decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Raises:
+        ValueError: if cursor is malformed
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        created_at, row_id = value.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# read extraction history newest first using keyset pagination
+def fetch_extraction_history(
+    conn,
+    ticket_key: str | None = None,
+    extractor_id: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    Filters use (ticket_key, created_at) / (extractor_id, created_at) indexes,
+    so every page is an index range scan regardless of table size.
+
+    Returns:
+        (rows, next_cursor): history rows and cursor of next page, None on last page
+    """
+    conditions = []
+    params = []
+    if ticket_key:
+        conditions.append("ticket_key = %s")
+        params.append(ticket_key)
+    if extractor_id:
+        conditions.append("extractor_id = %s")
+        params.append(extractor_id)
+    if cursor:
+        created_at, row_id = decode_history_cursor(cursor)
+        conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+        params.extend([created_at, created_at, row_id])
+
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"""
+        SELECT id, extractor_id, ticket_key, file_name, file_path, created_at
+        FROM data_extraction_history
+        {where_clause}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    """
+    # fetch one more row to check whether next page exists
+    params.append(limit + 1)
+
+    with conn.cursor(dictionary=True) as cursor_obj:
+        cursor_obj.execute(sql, params)
+        rows = cursor_obj.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    return rows, next_cursor
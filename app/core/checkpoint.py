@@ -0,0 +1,149 @@
+import json
+import os
+
+from app.config import (
+    CHECKPOINT_EXPIRE_SECONDS,
+    CHECKPOINT_KEY_PREFIX,
+    WORK_DIR_KEY_PREFIX,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+
+# redis hash key that holds progress of every attachment in a ticket
+def get_checkpoint_key(ticket_key: str) -> str:
+    return f"{CHECKPOINT_KEY_PREFIX}:{ticket_key}"
+
+
+# get last committed progress of an attachment
+def get_checkpoint(ticket_key: str, attachment_id: str) -> dict | None:
+    """
+    Args:
+        ticket_key (str): jira issue key
+        attachment_id (str): jira attachment id, unique even when names repeat
+    Returns:
+        dict: {"chunk_index", "rows_done", "offset", "checksum"} or None if
+            nothing was committed
+    """
+    value = redis_client.hget(get_checkpoint_key(ticket_key), attachment_id)
+    if not value:
+        return None
+    return json.loads(value)
+
+
+# commit progress after a chunk has been written to disk
+def save_checkpoint(
+    ticket_key: str,
+    attachment_id: str,
+    chunk_index: int,
+    rows_done: int,
+    offset: int,
+    checksum: str | None,
+):
+    key = get_checkpoint_key(ticket_key)
+    checkpoint = {
+        "chunk_index": chunk_index,
+        "rows_done": rows_done,
+        "offset": offset,
+        # sha256 of the attachment the rows were read from
+        "checksum": checksum,
+    }
+    redis_client.hset(key, attachment_id, json.dumps(checkpoint))
+    redis_client.expire(key, CHECKPOINT_EXPIRE_SECONDS)
+
+
+# redis key that holds the job dir the checkpoints of a ticket refer to
+def get_work_dir_key(ticket_key: str) -> str:
+    return f"{WORK_DIR_KEY_PREFIX}:{ticket_key}"
+
+
+# dir of an interrupted job of the ticket, if it is still on this host
+def get_previous_work_dir(ticket_key: str) -> str | None:
+    previous_dir = redis_client.get(get_work_dir_key(ticket_key))
+    if previous_dir and os.path.isdir(previous_dir):
+        return previous_dir
+    return None
+
+
+# return output dir of an extraction job
+def get_job_work_dir(ticket_key: str, job_id: str, root: str) -> str:
+    """
+    Every job writes into its own dir, so workers never share output files.
+    A re-run reuses the dir of the interrupted job when it is still on this host,
+    which is where its checkpointed output lives.
+
+    Args:
+        ticket_key (str): jira issue key
+        job_id (str): unique id of the extraction job
+        root (str): scratch volume new job dirs are created on
+    Returns:
+        str: existing dir of the interrupted job, or a new dir for this job
+    """
+    previous_dir = get_previous_work_dir(ticket_key)
+    if previous_dir:
+        logger.info(f"[Jira {ticket_key}] reusing work dir {previous_dir}")
+        return previous_dir
+
+    work_dir = os.path.join(root, ticket_key, "jobs", job_id)
+    os.makedirs(work_dir, exist_ok=True)
+    redis_client.set(
+        get_work_dir_key(ticket_key), work_dir, ex=CHECKPOINT_EXPIRE_SECONDS
+    )
+    logger.info(f"[Jira {ticket_key}] created work dir {work_dir}")
+    return work_dir
+
+
+# drop the checkpoint of an attachment whose local copy was replaced
+def clear_attachment_checkpoint(ticket_key: str, attachment_id: str):
+    redis_client.hdel(get_checkpoint_key(ticket_key), attachment_id)
+
+
+# delete all checkpoints of a ticket once it has been delivered
+def clear_checkpoints(ticket_key: str):
+    redis_client.delete(get_checkpoint_key(ticket_key), get_work_dir_key(ticket_key))
+    logger.info(f"[Jira {ticket_key}] extraction checkpoints cleared")
+
+
+# prepare output file to resume from the last committed chunk
+def restore_output_file(
+    ticket_key: str,
+    attachment_id: str,
+    save_file_name: str,
+    checksum: str | None = None,
+) -> dict:
+    """
+    Truncate output file to the last consistent offset, so rows written after the
+    last committed chunk are not duplicated on resume.
+    A checkpoint of different attachment content (replaced under the same id
+    or name) is discarded, its rows do not belong to the current file.
+
+    Returns:
+        dict: checkpoint to resume from, empty progress if extraction starts over
+    """
+    fresh_start = {"chunk_index": -1, "rows_done": 0, "offset": 0}
+    checkpoint = get_checkpoint(ticket_key, attachment_id)
+    if checkpoint and checkpoint.get("checksum") != checksum:
+        logger.info(
+            f"[Jira {ticket_key}] attachment {attachment_id} changed since its "
+            f"checkpoint, extracting it from the start"
+        )
+        checkpoint = None
+
+    # output file is gone or shorter than committed offset, start over
+    if (
+        not checkpoint
+        or not os.path.isfile(save_file_name)
+        or os.path.getsize(save_file_name) < checkpoint["offset"]
+    ):
+        if os.path.isfile(save_file_name):
+            os.remove(save_file_name)
+        return fresh_start
+
+    with open(save_file_name, "r+b") as f:
+        f.truncate(checkpoint["offset"])
+
+    logger.info(
+        f"[Jira {ticket_key}] resuming attachment {attachment_id} after chunk "
+        f"{checkpoint['chunk_index']}, rows done: {checkpoint['rows_done']}"
+    )
+    return checkpoint
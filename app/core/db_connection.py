@@ -1,62 +1,122 @@
-import os
-from datetime import datetime, timezone
+import itertools
+import threading
+import time
 
 from mysql.connector import connect
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
 
 from app.config import (
     ALLOW_LOCAL_INFILE,
     MYSQL_DATABASE,
     MYSQL_HOST,
     MYSQL_PASSWORD,
+    MYSQL_POOL_SIZE,
     MYSQL_PORT,
+    MYSQL_REPLICA_HOSTS,
+    MYSQL_REPLICA_LAG_CHECK_SECONDS,
+    MYSQL_REPLICA_MAX_LAG_SECONDS,
     MYSQL_USER,
 )
 from app.core.logger import logger
 
+# connection pools by "host:port", created on first use
+pools: dict[str, MySQLConnectionPool] = {}
+pools_lock = threading.Lock()
+
+# replica health cache, "host:port" -> (checked_at, is_healthy)
+replica_health: dict[str, tuple[float, bool]] = {}
+replica_cycle = itertools.cycle(MYSQL_REPLICA_HOSTS) if MYSQL_REPLICA_HOSTS else None
+
+
+# split "host" or "host:port" into host and port
+def parse_host(host: str) -> tuple[str, int]:
+    name, _, port = host.partition(":")
+    return name, int(port) if port else MYSQL_PORT
+
+
+# mysql connection settings of a host
+def get_connection_config(host: str) -> dict:
+    name, port = parse_host(host)
+    return {
+        "host": name,
+        "port": port,
+        "user": MYSQL_USER,
+        "password": MYSQL_PASSWORD,
+        "database": MYSQL_DATABASE,
+        "allow_local_infile": ALLOW_LOCAL_INFILE,
+    }
+
+
+# return pooled connection of a host, direct connection if the pool is exhausted
+def get_pooled_connection(host: str):
+    with pools_lock:
+        if host not in pools:
+            pools[host] = MySQLConnectionPool(
+                pool_name=f"pool_{host.replace(':', '_')}",
+                pool_size=MYSQL_POOL_SIZE,
+                **get_connection_config(host),
+            )
+        pool = pools[host]
+
+    try:
+        return pool.get_connection()
+    except PoolError:
+        logger.warning(f"MySQL pool of {host} exhausted, opening direct connection")
+        return connect(**get_connection_config(host))
+
 
 # retrun mysql conn object
 def get_db_connection():
-    return connect(
-        host=MYSQL_HOST,
-        port=MYSQL_PORT,
-        user=MYSQL_USER,
-        password=MYSQL_PASSWORD,
-        database=MYSQL_DATABASE,
-        allow_local_infile=ALLOW_LOCAL_INFILE,
-    )
-
-
-# save data-extraction log to mysql
-def save_log_to_mysql(
-    extractor_id: str,
-    ticket_key: str,
-    file_path: str,
-):
+    """
+    Connection to the primary, used for writes and reads that must be consistent.
+    Closing the connection returns it to the pool.
+    """
+    return get_pooled_connection(f"{MYSQL_HOST}:{MYSQL_PORT}")
+
+
+# check replication lag of a replica, cached for MYSQL_REPLICA_LAG_CHECK_SECONDS
+def is_replica_healthy(host: str) -> bool:
+    now = time.monotonic()
+    checked_at, is_healthy = replica_health.get(host, (0, False))
+    if now - checked_at < MYSQL_REPLICA_LAG_CHECK_SECONDS:
+        return is_healthy
+
     try:
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
-            sql = """
-                    INSERT INTO data_extraction_history (
-                        extractor_id, ticket_key, file_name, file_path,
-                        created_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """
-            # 현재 시점 timestamp
-            now = datetime.now(timezone.utc)
-
-            cursor.execute(
-                sql,
-                (
-                    extractor_id,
-                    ticket_key,
-                    os.path.basename(file_path) if file_path else None,
-                    file_path,
-                    now,  # created_at
-                ),
-            )
-        conn.commit()
-        logger.info(f"[Jira {ticket_key}] data-extraction log has been saved!: ")
+        conn = get_pooled_connection(host)
+        try:
+            with conn.cursor(dictionary=True) as cursor:
+                cursor.execute("SHOW REPLICA STATUS")
+                status = cursor.fetchone()
+        finally:
+            conn.close()
+
+        # a stand-in server without replication has no replica status
+        if not status:
+            is_healthy = True
+        else:
+            lag = status.get("Seconds_Behind_Source")
+            is_healthy = lag is not None and lag <= MYSQL_REPLICA_MAX_LAG_SECONDS
+            if not is_healthy:
+                logger.warning(f"MySQL replica {host} is lagging: {lag}s")
 
     except Exception as e:
-        logger.error(f"[MySQL ERROR] Failed to save log: {e}")
+        logger.error(f"MySQL replica {host} is unreachable: {e}")
+        is_healthy = False
+
+    replica_health[host] = (now, is_healthy)
+    return is_healthy
+
+
+# return connection for read-only lookups, spread across healthy replicas
+def get_read_connection():
+    """
+    Replicas are picked round-robin; lagging or unreachable replicas are skipped
+    and the primary is used when no replica is healthy.
+    """
+    for _ in range(len(MYSQL_REPLICA_HOSTS)):
+        host = next(replica_cycle)
+        if is_replica_healthy(host):
+            return get_pooled_connection(host)
+
+    return get_db_connection()
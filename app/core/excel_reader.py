@@ -0,0 +1,75 @@
+from collections.abc import Iterator
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.config import CHUNK_SIZE
+
+
+# stream first sheet of an xlsx workbook as dataframes of batch_size rows
+def iter_excel_batches(
+    file_path: str, batch_size: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Read rows in openpyxl read-only mode, so only a single batch of rows is held
+    as python objects instead of the full workbook object model.
+
+    Args:
+        file_path (str): xlsx file path
+        batch_size (int): number of rows per dataframe
+    Returns:
+        Iterator[pd.DataFrame]: dataframes using the first row as header, indexed
+            like pandas read_excel (sheet row - 2), so skipped blank rows leave gaps
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        columns = [
+            str(col) if col is not None else f"Unnamed: {i}"
+            for i, col in enumerate(header)
+        ]
+        batch = []
+        row_index = []
+        for index, row in enumerate(rows):
+            # skip blank rows left over from formatting
+            if all(value is None for value in row):
+                continue
+            batch.append(row[: len(columns)])
+            row_index.append(index)
+            if len(batch) == batch_size:
+                yield pd.DataFrame.from_records(batch, index=row_index, columns=columns)
+                batch = []
+                row_index = []
+
+        if batch:
+            yield pd.DataFrame.from_records(batch, index=row_index, columns=columns)
+    finally:
+        workbook.close()
+
+
+# number of data rows of the first sheet, from the sheet dimension when present
+def get_excel_row_count(file_path: str) -> int:
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # dimension is missing in workbooks written by some tools, count rows then
+        max_row = sheet.max_row or sum(1 for _ in sheet.iter_rows(values_only=True))
+        return max(max_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+# read excel attachment into a single dataframe
+def read_excel_file(file_path: str) -> pd.DataFrame:
+    # legacy xls is not supported by openpyxl
+    if str(file_path).lower().endswith(".xls"):
+        return pd.read_excel(file_path)
+
+    batches = list(iter_excel_batches(file_path))
+    if not batches:
+        return pd.DataFrame()
+    return pd.concat(batches)
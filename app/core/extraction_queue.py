@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING
+
+from app.config import (
+    EXTRACTION_BATCH_MAX_TICKETS,
+    EXTRACTION_QUEUE_KEY,
+    EXTRACTION_QUEUE_POLL_SECONDS,
+    EXTRACTION_QUEUED_EXPIRE_SECONDS,
+    EXTRACTION_QUEUED_KEY_PREFIX,
+    JIRA_APPROVED_STATUS_NAME,
+    JIRA_PII_FIELD,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+if TYPE_CHECKING:
+    from jira import JIRA
+
+
+# redis key marking a ticket as queued or running
+def get_queued_key(ticket_key: str) -> str:
+    return f"{EXTRACTION_QUEUED_KEY_PREFIX}:{ticket_key}"
+
+
+# queue extraction of a ticket unless it is already queued or running
+def enqueue_extraction(ticket_key: str) -> bool:
+    """
+    Returns:
+        bool: True if queued, False if ticket was already queued
+    """
+    is_new = redis_client.set(
+        get_queued_key(ticket_key), 1, nx=True, ex=EXTRACTION_QUEUED_EXPIRE_SECONDS
+    )
+    if not is_new:
+        logger.info(f"[Jira {ticket_key}] extraction is already queued")
+        return False
+
+    redis_client.rpush(EXTRACTION_QUEUE_KEY, ticket_key)
+    logger.info(f"[Jira {ticket_key}] extraction queued")
+    return True
+
+
+# wait for next queued ticket, None if queue stayed empty during poll interval
+def dequeue_extraction() -> str | None:
+    item = redis_client.blpop(
+        EXTRACTION_QUEUE_KEY, timeout=EXTRACTION_QUEUE_POLL_SECONDS
+    )
+    if not item:
+        return None
+    _, ticket_key = item
+    return ticket_key
+
+
+# wait for next queued ticket and take up to max_tickets queued behind it
+def dequeue_extraction_batch(
+    max_tickets: int = EXTRACTION_BATCH_MAX_TICKETS,
+) -> list[str]:
+    ticket_key = dequeue_extraction()
+    if not ticket_key:
+        return []
+
+    # drain tickets queued behind it without waiting for more to arrive
+    ticket_keys = [ticket_key]
+    if max_tickets > 1:
+        ticket_keys += redis_client.lpop(EXTRACTION_QUEUE_KEY, max_tickets - 1) or []
+    return ticket_keys
+
+
+# allow ticket to be queued again once its extraction has finished
+def release_extraction(ticket_key: str):
+    redis_client.delete(get_queued_key(ticket_key))
+
+
+# queued tickets that are approved pii requests, as jira reports them now
+def get_approved_tickets(jira: "JIRA", ticket_keys: list[str]) -> list[str]:
+    """
+    Status and PII_YN field are read with the given (service account) client
+    right before extraction, so a forged or stale webhook cannot start one.
+
+    Args:
+        jira (JIRA): service account jira object
+        ticket_keys (list[str]): dequeued jira issue keys
+    Returns:
+        list[str]: keys of tickets in approved status that request pii data
+    """
+    approved_keys = []
+    for ticket_key in ticket_keys:
+        try:
+            issue = jira.issue(ticket_key, fields=f"status,{JIRA_PII_FIELD}")
+        except Exception as e:
+            logger.error(f"[Jira {ticket_key}] failed to re-check queued ticket: {e}")
+            continue
+
+        fields = issue.raw["fields"]
+        status = ((fields.get("status") or {}).get("name") or "").lower()
+        pii_value = (fields.get(JIRA_PII_FIELD) or {}).get("value")
+        if status != JIRA_APPROVED_STATUS_NAME.lower() or pii_value != "Y":
+            logger.warning(
+                f"[Jira {ticket_key}] queued ticket is not an approved pii request "
+                f"(status {status!r}, PII_YN {pii_value!r}), extraction skipped"
+            )
+            continue
+        approved_keys.append(ticket_key)
+    return approved_keys
@@ -0,0 +1,232 @@
+import re
+from typing import TYPE_CHECKING
+
+from app.config import STRING_DTYPE
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# users table columns that can be used to look up a user, each backed by an index
+IDENTIFIER_COLUMNS = ["username", "user_id", "email"]
+
+# longest value each identifier column can hold (VARCHAR(50), BIGINT, VARCHAR(100))
+IDENTIFIER_MAX_LENGTHS = {"username": 50, "user_id": 19, "email": 100}
+MAX_USER_ID = "9223372036854775807"
+
+INVISIBLE_SPACES_PATTERN = "[\u00a0\u200b\u200c\u200d\ufeff]"
+SCIENTIFIC_PATTERN = r"\d+(\.\d+)?[eE][+-]?\d+"  # e.g. 1.23457E+11 from excel
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+
+# temporary column holding the value used for the index lookup
+LOOKUP_KEY_COLUMN = "_lookup_key"
+
+# normalized column name candidates of each identifier
+IDENTIFIER_CANDIDATES = {
+    "username": ["username", "user_name", "login"],
+    "user_id": ["user_id", "userid", "id", "uid"],
+    "email": ["email", "e_mail", "email_address", "mail"],
+}
+
+
+# map column name onto identifier column, None if column is not an identifier
+def get_identifier_name(col: str) -> str | None:
+    normalized = re.sub(r"[\s\-]+", "_", str(col).strip().lower())
+    for identifier, candidates in IDENTIFIER_CANDIDATES.items():
+        if normalized in candidates:
+            return identifier
+    return None
+
+
+# pick the identifier column used for lookups
+def get_identifier_column(df: "pd.DataFrame") -> str:
+    """
+    Raises:
+        ValueError: if attachment has no username, user_id or email column
+    """
+    for col in IDENTIFIER_COLUMNS:
+        if col in df.columns:
+            return col
+    raise ValueError(f"No user identifier column found, columns: {list(df.columns)}")
+
+
+# decide per value which indexed column it has to be looked up by
+def classify_identifiers(values: "pd.Series", key_column: str) -> "pd.Series":
+    """
+    Column header decides the key type, unless a value cannot belong to it:
+    emails contain "@", user_ids are digits only, anything else is a username.
+    Scientific notation in a user_id column stays a user_id, excel mangled it.
+
+    Args:
+        values (pd.Series): identifier values as strings
+        key_column (str): identifier column the values come from
+    Returns:
+        pd.Series: "username", "user_id" or "email" for every value
+    """
+    import numpy as np
+    import pandas as pd
+
+    is_email = values.str.contains("@", regex=False).fillna(False).to_numpy(bool)
+    is_digit = values.str.fullmatch(r"\d+").fillna(False).to_numpy(bool)
+    is_scientific = values.str.fullmatch(SCIENTIFIC_PATTERN).fillna(False)
+
+    if key_column == "email":
+        key_types = np.where(
+            is_email, "email", np.where(is_digit, "user_id", "username")
+        )
+    elif key_column == "user_id":
+        key_types = np.where(
+            is_digit | is_scientific.to_numpy(bool),
+            "user_id",
+            np.where(is_email, "email", "username"),
+        )
+    else:
+        key_types = np.where(is_email, "email", "username")
+
+    return pd.Series(key_types, index=values.index)
+
+
+# convert identifiers into values matching the users column types
+def get_lookup_keys(values: "pd.Series", key_types: "pd.Series") -> "pd.Series":
+    lookup_keys = values.str.strip()
+    # usernames and emails are compared case-insensitively by mysql,
+    # match them the same way
+    is_text = key_types != "user_id"
+    lookup_keys[is_text] = lookup_keys[is_text].str.lower()
+    # user_ids are compared as numbers, "00123" matches the db value "123"
+    lookup_keys[~is_text] = lookup_keys[~is_text].str.replace(
+        r"^0+(\d)", r"\1", regex=True
+    )
+    return lookup_keys
+
+
+# undo whitespace variants and excel artifacts of identifier values
+def clean_identifiers(values: "pd.Series") -> "pd.Series":
+    """
+    Non-breaking and zero-width spaces are stripped like regular whitespace,
+    the "'" excel text marker is dropped and "12345.0" becomes "12345".
+    """
+    values = values.str.replace(INVISIBLE_SPACES_PATTERN, "", regex=True).str.strip()
+    values = values.str.replace(r"^'", "", regex=True)
+    return values.str.replace(r"^(\d+)\.0+$", r"\1", regex=True)
+
+
+# lookup keys seen so far in an attachment read batch by batch
+class SeenKeys:
+    """
+    Keys are kept as a sorted array of 64-bit hashes, 8 bytes per key instead of
+    python strings, so tracking duplicates does not hold the attachment in memory.
+    A hash collision only mislabels a row as duplicate in the report, or leaves
+    a key unmatched when it skips the lookup of a key already queried.
+    """
+
+    def __init__(self):
+        import numpy as np
+
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    # flag keys seen before, in an earlier batch or earlier in keys, and add them
+    def add(self, keys: "pd.Series") -> "np.ndarray":
+        import numpy as np
+        import pandas as pd
+
+        hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+        is_seen = np.isin(hashes, self.hashes)
+        is_seen |= pd.Series(hashes).duplicated().to_numpy()
+
+        self.hashes = np.union1d(self.hashes, hashes)
+        return is_seen
+
+
+# validate identifiers against the users schema and report duplicated keys
+def validate_identifiers(
+    df: "pd.DataFrame", key_column: str, seen_keys: SeenKeys | None = None
+) -> tuple["pd.DataFrame", "pd.DataFrame"]:
+    """
+    Rows whose identifier cannot match a users row are rejected with a reason,
+    so only plausible keys are looked up. Rows repeating an earlier key of the
+    file are kept, their other columns may differ and the users join fans out
+    to every row; they are only reported as duplicates.
+
+    Args:
+        df (pd.DataFrame): normalized attachment data, indexed by line - 2
+            of the attachment as the readers return it
+        key_column (str): identifier column of the attachment
+        seen_keys (SeenKeys): keys of earlier batches of the attachment, updated
+            with the keys of df
+    Returns:
+        (valid_df, rejects_df): rows to extract with cleaned identifiers, and
+            row number (as in the attachment), value, reason and kept flag of
+            reported rows
+    """
+    import numpy as np
+    import pandas as pd
+
+    original = df[key_column].astype(STRING_DTYPE)
+    values = clean_identifiers(original).fillna("")
+    key_types = classify_identifiers(values, key_column)
+    lookup_keys = get_lookup_keys(values, key_types)
+    # user_ids are checked without leading zeros, as they are looked up
+    lengths = np.where(
+        (key_types == "user_id").to_numpy(),
+        lookup_keys.str.len().to_numpy(int),
+        values.str.len().to_numpy(int),
+    )
+
+    # first matching reason wins
+    checks = [
+        ("blank", values == ""),
+        (
+            "excel_scientific_notation",
+            (key_types == "user_id") & values.str.fullmatch(SCIENTIFIC_PATTERN),
+        ),
+        (
+            "too_long",
+            lengths > key_types.map(IDENTIFIER_MAX_LENGTHS).to_numpy(),
+        ),
+        (
+            "invalid_email",
+            (key_types == "email") & ~values.str.fullmatch(EMAIL_PATTERN),
+        ),
+        (
+            "invalid_username",
+            (key_types == "username") & values.str.contains(r"\s", regex=True),
+        ),
+        # longer ids were rejected as too long, equal-length strings compare as numbers
+        (
+            "out_of_range",
+            (key_types == "user_id").to_numpy()
+            & (lengths == len(MAX_USER_ID))
+            & (lookup_keys > MAX_USER_ID).fillna(False).to_numpy(bool),
+        ),
+    ]
+    reasons = np.select(
+        [np.asarray(mask, dtype=bool) for _, mask in checks],
+        [reason for reason, _ in checks],
+        default="",
+    )
+
+    is_valid = reasons == ""
+    # repeated lookup keys are informational, lookups dedupe keys themselves
+    if seen_keys is None:
+        seen_keys = SeenKeys()
+    is_duplicate = np.zeros(len(df), dtype=bool)
+    is_duplicate[is_valid] = seen_keys.add(lookup_keys[is_valid])
+    reasons = np.where(is_duplicate, "duplicate", reasons)
+
+    valid_df = df[is_valid].copy()
+    valid_df[key_column] = values[is_valid]
+
+    is_reported = reasons != ""
+    rejects_df = pd.DataFrame(
+        {
+            # header is line 1 of the attachment, blank lines skipped by the
+            # readers keep their numbers in the index
+            "row": df.index[is_reported] + 2,
+            "column": key_column,
+            "value": original[is_reported].to_numpy(),
+            "reason": reasons[is_reported],
+            "kept": is_duplicate[is_reported],
+        }
+    )
+    return valid_df, rejects_df
@@ -0,0 +1,16 @@
+from jira import JIRA
+
+from app.core.jira_rate_limiter import mount_jira_rate_limiter
+
+
+class RateLimitedJIRA(JIRA):
+    """
+    Jira client whose session goes through the shared rate limiter from its
+    first request on, including the serverInfo request of the constructor.
+    The jira library takes no session or adapter option, so the limiter is
+    mounted when the constructor sets up basic auth on the session it created.
+    """
+
+    def _create_http_basic_session(self, username: str, password: str):
+        super()._create_http_basic_session(username, password)
+        mount_jira_rate_limiter(self._session)
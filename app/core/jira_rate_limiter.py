@@ -0,0 +1,191 @@
+import time
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import (
+    JIRA_BASE_URL,
+    JIRA_CONCURRENCY_DECREASE_COOLDOWN_SECONDS,
+    JIRA_CONCURRENCY_MAX,
+    JIRA_CONCURRENCY_MIN,
+    JIRA_RATE_LIMIT_BURST,
+    JIRA_RATE_LIMIT_KEY_PREFIX,
+    JIRA_RATE_LIMIT_PER_SECOND,
+    JIRA_REQUEST_SLOT_TTL_SECONDS,
+    JIRA_RETRY_AFTER_DEFAULT_SECONDS,
+    JIRA_THROTTLE_RETRIES,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+BUCKET_KEY = f"{JIRA_RATE_LIMIT_KEY_PREFIX}:bucket"
+IN_FLIGHT_KEY = f"{JIRA_RATE_LIMIT_KEY_PREFIX}:in_flight"
+CONCURRENCY_KEY = f"{JIRA_RATE_LIMIT_KEY_PREFIX}:concurrency"
+BLOCKED_KEY = f"{JIRA_RATE_LIMIT_KEY_PREFIX}:blocked"
+COOLDOWN_KEY = f"{JIRA_RATE_LIMIT_KEY_PREFIX}:cooldown"
+
+# take a token and an in-flight slot, returns seconds to wait ("0" when acquired)
+# redis server time is used so workers on different hosts share one clock
+ACQUIRE_SCRIPT = """
+local blocked_ms = redis.call('PTTL', KEYS[4])
+if blocked_ms > 0 then
+    return tostring(blocked_ms / 1000)
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local limit = tonumber(redis.call('GET', KEYS[3]) or ARGV[5])
+if redis.call('ZCARD', KEYS[2]) >= math.floor(limit) then
+    return tostring(1 / rate)
+end
+
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens') or burst)
+local updated_at = tonumber(redis.call('HGET', KEYS[1], 'updated_at') or now)
+tokens = math.min(burst, tokens + (now - updated_at) * rate)
+if tokens < 1 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    return tostring((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], 3600)
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[4]), ARGV[3])
+redis.call('EXPIRE', KEYS[2], 3600)
+return '0'
+"""
+
+# AIMD: add 1/limit on success (~1 per window), halve on throttling at most
+# once per cooldown so a burst of 429s counts as a single congestion signal
+ADJUST_SCRIPT = """
+local limit = tonumber(redis.call('GET', KEYS[1]) or ARGV[3])
+if ARGV[1] == 'increase' then
+    limit = math.min(tonumber(ARGV[3]), limit + 1 / limit)
+elseif redis.call('SET', KEYS[2], 1, 'NX', 'PX', ARGV[4]) then
+    limit = math.max(tonumber(ARGV[2]), limit / 2)
+end
+redis.call('SET', KEYS[1], tostring(limit))
+return tostring(limit)
+"""
+
+acquire_script = redis_client.register_script(ACQUIRE_SCRIPT)
+adjust_script = redis_client.register_script(ADJUST_SCRIPT)
+
+
+# wait for a token and an in-flight slot, returns slot id to release afterwards
+def acquire_jira_slot() -> str | None:
+    slot_id = uuid.uuid4().hex
+    while True:
+        try:
+            wait_seconds = float(
+                acquire_script(
+                    keys=[BUCKET_KEY, IN_FLIGHT_KEY, CONCURRENCY_KEY, BLOCKED_KEY],
+                    args=[
+                        JIRA_RATE_LIMIT_PER_SECOND,
+                        JIRA_RATE_LIMIT_BURST,
+                        slot_id,
+                        JIRA_REQUEST_SLOT_TTL_SECONDS,
+                        JIRA_CONCURRENCY_MAX,
+                    ],
+                )
+            )
+        except Exception as e:
+            # never block jira calls on a redis outage
+            logger.warning(f"Jira rate limiter unavailable, request not limited: {e}")
+            return None
+
+        if wait_seconds <= 0:
+            return slot_id
+        time.sleep(wait_seconds)
+
+
+# free in-flight slot once the response is received
+def release_jira_slot(slot_id: str | None):
+    if not slot_id:
+        return
+    try:
+        redis_client.zrem(IN_FLIGHT_KEY, slot_id)
+    except Exception as e:
+        logger.warning(f"Failed to release jira request slot: {e}")
+
+
+# additive increase / multiplicative decrease of shared concurrency limit
+def adjust_jira_concurrency(is_throttled: bool) -> float | None:
+    try:
+        return float(
+            adjust_script(
+                keys=[CONCURRENCY_KEY, COOLDOWN_KEY],
+                args=[
+                    "decrease" if is_throttled else "increase",
+                    JIRA_CONCURRENCY_MIN,
+                    JIRA_CONCURRENCY_MAX,
+                    JIRA_CONCURRENCY_DECREASE_COOLDOWN_SECONDS * 1000,
+                ],
+            )
+        )
+    except Exception as e:
+        logger.warning(f"Failed to adjust jira concurrency limit: {e}")
+        return None
+
+
+# parse Retry-After header, given in seconds by jira cloud
+def get_retry_after_seconds(response: requests.Response) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After")), 0)
+    except (TypeError, ValueError):
+        return JIRA_RETRY_AFTER_DEFAULT_SECONDS
+
+
+# block all workers until jira accepts requests again
+def record_jira_throttle(retry_after: float):
+    limit = adjust_jira_concurrency(is_throttled=True)
+    try:
+        redis_client.set(BLOCKED_KEY, 1, px=max(int(retry_after * 1000), 1))
+    except Exception as e:
+        logger.warning(f"Failed to record jira throttling: {e}")
+    logger.warning(
+        f"Jira rate limited, retry after {retry_after}s, concurrency limit: {limit}"
+    )
+
+
+class JiraRateLimitAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends every jira request through the shared rate limiter
+    and retries throttled requests after Retry-After.
+    """
+
+    def send(self, request, **kwargs):
+        # streamed bodies (attachment uploads) can not be sent twice,
+        # their 429 is returned so the caller retries with a fresh stream
+        can_resend = request.body is None or isinstance(request.body, (bytes, str))
+
+        for attempt in range(JIRA_THROTTLE_RETRIES + 1):
+            slot_id = acquire_jira_slot()
+            try:
+                response = super().send(request, **kwargs)
+            finally:
+                release_jira_slot(slot_id)
+
+            if response.status_code != 429:
+                if response.status_code < 500:
+                    adjust_jira_concurrency(is_throttled=False)
+                return response
+
+            record_jira_throttle(get_retry_after_seconds(response))
+            if not can_resend or attempt == JIRA_THROTTLE_RETRIES:
+                return response
+            response.close()
+
+
+# mount rate limiter on a requests session for jira base url
+def mount_jira_rate_limiter(session: requests.Session) -> requests.Session:
+    session.mount(JIRA_BASE_URL, JiraRateLimitAdapter())
+    return session
+
+
+# shared session for jira REST calls made without the jira client
+jira_session = mount_jira_rate_limiter(requests.Session())
@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+
+from redis.exceptions import LockError
+
+from app.config import (
+    TICKET_LOCK_KEY_PREFIX,
+    TICKET_LOCK_LEASE_SECONDS,
+    TICKET_LOCK_RENEW_SECONDS,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+
+class TicketLockedError(RuntimeError):
+    """Raised when another worker is already extracting the ticket."""
+
+
+# redis key of the extraction lock of a ticket
+def get_ticket_lock_key(ticket_key: str) -> str:
+    return f"{TICKET_LOCK_KEY_PREFIX}:{ticket_key}"
+
+
+# keep extending the lease until stop is set, flag lost if ownership is gone
+def renew_lease(lock, ticket_key: str, stop: threading.Event, lost: threading.Event):
+    while not stop.wait(TICKET_LOCK_RENEW_SECONDS):
+        try:
+            lock.reacquire()
+        except LockError as e:
+            logger.error(f"[Jira {ticket_key}] extraction lock lost: {e}")
+            lost.set()
+            return
+        except Exception as e:
+            # redis hiccup, retry on next tick while the lease is still valid
+            logger.warning(f"[Jira {ticket_key}] failed to renew extraction lock: {e}")
+
+
+# hold the per-ticket lock for the duration of an extraction
+@contextmanager
+def ticket_lock(ticket_key: str):
+    """
+    Only one worker across all processes and hosts extracts a ticket at a time.
+    The lock is a lease that a background thread renews, so a crashed worker
+    releases it after TICKET_LOCK_LEASE_SECONDS.
+
+    Args:
+        ticket_key (str): jira issue key
+    Yields:
+        threading.Event: set when the lease could not be renewed
+    Raises:
+        TicketLockedError: if the ticket is locked by another worker
+    """
+    lock = redis_client.lock(
+        get_ticket_lock_key(ticket_key),
+        timeout=TICKET_LOCK_LEASE_SECONDS,
+        blocking=False,
+        thread_local=False,
+    )
+    if not lock.acquire():
+        raise TicketLockedError(f"Extraction of {ticket_key} is already running.")
+    logger.info(f"[Jira {ticket_key}] extraction lock acquired")
+
+    stop = threading.Event()
+    lost = threading.Event()
+    renewer = threading.Thread(
+        target=renew_lease,
+        args=(lock, ticket_key, stop, lost),
+        name=f"lock-renewer-{ticket_key}",
+        daemon=True,
+    )
+    renewer.start()
+
+    try:
+        yield lost
+    finally:
+        stop.set()
+        renewer.join()
+        try:
+            lock.release()
+            logger.info(f"[Jira {ticket_key}] extraction lock released")
+        except LockError as e:
+            logger.error(f"[Jira {ticket_key}] extraction lock already expired: {e}")
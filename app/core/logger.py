@@ -11,27 +11,33 @@ from app.config import (
     LOG_MAX_BYTES,
 )
 
-# create logging directory if not exists
-os.makedirs(LOG_DIR, exist_ok=True)
-
 # logging configuration
 logger = logging.getLogger("app_logger")
 logger.setLevel(LOG_LEVEL)
 formatter = logging.Formatter(LOG_FORMATER)
 
 stream_handler = logging.StreamHandler()
-# maximum 10MB, keep 30 backup log files(1 month)
-file_handler = RotatingFileHandler(
-    f"{LOG_DIR}/{LOG_FILE_NAME}",
-    maxBytes=LOG_MAX_BYTES,
-    backupCount=LOG_FILE_BACKUP_COUNT,
-    encoding="utf-8",
-)
-
 stream_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
 
 # prevent adding multiple handlers in case of multiple imports
 if not logger.hasHandlers():
+    logger.addHandler(stream_handler)  # console output
+
+
+# add rotating log file, called from app lifespan so importing the app writes no files
+def setup_file_logging():
+    if any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
+        return
+
+    # create logging directory if not exists
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # maximum 10MB, keep 30 backup log files(1 month)
+    file_handler = RotatingFileHandler(
+        f"{LOG_DIR}/{LOG_FILE_NAME}",
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)  # also add console output
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import TYPE_CHECKING
+
+from redis.exceptions import WatchError
+
+from app.config import (
+    CHUNK_MEMORY_FACTOR,
+    EXTRACTION_ADMISSION_POLL_SECONDS,
+    EXTRACTION_ADMISSION_TIMEOUT_SECONDS,
+    EXTRACTION_MEMORY_KEY_PREFIX,
+    EXTRACTION_MEMORY_RESERVATION_SECONDS,
+    HOST_MEMORY_BUDGET_BYTES,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# physical memory of the host or container, in bytes
+def get_total_memory() -> int:
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+# memory extraction jobs on this host may reserve in total
+def get_host_memory_budget() -> int:
+    # default to 80% of physical memory, leaving room for the web app itself
+    return HOST_MEMORY_BUDGET_BYTES or int(get_total_memory() * 0.8)
+
+
+# measured memory of a dataframe per row, including python string objects
+def get_bytes_per_row(df: "pd.DataFrame") -> float:
+    if len(df) == 0:
+        return 0
+    return df.memory_usage(index=True, deep=True).sum() / len(df)
+
+
+# chunk size whose intermediate dataframes fit into the remaining job budget
+def get_adaptive_chunk_size(bytes_per_row: float, budget_bytes: int) -> int:
+    """
+    A chunk is held up to CHUNK_MEMORY_FACTOR times at once
+    (attachment chunk, db result and merged result), so the chunk size is
+    derived from the measured bytes per merged row.
+    """
+    if bytes_per_row <= 0:
+        return MAX_CHUNK_SIZE
+    chunk_size = int(budget_bytes / (bytes_per_row * CHUNK_MEMORY_FACTOR))
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, chunk_size))
+
+
+# redis hash holding memory reservations of running jobs on this host
+def get_host_memory_key() -> str:
+    return f"{EXTRACTION_MEMORY_KEY_PREFIX}:{socket.gethostname()}"
+
+
+# reserve amount for a job in a redis hash of reservations, if it fits into limit
+def try_reserve(
+    key: str, job_id: str, amount: int, limit: int, expire_seconds: int
+) -> bool:
+    """
+    Shared by memory and scratch disk budgets. Reservations of crashed workers
+    expire after expire_seconds. Reserving again with the same job_id resizes
+    the reservation of that job.
+
+    Args:
+        key (str): redis hash of reservations, e.g. per host
+        job_id (str): reservation owner
+        amount (int): bytes to reserve
+        limit (int): total bytes all reservations may add up to
+        expire_seconds (int): lifetime of the reservation
+    Returns:
+        bool: whether the reservation was made
+    """
+    now = time.time()
+
+    with redis_client.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(key)
+                reservations = {
+                    job: json.loads(value) for job, value in pipe.hgetall(key).items()
+                }
+                # reservations of crashed workers expire
+                expired_jobs = [
+                    job
+                    for job, reservation in reservations.items()
+                    if reservation["expires_at"] < now
+                ]
+                # a job reserving again replaces its own reservation
+                reserved_bytes = sum(
+                    reservation["bytes"]
+                    for job, reservation in reservations.items()
+                    if job not in expired_jobs and job != job_id
+                )
+                if reserved_bytes + amount > limit:
+                    pipe.unwatch()
+                    return False
+
+                pipe.multi()
+                if expired_jobs:
+                    pipe.hdel(key, *expired_jobs)
+                reservation = {"bytes": amount, "expires_at": now + expire_seconds}
+                pipe.hset(key, job_id, json.dumps(reservation))
+                pipe.execute()
+                return True
+
+            # another worker changed reservations, try again
+            except WatchError:
+                continue
+
+
+# reserve job memory if the host still has budget left
+def try_reserve_memory(job_id: str, budget_bytes: int) -> bool:
+    return try_reserve(
+        get_host_memory_key(),
+        job_id,
+        budget_bytes,
+        get_host_memory_budget(),
+        EXTRACTION_MEMORY_RESERVATION_SECONDS,
+    )
+
+
+# wait until the job is admitted within the host memory budget
+async def wait_for_memory(job_id: str, budget_bytes: int) -> bool:
+    """
+    Returns:
+        bool: False if the job was not admitted within the admission timeout
+    """
+    deadline = time.monotonic() + EXTRACTION_ADMISSION_TIMEOUT_SECONDS
+    while not try_reserve_memory(job_id, budget_bytes):
+        if time.monotonic() > deadline:
+            return False
+        logger.info(f"waiting for host memory budget, job: {job_id}")
+        await asyncio.sleep(EXTRACTION_ADMISSION_POLL_SECONDS)
+    return True
+
+
+# release memory reserved by a finished job
+def release_memory(job_id: str):
+    redis_client.hdel(get_host_memory_key(), job_id)
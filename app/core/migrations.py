@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import os
+import re
+import time
+
+from app.config import (
+    MIGRATION_LOCK_NAME,
+    MIGRATION_LOCK_TIMEOUT_SECONDS,
+    MIGRATION_STARTUP_TIMEOUT_SECONDS,
+    MIGRATIONS_PATH,
+    MIGRATIONS_TABLE,
+    PII_COLUMNS,
+)
+from app.core.db_connection import get_db_connection
+from app.core.identifiers import IDENTIFIER_COLUMNS
+from app.core.logger import logger
+
+# "0002_add_users_pii_covering_indexes.sql" -> version 2
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+CREATE_MIGRATIONS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+        version INT PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class MigrationLockError(RuntimeError):
+    pass
+
+
+# versioned migration files, oldest first
+def list_migrations(path: str = MIGRATIONS_PATH) -> list[dict]:
+    """
+    Raises:
+        ValueError: if two migration files have the same version
+    """
+    migrations = {}
+    for file_name in sorted(os.listdir(path)):
+        match = MIGRATION_FILE_PATTERN.match(file_name)
+        if not match:
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version: {file_name}")
+
+        with open(os.path.join(path, file_name), "rb") as f:
+            sql = f.read()
+        migrations[version] = {
+            "version": version,
+            "name": match.group(2),
+            "sql": sql.decode("utf-8"),
+            "checksum": hashlib.sha256(sql).hexdigest(),
+        }
+    return [migrations[version] for version in sorted(migrations)]
+
+
+# split migration file into statements, dropping "--" comment lines
+def split_sql_statements(sql: str) -> list[str]:
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+# applied migrations by version
+def get_applied_migrations(cursor) -> dict[int, dict]:
+    cursor.execute(CREATE_MIGRATIONS_TABLE_SQL)
+    cursor.execute(f"SELECT version, name, checksum FROM {MIGRATIONS_TABLE}")
+    return {
+        version: {"name": name, "checksum": checksum}
+        for version, name, checksum in cursor.fetchall()
+    }
+
+
+# apply pending migrations in version order
+def apply_migrations(conn, path: str = MIGRATIONS_PATH) -> list[str]:
+    """
+    A mysql named lock serializes workers starting at the same time, so each
+    migration runs once. MySQL commits DDL implicitly, a migration is recorded
+    right after its statements succeed.
+
+    Returns:
+        list[str]: names of the applied migrations
+    Raises:
+        MigrationLockError: if another worker held the lock for too long
+    """
+    applied = []
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT GET_LOCK(%s, %s)",
+            (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT_SECONDS),
+        )
+        if cursor.fetchone()[0] != 1:
+            raise MigrationLockError("Migrations are being applied by another worker.")
+
+        try:
+            applied_migrations = get_applied_migrations(cursor)
+            for migration in list_migrations(path):
+                version = migration["version"]
+                if version in applied_migrations:
+                    # applied migrations are never edited, add a new one instead
+                    if applied_migrations[version]["checksum"] != migration["checksum"]:
+                        logger.warning(
+                            f"migration {version:04d}_{migration['name']} was "
+                            f"changed after it was applied"
+                        )
+                    continue
+
+                logger.info(f"applying migration {version:04d}_{migration['name']}")
+                for statement in split_sql_statements(migration["sql"]):
+                    cursor.execute(statement)
+                cursor.execute(
+                    f"INSERT INTO {MIGRATIONS_TABLE} (version, name, checksum) "
+                    f"VALUES (%s, %s, %s)",
+                    (version, migration["name"], migration["checksum"]),
+                )
+                conn.commit()
+                applied.append(f"{version:04d}_{migration['name']}")
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+            cursor.fetchall()
+    return applied
+
+
+# every migration file with its applied flag
+def get_migration_status(conn, path: str = MIGRATIONS_PATH) -> list[dict]:
+    with conn.cursor() as cursor:
+        applied_migrations = get_applied_migrations(cursor)
+    return [
+        {
+            "version": migration["version"],
+            "name": migration["name"],
+            "applied": migration["version"] in applied_migrations,
+        }
+        for migration in list_migrations(path)
+    ]
+
+
+# index columns that answer a lookup by key_type without reading the rows
+def get_covering_index_columns(key_type: str) -> list[str]:
+    # secondary indexes hold the user_id primary key implicitly
+    return [key_type] + [col for col in PII_COLUMNS if col not in (key_type, "user_id")]
+
+
+# DDL of covering indexes for the configured PII_COLUMNS, for a new migration
+def render_covering_index_sql() -> str:
+    # user_id lookups read the clustered primary key, which holds every column
+    indexes = [
+        f"    ADD INDEX idx_users_{key_type}_pii "
+        f"({', '.join(get_covering_index_columns(key_type))}),"
+        for key_type in IDENTIFIER_COLUMNS
+        if key_type != "user_id"
+    ]
+    return (
+        "ALTER TABLE users\n"
+        + "\n".join(indexes)
+        + "\n    ALGORITHM=INPLACE, LOCK=NONE;"
+    )
+
+
+# key types whose lookup has no covering index for the configured PII_COLUMNS
+def find_uncovered_lookups(conn) -> list[str]:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_name, column_name
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = 'users'
+            ORDER BY index_name, seq_in_index
+            """
+        )
+        rows = cursor.fetchall()
+
+    indexes = {}
+    for index_name, column_name in rows:
+        indexes.setdefault(index_name, []).append(column_name)
+
+    uncovered = []
+    for key_type in IDENTIFIER_COLUMNS:
+        if key_type == "user_id":
+            continue
+        needed = set(get_covering_index_columns(key_type))
+        if not any(
+            columns[0] == key_type and needed <= set(columns)
+            for columns in indexes.values()
+        ):
+            uncovered.append(key_type)
+    return uncovered
+
+
+# apply migrations on startup, retrying while mysql is still starting
+def run_startup_migrations():
+    """
+    Best effort: failures are logged, the worker still starts and the
+    readiness check reports mysql.
+    """
+    deadline = time.monotonic() + MIGRATION_STARTUP_TIMEOUT_SECONDS
+    while True:
+        try:
+            conn = get_db_connection()
+            break
+        except Exception as e:
+            if time.monotonic() > deadline:
+                logger.error(f"migrations skipped, MySQL is not reachable: {e}")
+                return
+            time.sleep(2)
+
+    try:
+        applied = apply_migrations(conn)
+        logger.info(f"schema is up to date, applied migrations: {applied or 'none'}")
+
+        uncovered = find_uncovered_lookups(conn)
+        if uncovered:
+            logger.warning(
+                f"lookups by {uncovered} have no covering index for PII_COLUMNS "
+                f"{PII_COLUMNS}, add a migration with: "
+                f"python -m app.core.migrations covering-index-sql"
+            )
+    except Exception as e:
+        logger.error(f"failed to apply migrations: {e}")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned MySQL schema migrations")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="upgrade",
+        choices=["upgrade", "status", "covering-index-sql"],
+    )
+    args = parser.parse_args()
+
+    if args.command == "covering-index-sql":
+        print(render_covering_index_sql())
+        return
+
+    conn = get_db_connection()
+    try:
+        if args.command == "upgrade":
+            applied = apply_migrations(conn)
+            print(f"applied: {', '.join(applied) or 'none'}")
+        else:
+            for migration in get_migration_status(conn):
+                state = "applied" if migration["applied"] else "pending"
+                print(f"{migration['version']:04d}_{migration['name']}  {state}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from fastapi import Request
+
+from app.config import (
+    PROFILE_HEADER,
+    PROFILE_MAX_AGE_SECONDS,
+    PROFILE_MAX_FILES,
+    PROFILE_PATH,
+    PROFILE_QUERY_PARAM,
+    PROFILE_TEXT_LINES,
+)
+from app.core.logger import logger
+
+PROFILE_ID_PATTERN = re.compile(r"^\d+_[A-Za-z0-9-]+_[0-9a-f]{8}$")
+TRUE_VALUES = {"1", "true", "yes"}
+
+# only one profiler can be active per interpreter; the lock is per process,
+# so each uvicorn worker profiles at most one request at a time
+profiler_lock = threading.Lock()
+
+# profile of the current request, copied into its asyncio.to_thread workers
+active_profile: ContextVar[dict | None] = ContextVar("active_profile", default=None)
+
+
+class ProfilerBusyError(RuntimeError):
+    pass
+
+
+# whether the request asks to be profiled via header or query flag
+def is_profiling_requested(request: Request) -> bool:
+    value = request.headers.get(PROFILE_HEADER) or request.query_params.get(
+        PROFILE_QUERY_PARAM, ""
+    )
+    return value.lower() in TRUE_VALUES
+
+
+def get_profile_path(profile_id: str) -> str:
+    """
+    Args:
+        profile_id (str): id returned when the profile was saved
+    Returns:
+        str: path of the pstats file
+    Raises:
+        ValueError: if profile_id is not a valid id
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        raise ValueError(f"Invalid profile id: {profile_id}")
+    return os.path.join(PROFILE_PATH, f"{profile_id}.prof")
+
+
+# collect cProfile stats of the block's worker threads and save them as a
+# downloadable artifact
+@contextmanager
+def profile_block(name: str):
+    """
+    The profiler is not enabled in the event loop thread, which serves other
+    requests meanwhile. Blocking stages wrapped with profiled() enable it in the
+    worker thread running them, their stats are merged into one profile.
+    On python 3.12+ (the Docker image) cProfile uses sys.monitoring, which also
+    counts other threads while a stage runs.
+
+    Args:
+        name (str): label saved in the profile id, e.g. jira ticket key
+    Yields:
+        dict: holds "profile_id" once the block has finished, if a profiled
+            stage ran
+    Raises:
+        ProfilerBusyError: if another request is being profiled
+    """
+    if not profiler_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Another request is being profiled, try again later.")
+
+    label = re.sub(r"[^A-Za-z0-9-]", "-", name)[:50] or "request"
+    profile_id = f"{int(time.time())}_{label}_{uuid.uuid4().hex[:8]}"
+    result = {}
+    profilers = []
+    token = active_profile.set({"profilers": profilers})
+    try:
+        try:
+            yield result
+        finally:
+            active_profile.reset(token)
+            # nothing to save when the block failed before any profiled stage
+            if profilers:
+                os.makedirs(PROFILE_PATH, exist_ok=True)
+                pstats.Stats(*profilers).dump_stats(get_profile_path(profile_id))
+                result["profile_id"] = profile_id
+                logger.info(f"saved profile {profile_id}")
+                prune_profiles()
+    finally:
+        profiler_lock.release()
+
+
+# wrap a blocking stage so it is profiled in the thread that runs it
+def profiled(func):
+    """
+    No-op unless called within profile_block, pass the wrapper to
+    asyncio.to_thread, which copies the request context into the worker.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = active_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profile["profilers"].append(profiler)
+
+    return wrapper
+
+
+# saved profiles, newest first
+def list_profiles() -> list[dict]:
+    if not os.path.isdir(PROFILE_PATH):
+        return []
+
+    profiles = []
+    for file_name in os.listdir(PROFILE_PATH):
+        profile_id, ext = os.path.splitext(file_name)
+        if ext != ".prof" or not PROFILE_ID_PATTERN.match(profile_id):
+            continue
+        stat = os.stat(os.path.join(PROFILE_PATH, file_name))
+        profiles.append(
+            {
+                "profile_id": profile_id,
+                "size": stat.st_size,
+                "created_at": stat.st_mtime,
+            }
+        )
+    return sorted(profiles, key=lambda x: x["created_at"], reverse=True)
+
+
+# delete profiles past max age, then oldest ones above the file limit
+def prune_profiles():
+    now = time.time()
+    for index, profile in enumerate(list_profiles()):
+        is_stale = now - profile["created_at"] > PROFILE_MAX_AGE_SECONDS
+        if is_stale or index >= PROFILE_MAX_FILES:
+            try:
+                os.remove(get_profile_path(profile["profile_id"]))
+            except FileNotFoundError:
+                pass
+
+
+# top functions by cumulative time, readable without pstats tooling
+def render_profile_text(profile_id: str) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(get_profile_path(profile_id), stream=stream)
+    stats.sort_stats("cumulative").print_stats(PROFILE_TEXT_LINES)
+    return stream.getvalue()
@@ -0,0 +1,153 @@
+import json
+import time
+
+from fastapi import Request
+
+from app.config import (
+    EXTRACTION_PROGRESS_CHANNEL_PREFIX,
+    EXTRACTION_PROGRESS_EXPIRE_SECONDS,
+    EXTRACTION_PROGRESS_KEY_PREFIX,
+    PROGRESS_KEEPALIVE_SECONDS,
+)
+from app.core.logger import logger
+from app.core.redis_client import create_async_redis_client, redis_client
+
+FINAL_STAGES = {"done", "failed"}
+
+
+def get_progress_key(ticket_key: str) -> str:
+    return f"{EXTRACTION_PROGRESS_KEY_PREFIX}:{ticket_key}"
+
+
+def get_progress_channel(ticket_key: str) -> str:
+    return f"{EXTRACTION_PROGRESS_CHANNEL_PREFIX}:{ticket_key}"
+
+
+class ProgressReporter:
+    """
+    Publishes stage, rows processed, throughput and ETA of an extraction job.
+    The latest event is also kept in Redis, so a page opened mid-job starts
+    from the current state instead of waiting for the next chunk.
+    """
+
+    def __init__(self, ticket_key: str, job_id: str):
+        self.ticket_key = ticket_key
+        self.job_id = job_id
+        self.stage = "queued"
+        self.message = None
+        self.files_done = 0
+        self.files_total = 0
+        self.file_name = None
+        self.rows_done = 0
+        self.rows_total = 0
+        # rows restored from a checkpoint do not count towards throughput
+        self.rows_started = 0
+        self.file_started_at = time.monotonic()
+
+    def set_stage(self, stage: str, message: str | None = None):
+        self.stage = stage
+        self.message = message
+        self.publish()
+
+    def start_file(self, file_name: str, rows_total: int, rows_done: int = 0):
+        self.stage = "extracting"
+        self.message = None
+        self.file_name = file_name
+        self.rows_total = rows_total
+        self.rows_done = rows_done
+        self.rows_started = rows_done
+        self.file_started_at = time.monotonic()
+        self.publish()
+
+    def update_rows(self, rows_done: int):
+        self.rows_done = rows_done
+        self.publish()
+
+    # rows per second of the current file and seconds until it is finished
+    def get_throughput(self) -> tuple[float | None, float | None]:
+        elapsed = time.monotonic() - self.file_started_at
+        rows_processed = self.rows_done - self.rows_started
+        if elapsed <= 0 or rows_processed <= 0:
+            return None, None
+        rows_per_second = rows_processed / elapsed
+        return rows_per_second, (self.rows_total - self.rows_done) / rows_per_second
+
+    def to_event(self) -> dict:
+        rows_per_second, eta_seconds = self.get_throughput()
+        return {
+            "ticket_key": self.ticket_key,
+            "job_id": self.job_id,
+            "stage": self.stage,
+            "message": self.message,
+            "file": self.file_name,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "rows_per_second": rows_per_second,
+            "eta_seconds": eta_seconds,
+            "updated_at": time.time(),
+        }
+
+    # progress is best effort, a redis hiccup must not fail the extraction
+    def publish(self):
+        try:
+            event = json.dumps(self.to_event())
+            pipe = redis_client.pipeline()
+            pipe.set(
+                get_progress_key(self.ticket_key),
+                event,
+                ex=EXTRACTION_PROGRESS_EXPIRE_SECONDS,
+            )
+            pipe.publish(get_progress_channel(self.ticket_key), event)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to publish progress of {self.ticket_key}: {e}")
+
+
+def format_sse(event: str) -> str:
+    return f"event: progress\ndata: {event}\n\n"
+
+
+def is_final_event(event: str) -> bool:
+    return json.loads(event).get("stage") in FINAL_STAGES
+
+
+# server-sent events of a ticket until its job finishes or the client leaves
+async def stream_progress(ticket_key: str, request: Request):
+    """
+    Subscribes before reading the latest event, so no event published in
+    between is lost; a duplicate of the latest event is harmless.
+
+    Args:
+        ticket_key (str): jira issue key
+        request (Request): request of the subscriber, to detect disconnects
+    Yields:
+        str: server-sent event lines
+    """
+    client = create_async_redis_client()
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(get_progress_channel(ticket_key))
+
+        # a finished job of an earlier run is not replayed to a new subscriber
+        latest = await client.get(get_progress_key(ticket_key))
+        if latest and not is_final_event(latest):
+            yield format_sse(latest)
+
+        last_sent_at = time.monotonic()
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1.0
+            )
+            if message:
+                yield format_sse(message["data"])
+                last_sent_at = time.monotonic()
+                if is_final_event(message["data"]):
+                    return
+            elif time.monotonic() - last_sent_at > PROGRESS_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                last_sent_at = time.monotonic()
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from app.config import (
+    JIRA_BASE_URL,
+    MYSQL_HOST,
+    MYSQL_PORT,
+    MYSQL_REPLICA_HOSTS,
+    READINESS_CACHE_SECONDS,
+    READINESS_PROBE_TIMEOUT_SECONDS,
+    READINESS_REQUIRED_CHECKS,
+)
+from app.core.db_connection import get_db_connection, get_pooled_connection
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+from app.core.templates import templates
+
+# last readiness result, shared by all requests of the worker
+readiness_cache = {"checked_at": 0.0, "result": None}
+readiness_lock = threading.Lock()
+warm_up_done = threading.Event()
+
+
+def probe_redis():
+    redis_client.ping()
+
+
+def probe_mysql():
+    conn = get_db_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+    finally:
+        conn.close()
+
+
+# serverInfo needs no credentials, and the request keeps a jira connection open
+def probe_jira():
+    from app.core.jira_rate_limiter import jira_session
+
+    response = jira_session.get(
+        f"{JIRA_BASE_URL.rstrip('/')}/rest/api/2/serverInfo",
+        timeout=READINESS_PROBE_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+
+
+PROBES = {"redis": probe_redis, "mysql": probe_mysql, "jira": probe_jira}
+
+
+# run a probe and measure its round trip
+def run_probe(probe) -> dict:
+    start = time.perf_counter()
+    try:
+        probe()
+        return {"ok": True, "latency_ms": (time.perf_counter() - start) * 1000}
+    except Exception as e:
+        return {
+            "ok": False,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "error": str(e),
+        }
+
+
+# probe all dependencies in parallel, a hung probe is reported as timed out
+def probe_dependencies() -> dict:
+    executor = ThreadPoolExecutor(max_workers=len(PROBES))
+    futures = {
+        name: executor.submit(run_probe, probe) for name, probe in PROBES.items()
+    }
+    wait(futures.values(), timeout=READINESS_PROBE_TIMEOUT_SECONDS)
+    executor.shutdown(wait=False)
+
+    checks = {}
+    for name, future in futures.items():
+        if future.done():
+            checks[name] = future.result()
+        else:
+            checks[name] = {
+                "ok": False,
+                "latency_ms": READINESS_PROBE_TIMEOUT_SECONDS * 1000,
+                "error": "timed out",
+            }
+    return checks
+
+
+# readiness of this worker, cached so load balancer polls do not hit dependencies
+def check_readiness(force: bool = False) -> dict:
+    """
+    Args:
+        force (bool): probe even if the cached result is still fresh
+    Returns:
+        dict: "ready" flag and latency/error of each dependency check
+    """
+    # one request probes at a time, the others wait and reuse its result
+    with readiness_lock:
+        now = time.monotonic()
+        is_fresh = now - readiness_cache["checked_at"] < READINESS_CACHE_SECONDS
+        if readiness_cache["result"] and is_fresh and not force:
+            return readiness_cache["result"]
+
+        checks = probe_dependencies()
+        is_ready = warm_up_done.is_set() and all(
+            checks[name]["ok"] for name in READINESS_REQUIRED_CHECKS if name in checks
+        )
+        result = {"ready": is_ready, "checks": checks}
+        readiness_cache.update(checked_at=time.monotonic(), result=result)
+
+    if not is_ready:
+        logger.warning(f"worker not ready: {checks}")
+    return result
+
+
+# open connection pools and compile templates before the worker takes traffic
+def warm_up():
+    """
+    Best effort: failures are logged and reported by the readiness check,
+    so a dependency that is still starting does not stop the worker.
+    """
+    start = time.perf_counter()
+
+    # jinja caches compiled templates, so first page renders skip parsing
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+
+    # a mysql pool opens all of its connections when it is created
+    for host in [f"{MYSQL_HOST}:{MYSQL_PORT}", *MYSQL_REPLICA_HOSTS]:
+        try:
+            get_pooled_connection(host).close()
+        except Exception as e:
+            logger.error(f"warm-up of MySQL pool {host} failed: {e}")
+
+    # probing opens the redis connection and a jira connection
+    warm_up_done.set()
+    result = check_readiness(force=True)
+    logger.info(
+        f"warm-up finished in {time.perf_counter() - start:.2f}s, "
+        f"ready: {result['ready']}"
+    )
@@ -1,22 +1,68 @@
+import threading
+
 import redis
+import redis.asyncio
 from redis.retry import Retry
 from redis.backoff import ExponentialBackoff
 from app.config import REDIS_URL
 
-# redis retry strategy
-retry_strategy = Retry(
-    retries=3,  # max-retry count
-    backoff=ExponentialBackoff(
-        base=0.1, cap=2.0
-    ),  # 0.1 delay for retry , maximum-wait-time = 2sec
-)
 
 # create redis client object
-redis_client = redis.Redis.from_url(
-    REDIS_URL,
-    decode_responses=True,
-    socket_connect_timeout=3,  # add connection timeout
-    socket_timeout=3,  # redis read/write waiting timeout
-    retry_on_timeout=True,
-    retry=retry_strategy,
-)
+def create_redis_client() -> redis.Redis:
+    # redis retry strategy
+    retry_strategy = Retry(
+        retries=3,  # max-retry count
+        backoff=ExponentialBackoff(
+            base=0.1, cap=2.0
+        ),  # 0.1 delay for retry , maximum-wait-time = 2sec
+    )
+
+    return redis.Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=3,  # add connection timeout
+        socket_timeout=3,  # redis read/write waiting timeout
+        retry_on_timeout=True,
+        retry=retry_strategy,
+    )
+
+
+# async client for long-lived subscriptions, e.g. progress streams
+def create_async_redis_client() -> redis.asyncio.Redis:
+    return redis.asyncio.Redis.from_url(
+        REDIS_URL,
+        decode_responses=True,
+        socket_connect_timeout=3,
+    )
+
+
+class LazyRedisClient:
+    """
+    Shared redis client, created by the app lifespan or on first use
+    (tests, scripts), so importing a module never creates a connection pool.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    # create the client once, returns the existing one afterwards
+    def connect(self) -> redis.Redis:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = create_redis_client()
+        return self._client
+
+    # close connection pool on shutdown
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def __getattr__(self, name):
+        return getattr(self.connect(), name)
+
+
+redis_client = LazyRedisClient()
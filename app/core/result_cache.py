@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import shutil
+import socket
+import time
+
+from app.config import (
+    RESULT_CACHE_KEY_PREFIX,
+    RESULT_CACHE_MAX_AGE_SECONDS,
+    RESULT_CACHE_MAX_BYTES,
+    RESULT_CACHE_PATH,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+HASH_READ_BYTES = 1024 * 1024  # read attachment in 1MB blocks while hashing
+
+
+# content hash of an attachment together with the selected pii columns
+def compute_result_cache_key(file_path: str, columns: list[str]) -> str:
+    """
+    Args:
+        file_path (str): downloaded attachment path
+        columns (list[str]): columns looked up from users table
+    Returns:
+        str: sha256 hex digest used as result cache key
+    """
+    digest = hashlib.sha256()
+    digest.update(",".join(columns).encode("utf-8"))
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_READ_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# redis hash indexing the results cached on this host, artifacts are node-local
+def get_result_cache_index_key() -> str:
+    return f"{RESULT_CACHE_KEY_PREFIX}:{socket.gethostname()}"
+
+
+# remove a single cache entry and its artifact
+def remove_result(cache_key: str, entry: dict):
+    redis_client.hdel(get_result_cache_index_key(), cache_key)
+    if os.path.isfile(entry["path"]):
+        os.remove(entry["path"])
+
+
+# return cached merged output path if it exists and is still fresh
+def get_cached_result(cache_key: str) -> str | None:
+    value = redis_client.hget(get_result_cache_index_key(), cache_key)
+    if not value:
+        return None
+
+    entry = json.loads(value)
+    if time.time() - entry["created_at"] > RESULT_CACHE_MAX_AGE_SECONDS:
+        remove_result(cache_key, entry)
+        return None
+    # entry stays indexed, it is replaced when the result is stored again
+    if not os.path.isfile(entry["path"]):
+        return None
+
+    return entry["path"]
+
+
+# keep a copy of merged output so identical extractions can reuse it
+def store_result(cache_key: str, result_file: str):
+    try:
+        os.makedirs(RESULT_CACHE_PATH, exist_ok=True)
+        cached_path = os.path.join(RESULT_CACHE_PATH, f"{cache_key}.csv")
+        shutil.copyfile(result_file, cached_path)
+
+        entry = {
+            "path": cached_path,
+            "size": os.path.getsize(cached_path),
+            "created_at": time.time(),
+        }
+        redis_client.hset(get_result_cache_index_key(), cache_key, json.dumps(entry))
+        evict_results()
+
+    # caching is best effort, extraction result is already saved
+    except Exception as e:
+        logger.error(f"Failed to cache extraction result {result_file}: {e}")
+
+
+# evict stale entries, then oldest entries until total size of this host's
+# cache fits the limit
+def evict_results():
+    entries = {
+        key: json.loads(value)
+        for key, value in redis_client.hgetall(get_result_cache_index_key()).items()
+    }
+
+    now = time.time()
+    for key, entry in list(entries.items()):
+        if now - entry["created_at"] > RESULT_CACHE_MAX_AGE_SECONDS:
+            remove_result(key, entry)
+            del entries[key]
+
+    total_size = sum(entry["size"] for entry in entries.values())
+    for key, entry in sorted(entries.items(), key=lambda x: x[1]["created_at"]):
+        if total_size <= RESULT_CACHE_MAX_BYTES:
+            break
+        remove_result(key, entry)
+        total_size -= entry["size"]
+        logger.info(f"evicted cached extraction result {key}")
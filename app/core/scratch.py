@@ -0,0 +1,300 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+
+from app.config import (
+    EXTRACTION_ADMISSION_POLL_SECONDS,
+    EXTRACTION_ADMISSION_TIMEOUT_SECONDS,
+    EXTRACTION_MEMORY_RESERVATION_SECONDS,
+    SCRATCH_BYTES_PER_INPUT_BYTE,
+    SCRATCH_GC_INTERVAL_SECONDS,
+    SCRATCH_KEY_PREFIX,
+    SCRATCH_PATH,
+    SCRATCH_QUOTA_BYTES,
+    SCRATCH_SMALL_JOB_MAX_BYTES,
+    SCRATCH_SMALL_JOB_PATH,
+    SCRATCH_SMALL_JOB_QUOTA_BYTES,
+    SCRATCH_TTL_SECONDS,
+)
+from app.core.attachment_store import get_ticket_attachment_dir
+from app.core.checkpoint import get_job_work_dir, get_previous_work_dir
+from app.core.locks import get_ticket_lock_key
+from app.core.logger import logger
+from app.core.memory_budget import try_reserve
+from app.core.redis_client import redis_client
+
+
+# scratch volumes by name: fast small-job volume (optional) and the default volume
+def get_scratch_volumes() -> dict[str, dict]:
+    volumes = {"default": {"path": SCRATCH_PATH, "quota_bytes": SCRATCH_QUOTA_BYTES}}
+    if SCRATCH_SMALL_JOB_PATH:
+        volumes["small"] = {
+            "path": SCRATCH_SMALL_JOB_PATH,
+            "quota_bytes": SCRATCH_SMALL_JOB_QUOTA_BYTES,
+        }
+    return volumes
+
+
+# redis hash of scratch reservations of running jobs on this host
+def get_scratch_key(volume: str) -> str:
+    return f"{SCRATCH_KEY_PREFIX}:{socket.gethostname()}:{volume}"
+
+
+# scratch bytes a job needs for its extracted csvs and zips
+def estimate_scratch_bytes(file_paths: list[str]) -> int:
+    return int(sum(os.path.getsize(path) for path in file_paths)) * (
+        SCRATCH_BYTES_PER_INPUT_BYTE
+    )
+
+
+def is_under(path: str, root: str) -> bool:
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(root)]) == (
+        os.path.abspath(root)
+    )
+
+
+# volume of the job: the volume of its resumable dir, otherwise by estimated size
+def select_scratch_volume(ticket_key: str, estimated_bytes: int) -> str:
+    volumes = get_scratch_volumes()
+    previous_dir = get_previous_work_dir(ticket_key)
+    if previous_dir:
+        for name, volume in volumes.items():
+            if is_under(previous_dir, volume["path"]):
+                return name
+
+    if "small" in volumes and estimated_bytes <= SCRATCH_SMALL_JOB_MAX_BYTES:
+        return "small"
+    return "default"
+
+
+# reserve scratch quota on the volume if its disk also has the space left
+def try_reserve_scratch(volume: str, job_id: str, amount: int) -> bool:
+    config = get_scratch_volumes()[volume]
+    os.makedirs(config["path"], exist_ok=True)
+    if shutil.disk_usage(config["path"]).free < amount:
+        return False
+    return try_reserve(
+        get_scratch_key(volume),
+        job_id,
+        amount,
+        config["quota_bytes"],
+        EXTRACTION_MEMORY_RESERVATION_SECONDS,
+    )
+
+
+# allocate the work dir of a job within the scratch quota of its volume
+async def allocate_job_scratch(
+    ticket_key: str, job_id: str, estimated_bytes: int
+) -> tuple[str, str]:
+    """
+    A job larger than the whole quota reserves the full quota, so it runs
+    alone instead of never being admitted.
+
+    Args:
+        ticket_key (str): jira issue key
+        job_id (str): unique id of the extraction job
+        estimated_bytes (int): scratch bytes the job is expected to write
+    Returns:
+        (work_dir, volume): dir of the job and name of its scratch volume
+    Raises:
+        TimeoutError: if the quota did not free up within the admission timeout
+    """
+    volume = select_scratch_volume(ticket_key, estimated_bytes)
+    config = get_scratch_volumes()[volume]
+    amount = min(estimated_bytes, config["quota_bytes"])
+
+    deadline = time.monotonic() + EXTRACTION_ADMISSION_TIMEOUT_SECONDS
+    while not try_reserve_scratch(volume, job_id, amount):
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Scratch space on {config['path']} exhausted, "
+                f"extraction of {ticket_key} was not started."
+            )
+        logger.info(f"waiting for scratch space on {volume}, job: {job_id}")
+        # expired artifacts may be all that is in the way, then cached attachments
+        await asyncio.to_thread(collect_scratch_garbage)
+        await asyncio.to_thread(evict_attachment_dirs, config["path"], amount)
+        await asyncio.sleep(EXTRACTION_ADMISSION_POLL_SECONDS)
+
+    work_dir = get_job_work_dir(ticket_key, job_id, config["path"])
+    return work_dir, volume
+
+
+# release the scratch quota of a finished job
+def release_job_scratch(volume: str, job_id: str):
+    redis_client.hdel(get_scratch_key(volume), job_id)
+
+
+# delete output and work files of a delivered job
+def remove_job_scratch(ticket_key: str, work_dir: str):
+    """
+    Synced attachments are kept, so a re-run of the ticket only downloads
+    changed files; they are evicted by the scratch gc by age, or when a
+    waiting job needs their disk space.
+    """
+    freed_bytes = get_dir_size(work_dir)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    for volume in get_scratch_volumes().values():
+        remove_empty_dirs(os.path.join(volume["path"], ticket_key))
+    logger.info(f"[Jira {ticket_key}] removed job files, freed {freed_bytes} bytes")
+
+
+# free disk space for a waiting job by evicting least recently used attachments
+def evict_attachment_dirs(root: str, needed_bytes: int) -> int:
+    """
+    Attachments of tickets being extracted are kept, the others are simply
+    downloaded again by their next extraction.
+
+    Returns:
+        int: bytes freed
+    """
+    attachment_dirs = sorted(
+        (get_last_modified(path), ticket_key, path)
+        for ticket_key, path in iter_scratch_dirs(root)
+        if path == get_ticket_attachment_dir(ticket_key, root)
+    )
+    freed_bytes = 0
+    for _, ticket_key, path in attachment_dirs:
+        if shutil.disk_usage(root).free >= needed_bytes:
+            break
+        if redis_client.exists(get_ticket_lock_key(ticket_key)):
+            continue
+        size = get_dir_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        remove_empty_dirs(os.path.join(root, ticket_key))
+        freed_bytes += size
+        logger.info(f"[Jira {ticket_key}] evicted attachments, freed {size} bytes")
+    return freed_bytes
+
+
+# remove ticket dir and its jobs dir once nothing is left in them
+def remove_empty_dirs(ticket_dir: str):
+    for path in [os.path.join(ticket_dir, "jobs"), ticket_dir]:
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+
+
+# total size of files under a dir
+def get_dir_size(path: str) -> int:
+    total = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                total += os.path.getsize(os.path.join(dir_path, file_name))
+            except OSError:
+                pass
+    return total
+
+
+# last time anything under a dir was written
+def get_last_modified(path: str) -> float:
+    last_modified = os.path.getmtime(path)
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            try:
+                mtime = os.path.getmtime(os.path.join(dir_path, file_name))
+            except OSError:
+                continue
+            last_modified = max(last_modified, mtime)
+    return last_modified
+
+
+# (ticket_key, artifact dir) of every job dir and attachment dir of a volume
+def iter_scratch_dirs(root: str):
+    if not os.path.isdir(root):
+        return
+    for ticket_key in os.listdir(root):
+        ticket_dir = os.path.join(root, ticket_key)
+        jobs_dir = os.path.join(ticket_dir, "jobs")
+        if os.path.isdir(jobs_dir):
+            for job_id in os.listdir(jobs_dir):
+                yield ticket_key, os.path.join(jobs_dir, job_id)
+        attachment_dir = os.path.join(ticket_dir, "attachments")
+        if os.path.isdir(attachment_dir):
+            yield ticket_key, attachment_dir
+
+
+# delete artifacts untouched for SCRATCH_TTL_SECONDS, skipping tickets being extracted
+def collect_scratch_garbage() -> dict:
+    """
+    Returns:
+        dict: number of removed dirs and bytes freed
+    """
+    now = time.time()
+    removed_dirs, freed_bytes = 0, 0
+    for volume in get_scratch_volumes().values():
+        for ticket_key, path in list(iter_scratch_dirs(volume["path"])):
+            try:
+                if now - get_last_modified(path) < SCRATCH_TTL_SECONDS:
+                    continue
+                if redis_client.exists(get_ticket_lock_key(ticket_key)):
+                    continue
+                size = get_dir_size(path)
+                shutil.rmtree(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove scratch dir {path}: {e}")
+                continue
+
+            removed_dirs += 1
+            freed_bytes += size
+            remove_empty_dirs(os.path.join(volume["path"], ticket_key))
+
+    if removed_dirs:
+        logger.info(
+            f"scratch gc removed {removed_dirs} dirs, freed {freed_bytes} bytes"
+        )
+    return {"removed_dirs": removed_dirs, "freed_bytes": freed_bytes}
+
+
+# disk usage, scratch usage and reserved quota of every scratch volume
+def get_scratch_usage() -> dict:
+    usage = {}
+    for name, volume in get_scratch_volumes().items():
+        path = volume["path"]
+        disk = shutil.disk_usage(path) if os.path.isdir(path) else None
+        scratch_dirs = list(iter_scratch_dirs(path))
+        reservations = redis_client.hgetall(get_scratch_key(name))
+        usage[name] = {
+            "path": path,
+            "quota_bytes": volume["quota_bytes"],
+            "reserved_bytes": sum(
+                json.loads(value)["bytes"] for value in reservations.values()
+            ),
+            "running_jobs": len(reservations),
+            "scratch_bytes": sum(get_dir_size(p) for _, p in scratch_dirs),
+            "scratch_dirs": len(scratch_dirs),
+            "disk_total_bytes": disk.total if disk else None,
+            "disk_free_bytes": disk.free if disk else None,
+        }
+    return usage
+
+
+def scratch_gc_loop(stop_event: threading.Event):
+    while not stop_event.is_set():
+        try:
+            collect_scratch_garbage()
+        except Exception as e:
+            logger.error(f"scratch gc failed: {e}")
+        stop_event.wait(SCRATCH_GC_INTERVAL_SECONDS)
+
+
+# start background gc of expired scratch artifacts
+def start_scratch_gc() -> threading.Event:
+    """
+    Returns:
+        threading.Event: set it to stop the gc
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=scratch_gc_loop,
+        args=(stop_event,),
+        name="scratch-gc",
+        daemon=True,
+    ).start()
+    return stop_event
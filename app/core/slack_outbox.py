@@ -0,0 +1,375 @@
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from itertools import groupby
+from math import ceil
+from typing import TYPE_CHECKING
+
+from app.config import (
+    SLACK_DEAD_LETTER_TTL_SECONDS,
+    SLACK_MAX_RETRIES,
+    SLACK_MAX_TEXT_LENGTH,
+    SLACK_MESSAGE_TTL_SECONDS,
+    SLACK_MIN_SEND_INTERVAL_SECONDS,
+    SLACK_OUTBOX_BATCH_SIZE,
+    SLACK_OUTBOX_DEAD_LETTER_KEY,
+    SLACK_OUTBOX_KEY,
+    SLACK_OUTBOX_POLL_SECONDS,
+    SLACK_OUTBOX_PROCESSING_KEY_PREFIX,
+    SLACK_OUTBOX_SENDERS_KEY,
+    SLACK_RATE_LIMIT_KEY_PREFIX,
+    SLACK_RETRY_BACKOFF_SECONDS,
+    SLACK_SENDER_LEASE_SECONDS,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+if TYPE_CHECKING:
+    import requests
+
+
+REDACTED_TEXT = "[redacted]"
+
+
+# write slack message to the outbox, background sender delivers it
+def enqueue_slack_message(
+    webhook_url: str,
+    message: str,
+    username: str,
+    icon_emoji: str,
+    secrets: list[str] | None = None,
+):
+    """
+    Messages are dropped if undelivered after SLACK_MESSAGE_TTL_SECONDS, and
+    secrets (e.g. archive passwords) are redacted before a message is kept as a
+    dead letter.
+    """
+    item = {
+        "webhook_url": webhook_url,
+        "username": username,
+        "icon_emoji": icon_emoji,
+        "text": message,
+        "secrets": secrets or [],
+        "attempts": 0,
+        "next_attempt_at": 0,
+        "expires_at": time.time() + SLACK_MESSAGE_TTL_SECONDS,
+    }
+    push_messages(SLACK_OUTBOX_KEY, [item], SLACK_MESSAGE_TTL_SECONDS)
+
+
+# append messages to a list that expires once it stops receiving messages
+def push_messages(key: str, items: list[dict], ttl_seconds: int):
+    pipe = redis_client.pipeline()
+    for item in items:
+        pipe.rpush(key, json.dumps(item))
+    pipe.expire(key, ttl_seconds)
+    pipe.execute()
+
+
+# message with its secrets replaced, safe to keep after delivery was given up
+def redact_message(item: dict) -> dict:
+    text = item["text"]
+    for secret in item.get("secrets", []):
+        text = text.replace(secret, REDACTED_TEXT)
+    return {**item, "text": text, "secrets": []}
+
+
+# keep a redacted copy of an undeliverable message for inspection
+def dead_letter_messages(items: list[dict]):
+    push_messages(
+        SLACK_OUTBOX_DEAD_LETTER_KEY,
+        [redact_message(item) for item in items],
+        SLACK_DEAD_LETTER_TTL_SECONDS,
+    )
+
+
+# redis key that blocks sending to a webhook while it is rate limited
+def get_rate_limit_key(webhook_url: str) -> str:
+    webhook_hash = hashlib.sha256(webhook_url.encode("utf-8")).hexdigest()[:16]
+    return f"{SLACK_RATE_LIMIT_KEY_PREFIX}:{webhook_hash}"
+
+
+# id of a sender thread, unique across hosts and processes
+def create_sender_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+# list holding the messages claimed by one sender
+def get_processing_key(sender_id: str) -> str:
+    return f"{SLACK_OUTBOX_PROCESSING_KEY_PREFIX}:{sender_id}"
+
+
+# extend the lease of a sender on its claimed messages
+def renew_sender_lease(sender_id: str):
+    redis_client.zadd(
+        SLACK_OUTBOX_SENDERS_KEY, {sender_id: time.time() + SLACK_SENDER_LEASE_SECONDS}
+    )
+
+
+# move messages claimed by senders whose lease expired back to the outbox
+def recover_expired_senders() -> int:
+    """
+    Live senders keep renewing their lease, so only messages of crashed senders
+    are recovered (at-least-once delivery, a message may be sent twice after a
+    crash in the middle of a send).
+
+    Returns:
+        int: number of recovered messages
+    """
+    recovered = 0
+    for sender_id in redis_client.zrangebyscore(
+        SLACK_OUTBOX_SENDERS_KEY, 0, time.time()
+    ):
+        recovered += return_claimed_messages(get_processing_key(sender_id))
+        redis_client.zrem(SLACK_OUTBOX_SENDERS_KEY, sender_id)
+        logger.warning(f"recovered slack messages of expired sender {sender_id}")
+    return recovered
+
+
+# move every message of a processing list back to the front of the outbox
+def return_claimed_messages(processing_key: str) -> int:
+    returned = 0
+    while redis_client.lmove(processing_key, SLACK_OUTBOX_KEY, "RIGHT", "LEFT"):
+        returned += 1
+    return returned
+
+
+# claim up to batch_size messages, they stay in processing list until handled
+def claim_messages(
+    processing_key: str, batch_size: int = SLACK_OUTBOX_BATCH_SIZE
+) -> list[str]:
+    raw_items = []
+    for _ in range(batch_size):
+        raw_item = redis_client.lmove(SLACK_OUTBOX_KEY, processing_key, "LEFT", "RIGHT")
+        if not raw_item:
+            break
+        raw_items.append(raw_item)
+    if raw_items:
+        redis_client.expire(processing_key, SLACK_MESSAGE_TTL_SECONDS)
+    return raw_items
+
+
+# remove handled messages from processing list, optionally requeue them
+def finish_messages(
+    processing_key: str,
+    raw_items: list[str],
+    requeue_items: list[dict] | None = None,
+):
+    pipe = redis_client.pipeline()
+    for raw_item in raw_items:
+        pipe.lrem(processing_key, 1, raw_item)
+    for item in requeue_items or []:
+        pipe.rpush(SLACK_OUTBOX_KEY, json.dumps(item))
+    if requeue_items:
+        pipe.expire(SLACK_OUTBOX_KEY, SLACK_MESSAGE_TTL_SECONDS)
+    pipe.execute()
+
+
+# group messages of the same channel into slack messages within text length limit
+def coalesce_items(items: list[dict]) -> list[list[dict]]:
+    messages = []
+    length = 0
+    for item in items:
+        if messages and length + len(item["text"]) + 2 <= SLACK_MAX_TEXT_LENGTH:
+            messages[-1].append(item)
+            length += len(item["text"]) + 2
+        else:
+            messages.append([item])
+            length = len(item["text"])
+    return messages
+
+
+# post a single message to slack webhook
+def post_slack_message(
+    webhook_url: str, message: str, username: str, icon_emoji: str
+) -> "requests.Response":
+    import requests
+
+    payload = {
+        "username": username,
+        "icon_emoji": icon_emoji,
+        "text": message,
+    }
+    return requests.post(
+        webhook_url,
+        data=json.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=10,
+    )
+
+
+# schedule failed messages for retry with exponential backoff
+def get_retry_items(items: list[dict], delay: float | None = None) -> list[dict]:
+    retry_items = []
+    for item in items:
+        item["attempts"] += 1
+        if item["attempts"] > SLACK_MAX_RETRIES:
+            logger.error(f"❌ Dropping slack message after {SLACK_MAX_RETRIES} retries")
+            dead_letter_messages([item])
+            continue
+        backoff = SLACK_RETRY_BACKOFF_SECONDS * 2 ** (item["attempts"] - 1)
+        item["next_attempt_at"] = time.time() + max(backoff, delay or 0)
+        retry_items.append(item)
+    return retry_items
+
+
+# seconds to wait from a Retry-After header, slack may send fractions
+def parse_retry_after(value: str | None) -> float:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return float(SLACK_MIN_SEND_INTERVAL_SECONDS)
+
+
+# send coalesced slack messages of one webhook, returns messages to retry
+def send_message_group(
+    webhook_url: str, messages: list[tuple[str, str, list[dict]]]
+) -> list[dict]:
+    """
+    Messages are sent in order, SLACK_MIN_SEND_INTERVAL_SECONDS apart. On a
+    failure the failed slack message and the ones after it are retried, messages
+    already delivered are not sent again.
+
+    Args:
+        webhook_url (str): slack webhook of the channel
+        messages (list): (username, icon_emoji, outbox items) of each slack message
+    """
+    import requests
+
+    for index, (username, icon_emoji, message_items) in enumerate(messages):
+        unsent_items = [item for *_, items in messages[index:] for item in items]
+        if index:
+            time.sleep(SLACK_MIN_SEND_INTERVAL_SECONDS)
+            redis_client.set(
+                get_rate_limit_key(webhook_url), 1, ex=SLACK_MIN_SEND_INTERVAL_SECONDS
+            )
+
+        text = "\n\n".join(item["text"] for item in message_items)
+        try:
+            response = post_slack_message(webhook_url, text, username, icon_emoji)
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                redis_client.set(
+                    get_rate_limit_key(webhook_url), 1, ex=max(ceil(retry_after), 1)
+                )
+                logger.warning(f"Slack rate limited, retry after {retry_after}s")
+                return get_retry_items(unsent_items, retry_after)
+            if response.status_code != 200:
+                raise requests.HTTPError(
+                    f"Status: {response.status_code}, Response: {response.text}"
+                )
+        # any failure of a post goes through the retry path, not only network errors
+        except Exception as e:
+            logger.error(f"❌ Failed to send message: {e}")
+            return get_retry_items(unsent_items)
+
+    sent_count = sum(len(message_items) for *_, message_items in messages)
+    logger.info(f"✅ {sent_count} slack messages sent successfully!")
+    return []
+
+
+# send messages of one webhook, returns messages that need a retry
+def send_channel_messages(webhook_url: str, items: list[dict]) -> list[dict]:
+    # another sender has used this webhook within the rate limit window
+    if not redis_client.set(
+        get_rate_limit_key(webhook_url), 1, nx=True, ex=SLACK_MIN_SEND_INTERVAL_SECONDS
+    ):
+        return items
+
+    # consecutive messages with the same sender identity are coalesced
+    def sender_identity(item):
+        return item["username"], item["icon_emoji"]
+
+    messages = [
+        (username, icon_emoji, message_items)
+        for (username, icon_emoji), group in groupby(items, key=sender_identity)
+        for message_items in coalesce_items(list(group))
+    ]
+    return send_message_group(webhook_url, messages)
+
+
+# deliver one batch of outbox messages
+def drain_outbox(sender_id: str) -> int:
+    """
+    Args:
+        sender_id (str): sender claiming the messages
+    Returns:
+        int: number of messages sent
+    """
+    processing_key = get_processing_key(sender_id)
+    raw_items = claim_messages(processing_key)
+    if not raw_items:
+        return 0
+
+    try:
+        sent_count, requeue_items = send_claimed_messages(raw_items)
+        finish_messages(processing_key, raw_items, requeue_items)
+    except Exception:
+        # this sender keeps its lease, so messages left in its processing list
+        # would never be recovered; a message may be sent twice, as after a crash
+        return_claimed_messages(processing_key)
+        raise
+    return sent_count
+
+
+# send claimed messages that are due, returns sent count and messages to requeue
+def send_claimed_messages(raw_items: list[str]) -> tuple[int, list[dict]]:
+    now = time.time()
+    items = [json.loads(raw_item) for raw_item in raw_items]
+
+    # messages queued before they had a ttl never expire
+    expired_items = [item for item in items if item.get("expires_at", now) < now]
+    if expired_items:
+        logger.error(f"❌ Dropping {len(expired_items)} expired slack messages")
+        dead_letter_messages(expired_items)
+    items = [item for item in items if item.get("expires_at", now) >= now]
+
+    requeue_items = [item for item in items if item["next_attempt_at"] > now]
+    due_items = [item for item in items if item["next_attempt_at"] <= now]
+
+    # group due messages per channel, keep original order inside a channel
+    channels = {}
+    for item in due_items:
+        channels.setdefault(item["webhook_url"], []).append(item)
+
+    sent_count = 0
+    for webhook_url, channel_items in channels.items():
+        retry_items = send_channel_messages(webhook_url, channel_items)
+        sent_count += len(channel_items) - len(retry_items)
+        requeue_items.extend(retry_items)
+    return sent_count, requeue_items
+
+
+# drain outbox until stop_event is set
+def slack_sender_loop(stop_event: threading.Event):
+    sender_id = create_sender_id()
+    logger.info(f"slack sender {sender_id} started")
+    while not stop_event.is_set():
+        try:
+            renew_sender_lease(sender_id)
+            recover_expired_senders()
+            if not drain_outbox(sender_id):
+                stop_event.wait(SLACK_OUTBOX_POLL_SECONDS)
+        except Exception as e:
+            logger.error(f"Failed to drain slack outbox: {e}")
+            stop_event.wait(5)
+
+
+# run slack sender in a background thread
+def start_slack_sender() -> threading.Event:
+    """
+    Returns:
+        threading.Event: set it to stop the sender
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=slack_sender_loop,
+        args=(stop_event,),
+        name="slack-sender",
+        daemon=True,
+    ).start()
+    return stop_event
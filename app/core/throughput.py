@@ -0,0 +1,42 @@
+import json
+
+from app.config import (
+    EXTRACTION_THROUGHPUT_KEY,
+    EXTRACTION_THROUGHPUT_MIN_ROWS,
+    EXTRACTION_THROUGHPUT_SAMPLES,
+)
+from app.core.logger import logger
+from app.core.redis_client import redis_client
+
+
+# record rows and seconds of an extracted file, keeping the most recent files
+def record_throughput(rows: int, seconds: float):
+    if rows < EXTRACTION_THROUGHPUT_MIN_ROWS or seconds <= 0:
+        return
+
+    # throughput is best effort, a redis hiccup must not fail the extraction
+    try:
+        pipe = redis_client.pipeline()
+        pipe.lpush(
+            EXTRACTION_THROUGHPUT_KEY, json.dumps({"rows": rows, "seconds": seconds})
+        )
+        pipe.ltrim(EXTRACTION_THROUGHPUT_KEY, 0, EXTRACTION_THROUGHPUT_SAMPLES - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record extraction throughput: {e}")
+
+
+# rows per second over the recorded files, None until a file was recorded
+def get_recorded_throughput() -> float | None:
+    """
+    Total rows divided by total seconds of the recorded files, so files that
+    took longer weigh more than a mean of per-file rates would give them.
+    """
+    samples = [
+        json.loads(value)
+        for value in redis_client.lrange(EXTRACTION_THROUGHPUT_KEY, 0, -1)
+    ]
+    seconds = sum(sample["seconds"] for sample in samples)
+    if not seconds:
+        return None
+    return sum(sample["rows"] for sample in samples) / seconds
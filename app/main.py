@@ -1,8 +1,63 @@
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
-from app.routers import auth, menu, data_extraction
+import asyncio
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="Data Request Automation Portal")
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, RedirectResponse
+from app.config import (
+    ENABLE_EXTRACTION_WORKER,
+    ENABLE_SCRATCH_GC,
+    ENABLE_SLACK_SENDER,
+    ENABLE_STARTUP_WARM_UP,
+    RUN_MIGRATIONS_ON_STARTUP,
+)
+from app.core.audit_log import start_audit_log_writer, stop_audit_log_writer
+from app.core.decorators import is_logged_in
+from app.core.logger import setup_file_logging
+from app.core.migrations import run_startup_migrations
+from app.core.readiness import check_readiness, warm_up, warm_up_done
+from app.core.redis_client import redis_client
+from app.core.scratch import get_scratch_usage, start_scratch_gc
+from app.core.slack_outbox import start_slack_sender
+from app.routers import auth, menu, data_extraction, history, profiles, webhook
+
+
+# start background workers on startup, stop them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # log file and redis client are created here instead of on import
+    setup_file_logging()
+    redis_client.connect()
+
+    start_audit_log_writer()
+    stop_events = []
+    if ENABLE_EXTRACTION_WORKER:
+        stop_events.append(webhook.start_extraction_worker())
+    if ENABLE_SLACK_SENDER:
+        stop_events.append(start_slack_sender())
+    if ENABLE_SCRATCH_GC:
+        stop_events.append(start_scratch_gc())
+
+    # opt-in for local development, deploys apply migrations as a separate step
+    if RUN_MIGRATIONS_ON_STARTUP:
+        await asyncio.to_thread(run_startup_migrations)
+
+    # worker starts serving once pools are open and templates compiled
+    if ENABLE_STARTUP_WARM_UP:
+        await asyncio.to_thread(warm_up)
+    else:
+        warm_up_done.set()
+
+    yield
+
+    for stop_event in stop_events:
+        stop_event.set()
+
+    # flush buffered audit logs before the worker exits
+    stop_audit_log_writer()
+    redis_client.close()
+
+
+app = FastAPI(title="Data Request Automation Portal", lifespan=lifespan)
 
 # registering routers
 app.include_router(auth.router)
@@ -16,6 +71,18 @@ app.include_router(menu.router)
 app.include_router(data_extraction.router, tags=["Data Extraction"])
 
 
+# Router for data-extraction history
+app.include_router(history.router, tags=["History"])
+
+
+# Router for downloading admin request profiles
+app.include_router(profiles.router, tags=["Profiles"])
+
+
+# Router for jira webhooks that queue extractions automatically
+app.include_router(webhook.router, tags=["Webhooks"])
+
+
 # land to login page
 @app.get("/")
 def root_redirect():
@@ -26,3 +93,18 @@ def root_redirect():
 @app.get("/health")
 def health_check():
     return {"status": "data-request-automation-app is active"}
+
+
+# readiness for the load balancer, 503 until warm-up is done and dependencies answer
+@app.get("/ready")
+def readiness_check():
+    result = check_readiness()
+    return JSONResponse(result, status_code=200 if result["ready"] else 503)
+
+
+# disk usage and reserved quota of the extraction scratch volumes, admins only
+@app.get("/scratch/usage")
+@is_logged_in
+async def scratch_usage(request: Request):
+    await asyncio.to_thread(profiles.check_jira_admin, request)
+    return await asyncio.to_thread(get_scratch_usage)
@@ -0,0 +1,13 @@
+-- data-extraction audit log DDL
+CREATE TABLE IF NOT EXISTS data_extraction_history (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    extractor_id VARCHAR(100) NOT NULL,
+    ticket_key VARCHAR(50) NOT NULL,
+    file_name VARCHAR(255),
+    file_path VARCHAR(1024),
+    created_at DATETIME(6) NOT NULL,
+    -- keyset pagination indexes, id is appended implicitly by InnoDB
+    INDEX idx_ticket_key_created_at (ticket_key, created_at),
+    INDEX idx_extractor_id_created_at (extractor_id, created_at),
+    INDEX idx_created_at (created_at)
+);
@@ -0,0 +1,7 @@
+-- covering indexes of the pii lookup (PII_COLUMNS = username, email, gender),
+-- lookups by username / email read every column from the index without row lookups;
+-- user_id lookups read the clustered primary key, which holds every column already
+ALTER TABLE users
+    ADD INDEX idx_users_username_pii (username, email, gender),
+    ADD INDEX idx_users_email_pii (email, username, gender),
+    ALGORITHM=INPLACE, LOCK=NONE;
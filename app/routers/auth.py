@@ -1,7 +1,6 @@
 import json
 import uuid
 
-import requests
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import RedirectResponse
 
@@ -65,7 +64,11 @@ def login(
     email: str = Form(...),
     jira_api_token: str = Form(...),
 ):
-    r = requests.get(f"{JIRA_BASE_URL}/rest/api/3/myself", auth=(email, jira_api_token))
+    from app.core.jira_rate_limiter import jira_session
+
+    r = jira_session.get(
+        f"{JIRA_BASE_URL}/rest/api/3/myself", auth=(email, jira_api_token)
+    )
 
     if r.status_code == 200:
         session_id = create_session(email, jira_api_token)
@@ -1,35 +1,137 @@
+import asyncio
 import base64
-import json
 import os
 import secrets
+import shutil
+import tempfile
+import threading
+import time
+import uuid
 import zipfile
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, nullcontext
+from itertools import islice
 from math import ceil
+from typing import TYPE_CHECKING
 
-import pandas as pd
-import pyzipper
-import requests
-from fastapi import APIRouter, HTTPException, Request
-from jira import JIRA, JIRAError
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from app.config import (
     CHUNK_SIZE,
-    FILE_PATH,
+    ESTIMATE_DEFAULT_ROWS_PER_SECOND,
+    ESTIMATE_LARGE_JOB_ROWS,
+    ESTIMATE_LOOKUP_SAMPLE_SIZE,
+    ESTIMATE_MAX_EXCEL_BYTES,
+    ESTIMATE_SAMPLE_BYTES,
+    ESTIMATE_SAMPLE_ROWS,
+    EXTRACTION_BATCH_LOOKUP_SIZE,
+    EXTRACTION_BATCH_MAX_TICKETS,
+    EXTRACTION_MEMORY_BUDGET_BYTES,
     JIRA_ADMIN_GROUP,
+    JIRA_APPROVE_TRANSITION_NAME,
+    JIRA_ATTACHMENT_MAX_BYTES,
     JIRA_BASE_URL,
+    JIRA_BULK_APPROVE_CONCURRENCY,
+    JIRA_PII_FIELD,
+    JIRA_SERVICE_API_TOKEN,
+    JIRA_SERVICE_EMAIL,
     JIRA_PROJECT_KEY,
     JIRA_TICKETS_PER_PAGE,
+    JIRA_UPLOAD_BACKOFF_SECONDS,
+    JIRA_UPLOAD_CONCURRENCY,
+    JIRA_UPLOAD_RETRIES,
+    PII_CATEGORY_COLUMNS,
+    PII_COLUMNS,
+    REJECTS_FILE_SUFFIX,
     SLACK_WEBHOOK_URL,
+    STRING_DTYPE,
+    VOLUME_SIZE_MARGIN_BYTES,
+    VOLUME_WRITE_BLOCK_BYTES,
 )
-from app.core.db_connection import get_db_connection, save_log_to_mysql
+from app.core.audit_log import save_log_to_mysql
+from app.core.attachment_store import (
+    download_attachment,
+    download_attachment_head,
+    get_attachment_checksum,
+    get_attachment_id,
+    sync_ticket_attachments,
+)
+from app.core.checkpoint import (
+    clear_checkpoints,
+    restore_output_file,
+    save_checkpoint,
+)
+from app.core.db_connection import get_read_connection
 from app.core.decorators import is_logged_in
+from app.core.identifiers import (
+    IDENTIFIER_COLUMNS,
+    LOOKUP_KEY_COLUMN,
+    SeenKeys,
+    classify_identifiers,
+    get_identifier_column,
+    get_identifier_name,
+    get_lookup_keys,
+    validate_identifiers,
+)
+from app.core.locks import TicketLockedError, ticket_lock
 from app.core.logger import logger
+from app.core.memory_budget import (
+    get_adaptive_chunk_size,
+    get_bytes_per_row,
+    release_memory,
+    try_reserve_memory,
+    wait_for_memory,
+)
+from app.core.profiler import (
+    ProfilerBusyError,
+    is_profiling_requested,
+    profile_block,
+    profiled,
+)
+from app.core.progress import ProgressReporter, stream_progress
+from app.core.result_cache import (
+    compute_result_cache_key,
+    get_cached_result,
+    store_result,
+)
+from app.core.scratch import (
+    allocate_job_scratch,
+    estimate_scratch_bytes,
+    release_job_scratch,
+    remove_job_scratch,
+)
+from app.core.slack_outbox import enqueue_slack_message
+from app.core.throughput import get_recorded_throughput, record_throughput
 from app.core.templates import templates
 from app.routers.auth import get_email_jira_token_value
 
+# pandas, jira, pyzipper and requests are imported on first use in the extraction
+# path, so workers serving only login or health checks start without them
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyzipper
+    from jira import JIRA
+
 router = APIRouter()
 
 
-def get_jira_object(request: str) -> JIRA:
+# jira client whose requests go through the shared rate limiter
+def connect_jira(email: str, jira_api_token: str) -> "JIRA":
+    from app.core.jira_client import RateLimitedJIRA
+
+    # the rate limiter handles 429s, client-side retries would bypass it
+    return RateLimitedJIRA(
+        server=JIRA_BASE_URL,
+        basic_auth=(email, jira_api_token),
+        max_retries=0,
+    )
+
+
+def get_jira_object(request: str) -> "JIRA":
     """
     return Jira object that is used to approve data extraction, download file, attach file
 
@@ -40,6 +142,7 @@ def get_jira_object(request: str) -> JIRA:
     Raises:
         ValueError: if session_id is missing or Jira authentication fails
     """
+    from jira import JIRAError
 
     try:
         # get jira authetntication info from session
@@ -52,7 +155,7 @@ def get_jira_object(request: str) -> JIRA:
             raise ValueError("Could not retrieve Jira email or API token from session.")
 
         # Connect to Jira
-        jira = JIRA(server=JIRA_BASE_URL, basic_auth=(jira_email, jira_api_token))
+        jira = connect_jira(jira_email, jira_api_token)
         return jira
 
     except JIRAError as e:
@@ -70,12 +173,19 @@ def get_jira_object(request: str) -> JIRA:
         ) from e
 
 
+# return Jira object authenticated with service account, used without user session
+def get_service_jira_object() -> "JIRA":
+    if not JIRA_SERVICE_EMAIL or not JIRA_SERVICE_API_TOKEN:
+        raise ValueError("Jira service account is not configured.")
+    return connect_jira(JIRA_SERVICE_EMAIL, JIRA_SERVICE_API_TOKEN)
+
+
 # get Jira data request ticket list
 def def_jira_ticket_list(request: Request, next_page_token: str | None = None):
     try:
         session_id = request.cookies.get("session_id")
         email, jira_api_token = get_email_jira_token_value(session_id)
-        jira = JIRA(server=JIRA_BASE_URL, basic_auth=(email, jira_api_token))
+        jira = connect_jira(email, jira_api_token)
 
         jql_query = f"project={JIRA_PROJECT_KEY} and 'PII_YN'='Y' ORDER BY created DESC"
 
@@ -145,15 +255,22 @@ def data_extraction_page(
 # check whether ticket has pii info
 def is_pii_ticket(email, jira_api_token, ticket_id):
     url = f"{JIRA_BASE_URL}/rest/api/3/issue/{ticket_id}"
+    from app.core.jira_rate_limiter import jira_session
+
     headers = {"Accept": "application/json"}
-    response = requests.get(url, auth=(email, jira_api_token), headers=headers)
+    response = jira_session.get(url, auth=(email, jira_api_token), headers=headers)
 
     # raise error if failed to receive response
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
 
     issue_data = response.json()
-    pii_field = issue_data["fields"].get("customfield_10071")
+    return is_pii_issue_fields(issue_data["fields"])
+
+
+# check PII_YN custom field of jira issue fields
+def is_pii_issue_fields(fields: dict) -> bool:
+    pii_field = fields.get(JIRA_PII_FIELD)
 
     # raise error if custom field is None
     if not pii_field:
@@ -162,14 +279,15 @@ def is_pii_ticket(email, jira_api_token, ticket_id):
     # 만약 필드가 객체형이면 'value' 사용, 문자열이면 그대로 비교
     pii_value = pii_field["value"]
 
-    if pii_value == "Y":
-        return True
+    return pii_value == "Y"
 
 
 # check whether current user has admin status
 def is_jira_admin(email, jira_api_token) -> bool:
+    from app.core.jira_rate_limiter import jira_session
+
     url = f"{JIRA_BASE_URL}/rest/api/3/group/member?groupname={JIRA_ADMIN_GROUP}"
-    response = requests.get(url, auth=(email, jira_api_token))
+    response = jira_session.get(url, auth=(email, jira_api_token))
 
     if response.status_code != 200:
         raise HTTPException(
@@ -185,50 +303,303 @@ def is_jira_admin(email, jira_api_token) -> bool:
 
 
 # fix column names to normalize user_id column
-def normalize_user_id_column(df: pd.DataFrame) -> pd.DataFrame:
+def normalize_user_id_column(df: "pd.DataFrame") -> "pd.DataFrame":
     # normalize column names in original df
     normalized_cols = {col: col.strip().lower() for col in df.columns}
     df = df.rename(columns=normalized_cols)
 
-    # column name candidates that needs to be fixed to user_id
-    candidates = [
-        "User ID",
-        "user id",
-        "id",
-        "USER_ID",
-        "UserId",
-        "userid",
-        "User Name",
-        "user name",
-        "user_name",
-    ]
-
-    # check existing columns and rename if matches
+    # rename username / user_id / email candidates to users table column names
     for col in df.columns:
-        if col in candidates:
-            df = df.rename(columns={col: "username"})
+        identifier = get_identifier_name(col)
+        if identifier and identifier not in df.columns:
+            df = df.rename(columns={col: identifier})
 
     # return original df
     return df
 
 
-# get pii data from users table by username list
-def fetch_users_by_user_ids(username_list: list, conn) -> pd.DataFrame:
+# users lookup by one identifier column, answered from its covering index
+def get_users_lookup_sql(key_type: str) -> str:
     """
-    Get PII-related user data efficiently from MySQL Users table
+    Raises:
+        ValueError: if key_type is not an identifier column
     """
-    query = """
-        SELECT username, email, gender
+    if key_type not in IDENTIFIER_COLUMNS:
+        raise ValueError(f"Unsupported lookup column: {key_type}")
+
+    return f"""
+        SELECT {key_type} AS {LOOKUP_KEY_COLUMN}, {", ".join(PII_COLUMNS)}
         FROM users
-        WHERE username IN %(username_list)s
+        WHERE {key_type} IN %(username_list)s
+    """
+
+
+# get pii data from users table by username, user_id or email list
+def fetch_users_by_user_ids(
+    username_list: list, conn, key_type: str = "username"
+) -> "pd.DataFrame":
+    """
+    Get PII-related user data efficiently from MySQL Users table
+    key_type selects the indexed column used for the lookup, so every lookup is
+    an index seek (user_id primary key, username / email unique indexes).
+    """
+    import pandas as pd
+
+    query = get_users_lookup_sql(key_type)
+
+    if key_type == "user_id":
+        username_list = [int(user_id) for user_id in username_list]
+
+    db_df = pd.read_sql(
+        query,
+        conn,
+        params={"username_list": tuple(username_list)},
+        dtype_backend="pyarrow",
+    )
+    # arrow-backed strings instead of python string objects
+    db_df = db_df.astype(STRING_DTYPE)
+    if key_type != "user_id":
+        db_df[LOOKUP_KEY_COLUMN] = db_df[LOOKUP_KEY_COLUMN].str.lower()
+    return db_df
+
+
+# attach pii columns to chunk rows by lookup key
+def join_pii_columns(
+    chunk_file_df: "pd.DataFrame",
+    lookup_keys: "pd.Series",
+    db_data: "pd.DataFrame",
+    key_column: str,
+) -> "pd.DataFrame":
+    """
+    Positions of the chunk keys are looked up in arrow and pii columns are taken
+    by position, so no python string objects or hash tables of a pandas merge
+    are created. Low-cardinality pii columns are stored as categoricals.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # first db row of each key, null position when the key was not found
+    positions = pc.index_in(
+        pa.array(lookup_keys, type=pa.large_string()),
+        value_set=pa.array(db_data[LOOKUP_KEY_COLUMN], type=pa.large_string()),
+    )
+
+    pii_columns = {}
+    for col in db_data.columns.drop([LOOKUP_KEY_COLUMN, key_column], errors="ignore"):
+        values = pa.array(db_data[col], type=pa.large_string()).take(positions)
+        if col in PII_CATEGORY_COLUMNS:
+            pii_columns[col] = values.dictionary_encode().to_pandas().array
+        else:
+            pii_columns[col] = pd.arrays.ArrowStringArray(values)
+    pii_df = pd.DataFrame(pii_columns, index=chunk_file_df.index)
+
+    # same column names as a left merge for columns in both frames
+    overlap = chunk_file_df.columns.intersection(pii_df.columns)
+    if len(overlap):
+        chunk_file_df = chunk_file_df.rename(columns={c: f"{c}_x" for c in overlap})
+        pii_df = pii_df.rename(columns={c: f"{c}_y" for c in overlap})
+
+    return pd.concat([chunk_file_df, pii_df], axis=1, copy=False)
+
+
+# users rows of the keys, from the rows prefetched by a batch when available
+def lookup_users(
+    keys: list,
+    conn,
+    key_type: str,
+    prefetched_users: dict | None = None,
+    resolved_users: dict | None = None,
+) -> "pd.DataFrame":
+    """
+    Keys the batch did not look up (e.g. attachment changed in between) are
+    still fetched from the db, so prefetching never drops matches.
+    resolved_users holds the keys and rows fetched for the attachment so far and
+    is updated in place, a key repeated in a later chunk is not queried again.
+    """
+    import pandas as pd
+
+    keys = pd.Series(keys, dtype=STRING_DTYPE)
+    parts = []
+
+    prefetched = (prefetched_users or {}).get(key_type)
+    if prefetched is not None:
+        rows = prefetched["rows"]
+        parts.append(rows[rows[LOOKUP_KEY_COLUMN].isin(keys)])
+        keys = keys[~keys.isin(prefetched["keys"])]
+
+    resolved = None
+    if resolved_users is not None:
+        resolved = resolved_users.setdefault(key_type, {"keys": SeenKeys(), "rows": []})
+        is_resolved = resolved["keys"].add(keys)
+        if is_resolved.any():
+            resolved_keys = keys[is_resolved]
+            parts += [
+                rows[rows[LOOKUP_KEY_COLUMN].isin(resolved_keys)]
+                for rows in resolved["rows"]
+            ]
+            keys = keys[~is_resolved]
+
+    if len(keys) or not parts:
+        db_df = fetch_users_by_user_ids(keys.tolist(), conn, key_type)
+        parts.append(db_df)
+        if resolved is not None:
+            resolved["rows"].append(db_df)
+    return parts[0] if len(parts) == 1 else pd.concat(parts)
+
+
+# memory held by the users rows resolved for an attachment
+def get_resolved_users_bytes(resolved_users: dict) -> int:
+    return sum(
+        rows.memory_usage(index=True, deep=True).sum()
+        for resolved in resolved_users.values()
+        for rows in resolved["rows"]
+    )
+
+
+# merge chunk with pii data, looking up each value by its own identifier type
+def merge_chunk_with_pii(
+    chunk_file_df: "pd.DataFrame",
+    key_column: str,
+    conn,
+    prefetched_users: dict | None = None,
+    resolved_users: dict | None = None,
+) -> "pd.DataFrame":
+    """
+    Mixed-identifier chunks are split by key type, so usernames, user_ids and
+    emails are each looked up through the matching index.
+    """
+    import pandas as pd
+
+    values = chunk_file_df[key_column].astype(STRING_DTYPE)
+    key_types = classify_identifiers(values, key_column)
+    lookup_keys = get_lookup_keys(values, key_types)
+
+    # fetch pii data from db, one indexed lookup per key type
+    db_parts = [
+        lookup_users(
+            lookup_keys[key_types == key_type].unique().tolist(),
+            conn,
+            key_type,
+            prefetched_users,
+            resolved_users,
+        )
+        for key_type in key_types.unique()
+    ]
+    db_data = db_parts[0] if len(db_parts) == 1 else pd.concat(db_parts)
+
+    return join_pii_columns(chunk_file_df, lookup_keys, db_data, key_column)
+
+
+# unique lookup keys of each key type over all attachments of a batch
+def collect_lookup_keys(file_paths: list[str]) -> dict[str, "pd.Series"]:
+    """
+    Attachments with a cached result are skipped, they need no lookup.
+    Unreadable attachments are skipped too, extraction reports them per ticket.
     """
+    import pandas as pd
+
+    parts = {}
+    total_keys = 0
+    for file in file_paths:
+        if get_cached_result(compute_result_cache_key(file, PII_COLUMNS)):
+            continue
+        try:
+            for file_df in iter_attachment_batches(file):
+                file_df = normalize_user_id_column(file_df)
+                key_column = get_identifier_column(file_df)
+                file_df, _ = validate_identifiers(file_df, key_column)
+                values = file_df[key_column]
+                key_types = classify_identifiers(values, key_column)
+                lookup_keys = get_lookup_keys(values, key_types)
+                total_keys += len(lookup_keys)
+                for key_type in key_types.unique():
+                    parts.setdefault(key_type, []).append(
+                        lookup_keys[key_types == key_type].drop_duplicates()
+                    )
+        except Exception as e:
+            logger.warning(f"skipped {file} in batch lookup: {e}")
+            continue
 
-    return pd.read_sql(query, conn, params={"username_list": tuple(username_list)})
+    keys_by_type = {
+        key_type: pd.concat(series).drop_duplicates().reset_index(drop=True)
+        for key_type, series in parts.items()
+    }
+    unique_keys = sum(len(keys) for keys in keys_by_type.values())
+    logger.info(f"batch lookup: {total_keys} keys, {unique_keys} unique")
+    return keys_by_type
+
+
+# look up users of all keys in batches of EXTRACTION_BATCH_LOOKUP_SIZE
+def prefetch_users(
+    keys_by_type: dict[str, "pd.Series"], conn, job_id: str
+) -> dict | None:
+    """
+    Memory of the prefetched rows is reserved under job_id before every query,
+    sized by the keys of the query, and trued up to the rows actually fetched.
+
+    Returns:
+        dict: {key_type: {"keys": looked up keys, "rows": users rows found}},
+            None if the host memory budget has no room left for them
+    """
+    import pandas as pd
+
+    keys_bytes = sum(get_frame_bytes(keys.to_frame()) for keys in keys_by_type.values())
+    reserved_bytes = keys_bytes
+
+    prefetched_users = {}
+    for key_type, keys in keys_by_type.items():
+        # a users row holds the lookup key and every pii column
+        bytes_per_key = get_bytes_per_row(keys.to_frame()) * (len(PII_COLUMNS) + 1)
+        rows = []
+        for i in range(0, len(keys), EXTRACTION_BATCH_LOOKUP_SIZE):
+            batch_keys = keys.iloc[i : i + EXTRACTION_BATCH_LOOKUP_SIZE]
+            estimated_bytes = int(bytes_per_key * len(batch_keys))
+            if not try_reserve_memory(job_id, reserved_bytes + estimated_bytes):
+                logger.warning(
+                    f"no memory budget for {reserved_bytes + estimated_bytes} bytes "
+                    f"of prefetched users, batch falls back to per-ticket lookups"
+                )
+                release_memory(job_id)
+                return None
+
+            db_df = fetch_users_by_user_ids(batch_keys.tolist(), conn, key_type)
+            rows.append(db_df)
+            reserved_bytes += get_frame_bytes(db_df)
+            try_reserve_memory(job_id, reserved_bytes)
+
+        prefetched_users[key_type] = {
+            "keys": keys,
+            "rows": pd.concat(rows, ignore_index=True),
+        }
+    return prefetched_users
+
+
+# users rows of every attachment of a batch, looked up once for all tickets
+def prefetch_batch_users(file_paths: list[str], job_id: str) -> dict | None:
+    """
+    Returns:
+        dict: prefetched users, None if they did not fit the host memory budget
+    """
+    keys_by_type = collect_lookup_keys(file_paths)
+    if not keys_by_type:
+        return {}
+
+    conn = get_read_connection()
+    try:
+        return prefetch_users(keys_by_type, conn, job_id)
+    finally:
+        conn.close()
+
+
+# memory held by a dataframe
+def get_frame_bytes(df: "pd.DataFrame") -> int:
+    return int(get_bytes_per_row(df) * len(df))
 
 
 # approve PII data extraction jira ticket
 @router.post("/approve/{ticket_id}")
-async def approve_pii_jira_ticket(request, ticket_id):
+async def approve_pii_jira_ticket(request: Request, ticket_id: str):
     """
     Approve ticket by changing ticket status from Request Submission -> Request Approval
 
@@ -265,9 +636,35 @@ async def approve_pii_jira_ticket(request, ticket_id):
     # get ticket object
     issue = jira.issue(ticket_id)
 
+    comment_text = transition_ticket_to_approved(jira, issue, ticket_id, email)
+
+    # Add request approval comment via slack
+    send_slack_message(SLACK_WEBHOOK_URL, comment_text)
+
+    return {
+        "message": f"Ticket {ticket_id} transitioned to 'Approved' and comment added."
+    }
+
+
+# move ticket to approved status and add approval comment
+def transition_ticket_to_approved(
+    jira: "JIRA", issue, ticket_id: str, email: str
+) -> str:
+    """
+    Args:
+        jira (JIRA): jira object
+        issue: jira issue of ticket_id
+        ticket_id (str): jira issue key
+        email (str): approver email
+    Returns:
+        str: approval comment added to the ticket
+    Raises:
+        HTTPException: if approval transition is not available for the ticket
+    """
+
     # check transition
     transitions = jira.transitions(issue)
-    transition_name = "Approve Data Extraction Request"  # Jira status name for tickets that has been approved for data extraction
+    transition_name = JIRA_APPROVE_TRANSITION_NAME  # Jira status name for tickets that has been approved for data extraction
 
     transition_id = None
     for t in transitions:
@@ -284,153 +681,942 @@ async def approve_pii_jira_ticket(request, ticket_id):
 
     # change ticket status for To-Do -> Request Approved
     jira.transition_issue(issue, transition_id)
-    print(f"✅ Ticket {ticket_id} successfully transitioned via '{transition_name}'.")
+    logger.info(
+        f"✅ Ticket {ticket_id} successfully transitioned via '{transition_name}'."
+    )
 
     # Add request approval comment
     comment_text = (
         f"✅ Ticket {ticket_id} has been approved for PII extraction by {email}."
     )
     jira.add_comment(issue, comment_text)
+    return comment_text
 
-    # Add request approval comment via slack
-    send_slack_message(SLACK_WEBHOOK_URL, comment_text)
 
-    return {
-        "message": f"Ticket {ticket_id} transitioned to 'Approved' and comment added."
-    }
+# approve a single ticket of bulk approval, non-PII tickets are skipped
+def approve_pii_ticket_for_bulk(jira: "JIRA", ticket_id: str, email: str) -> dict:
+    issue = jira.issue(ticket_id)
+    if not is_pii_issue_fields(issue.raw["fields"]):
+        return {
+            "ticket_id": ticket_id,
+            "status": "skipped",
+            "detail": "Ticket does not request PII data",
+        }
+
+    transition_ticket_to_approved(jira, issue, ticket_id, email)
+    return {"ticket_id": ticket_id, "status": "approved", "detail": None}
+
+
+class BulkApproveRequest(BaseModel):
+    ticket_ids: list[str]
+
+
+# approve many PII data extraction jira tickets at once
+@router.post("/approve")
+async def bulk_approve_pii_jira_tickets(request: Request, body: BulkApproveRequest):
+    """
+    Approve tickets concurrently with bounded parallelism.
+    Admin status is checked once and a single summary message is sent via slack.
+
+    Args:
+        request (Request): web request
+        body (BulkApproveRequest): jira issue keys to approve
+    Returns:
+        dict: number of approved tickets and per-ticket results
+    """
+
+    session_id = request.cookies.get("session_id")
+    email, jira_api_token = get_email_jira_token_value(session_id)
+
+    # check if user has jira-admin status once for all tickets
+    if not is_jira_admin(email, jira_api_token):
+        raise HTTPException(
+            status_code=403,
+            detail="User does not have Jira Admin privileges",
+        )
+
+    from jira import JIRAError
+
+    jira = get_jira_object(request)
+    semaphore = asyncio.Semaphore(JIRA_BULK_APPROVE_CONCURRENCY)
+
+    async def approve(ticket_id: str) -> dict:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    approve_pii_ticket_for_bulk, jira, ticket_id, email
+                )
+            except HTTPException as e:
+                return {"ticket_id": ticket_id, "status": "error", "detail": e.detail}
+            except JIRAError as e:
+                return {"ticket_id": ticket_id, "status": "error", "detail": e.text}
+            except Exception as e:
+                return {"ticket_id": ticket_id, "status": "error", "detail": str(e)}
+
+    # drop duplicated ticket ids, keep request order
+    ticket_ids = list(dict.fromkeys(body.ticket_ids))
+    results = await asyncio.gather(*(approve(ticket_id) for ticket_id in ticket_ids))
+
+    approved = [r["ticket_id"] for r in results if r["status"] == "approved"]
+    logger.info(f"bulk approval by {email}: {len(approved)}/{len(ticket_ids)} approved")
+
+    # send one summary message instead of one per ticket
+    if approved:
+        send_slack_message(
+            SLACK_WEBHOOK_URL,
+            f"✅ {len(approved)} tickets have been approved for PII extraction "
+            f"by {email}: {', '.join(approved)}",
+        )
+
+    return {"approved": len(approved), "results": results}
 
 
 # send slack message
 def send_slack_message(
-    webhook_url, message, username="Data Bot", icon_emoji=":robot_face:"
+    webhook_url,
+    message,
+    username="Data Bot",
+    icon_emoji=":robot_face:",
+    secrets=None,
 ):
-    payload = {
-        "username": username,
-        "icon_emoji": icon_emoji,
-        "text": message,
-    }
+    """
+    Write message to the durable slack outbox instead of posting inline,
+    so requests never wait on slack. Background sender delivers it with retries.
+    secrets (e.g. archive password) are redacted if the message is dead-lettered.
+    """
+    try:
+        enqueue_slack_message(webhook_url, message, username, icon_emoji, secrets)
+        logger.info("✅ Slack message queued successfully!")
+    except Exception as e:
+        logger.error(f"❌ Failed to queue slack message: {e}")
+
+
+# get data attached in Jira ticket
+async def get_jira_ticket_attached_data(jira: "JIRA", ticket_no: str):
+    """
+    add save file attached to the Jira ticket
+    only new or changed attachments are downloaded, into a per-ticket directory
+    """
 
-    response = requests.post(
-        webhook_url,
-        data=json.dumps(payload),
-        headers={"Content-Type": "application/json"},
+    issue = await asyncio.to_thread(profiled(jira.issue), ticket_no)
+    return await asyncio.to_thread(
+        profiled(sync_ticket_attachments), ticket_no, issue.fields.attachment
     )
 
-    if response.status_code == 200:
-        logger.info("✅ Slack message sent successfully!")
+
+# read attachment into dataframe by file extension
+def read_attachment_file(file: str) -> "pd.DataFrame":
+    import pandas as pd
+
+    from app.core.excel_reader import read_excel_file
+
+    file_lower = str(file).lower()
+
+    # CSV
+    # values are kept as written, so ids are not turned into floats by blank cells;
+    # blank lines are dropped after reading, so the index stays the line number - 2
+    if file_lower.endswith(".csv"):
+        df = pd.read_csv(file, dtype=STRING_DTYPE, skip_blank_lines=False)
+        return df.dropna(how="all")
+
+    # Excel (xlsx, xls)
+    if file_lower.endswith(".xlsx") or file_lower.endswith(".xls"):
+        return read_excel_file(file).astype(STRING_DTYPE)
+
+    raise ValueError(f"Unsupported file format: {file}")
+
+
+# attachment as dataframes of up to CHUNK_SIZE rows, indexed by line - 2
+def iter_attachment_batches(file: str) -> Iterator["pd.DataFrame"]:
+    """
+    csv and xlsx are streamed, so only one batch of the attachment is held in
+    memory; legacy xls has no streaming reader and is read as a whole.
+    """
+    import pandas as pd
+
+    from app.core.excel_reader import iter_excel_batches
+
+    file_lower = str(file).lower()
+    if file_lower.endswith(".csv"):
+        with pd.read_csv(
+            file, dtype=STRING_DTYPE, skip_blank_lines=False, chunksize=CHUNK_SIZE
+        ) as reader:
+            for batch in reader:
+                yield batch.dropna(how="all")
+    elif file_lower.endswith(".xlsx"):
+        for batch in iter_excel_batches(file):
+            yield batch.astype(STRING_DTYPE)
     else:
-        logger.error(
-            f"❌ Failed to send message. Status: {response.status_code}, Response: {response.text}"
+        yield read_attachment_file(file)
+
+
+# look up pii data chunk by chunk and append it to the output csv
+def extract_file_in_chunks(
+    file_batches: "pd.DataFrame | Iterable[pd.DataFrame]",
+    conn,
+    ticket_key: str,
+    attachment_id: str,
+    save_file_name: str,
+    memory_budget: int = EXTRACTION_MEMORY_BUDGET_BYTES,
+    progress: ProgressReporter | None = None,
+    prefetched_users: dict | None = None,
+    rows_total: int | None = None,
+    checksum: str | None = None,
+):
+    """
+    Merge attachment rows with PII data in chunks sized to fit memory_budget.
+    Progress is committed after every chunk, so a re-run resumes from the last
+    committed chunk instead of starting from scratch.
+
+    Args:
+        file_batches (pd.DataFrame | Iterable[pd.DataFrame]): normalized
+            attachment data, or its batches as streamed from the attachment
+        conn: mysql connection
+        ticket_key (str): jira issue key
+        attachment_id (str): jira attachment id the checkpoint is keyed by
+        save_file_name (str): output csv path
+        memory_budget (int): memory the job may use, in bytes
+        progress (ProgressReporter): receives rows processed after every chunk
+        prefetched_users (dict): users rows looked up once for a batch of tickets
+        rows_total (int): rows reported to progress, defaults to the length of
+            the first batch
+        checksum (str): sha256 of the attachment, a checkpoint of other content
+            is discarded
+    """
+    import pandas as pd
+
+    if isinstance(file_batches, pd.DataFrame):
+        rows_total = len(file_batches)
+        file_batches = [file_batches]
+
+    file_name = os.path.basename(save_file_name)
+    checkpoint = restore_output_file(
+        ticket_key, attachment_id, save_file_name, checksum
+    )
+    chunk_index = checkpoint["chunk_index"]
+    rows_done = checkpoint["rows_done"]
+
+    logger.info(f"extracting {file_name} in chunks")
+    started_at = time.monotonic()
+    # users rows fetched for this attachment, every key is queried once per file
+    resolved_users = {}
+    # rows of the attachment before the current batch
+    batch_start = 0
+    for batch_no, file_df in enumerate(file_batches):
+        # readers without a row count yield the whole attachment as one batch
+        if progress and batch_no == 0:
+            progress.start_file(
+                file_name,
+                len(file_df) if rows_total is None else rows_total,
+                rows_done,
+            )
+
+        # rows committed by an interrupted run are skipped
+        i = max(rows_done - batch_start, 0)
+        if i >= len(file_df):
+            batch_start += len(file_df)
+            continue
+
+        # only the current batch of the attachment is held in memory
+        key_column = get_identifier_column(file_df)
+        file_bytes_per_row = get_bytes_per_row(file_df)
+        chunk_budget = max(
+            memory_budget
+            - file_bytes_per_row * len(file_df)
+            - get_resolved_users_bytes(resolved_users),
+            0,
+        )
+        chunk_size = min(
+            CHUNK_SIZE, get_adaptive_chunk_size(file_bytes_per_row, chunk_budget)
         )
 
+        # divide dataframe into chunks to avoid memory issues
+        while i < len(file_df):
+            chunk_file_df = file_df.iloc[i : i + chunk_size]
 
-# get data attached in Jira ticket
-async def get_jira_ticket_attached_data(jira: JIRA, ticket_no: str):
+            # merge chunk file df with db data
+            merged_df = merge_chunk_with_pii(
+                chunk_file_df, key_column, conn, prefetched_users, resolved_users
+            )
+
+            # merged rows are spilled to disk right away, only one chunk stays
+            # in memory; write header only for the first chunk, append afterwards
+            with open(save_file_name, "a", newline="", encoding="utf-8") as f:
+                merged_df.to_csv(f, index=False, header=(batch_start + i == 0))
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell()
+
+            chunk_index += 1
+            i += len(chunk_file_df)
+            save_checkpoint(
+                ticket_key,
+                attachment_id,
+                chunk_index,
+                batch_start + i,
+                offset,
+                checksum,
+            )
+            if progress:
+                progress.update_rows(batch_start + i)
+
+            # size next chunk by measured bytes per row instead of a fixed CHUNK_SIZE
+            chunk_size = get_adaptive_chunk_size(
+                get_bytes_per_row(merged_df), chunk_budget
+            )
+        batch_start += len(file_df)
+
+    # rows restored from a checkpoint do not count towards throughput
+    record_throughput(batch_start - rows_done, time.monotonic() - started_at)
+
+
+# csv data rows, exact for small files, from the line length of the first lines
+def estimate_csv_rows(file: str, size_bytes: int | None = None) -> int:
     """
-    add save file attached to the Jira ticket
+    Only the first ESTIMATE_SAMPLE_ROWS lines are read, nothing is parsed.
+
+    Args:
+        file (str): csv path, may hold only the start of the attachment
+        size_bytes (int): size of the whole attachment, defaults to the file size
+    """
+    if size_bytes is None:
+        size_bytes = os.path.getsize(file)
+
+    with open(file, "rb") as f:
+        header_bytes = len(f.readline())
+        lines = list(islice(f, ESTIMATE_SAMPLE_ROWS))
+    sample_bytes = sum(len(line) for line in lines)
+
+    # whole file was read, count its non-blank lines
+    if header_bytes + sample_bytes >= size_bytes:
+        return sum(1 for line in lines if line.strip())
+    # remaining bytes divided by the line length of the sampled rows
+    return int((size_bytes - header_bytes) / sample_bytes * len(lines))
+
+
+# data rows of an attachment for progress reporting, None if only a full read tells
+def count_attachment_rows(file: str) -> int | None:
+    from app.core.excel_reader import get_excel_row_count
+
+    file_lower = str(file).lower()
+    if file_lower.endswith(".csv"):
+        return estimate_csv_rows(file)
+    if file_lower.endswith(".xlsx"):
+        return get_excel_row_count(file)
+    return None
+
+
+# attachment row count, exact for small files, from a sampled read otherwise
+def estimate_attachment_rows(
+    file: str, size_bytes: int | None = None
+) -> tuple[int, "pd.DataFrame"]:
+    """
+    Args:
+        file (str): attachment path, csv may hold only the start of the attachment
+        size_bytes (int): size of the whole attachment, defaults to the file size
+    Returns:
+        (rows, sample_df): estimated data rows and up to ESTIMATE_SAMPLE_ROWS
+            rows read from the start of the attachment
     """
+    import pandas as pd
 
-    # create dir to download files attached in jira
-    os.makedirs(FILE_PATH, exist_ok=True)
-    issue = jira.issue(ticket_no)
-    attachment_paths = []
+    from app.core.excel_reader import get_excel_row_count, iter_excel_batches
 
-    for attachment in issue.fields.attachment:
-        local_path = os.path.join(FILE_PATH, attachment.filename)
+    file_lower = str(file).lower()
+    if file_lower.endswith(".csv"):
+        sample_df = pd.read_csv(file, nrows=ESTIMATE_SAMPLE_ROWS, dtype=STRING_DTYPE)
+        return estimate_csv_rows(file, size_bytes), sample_df
 
-        # us Jira library to get files in binary
-        file_content = attachment.get()  # bytes
+    if file_lower.endswith(".xlsx"):
+        sample_df = next(
+            iter_excel_batches(file, ESTIMATE_SAMPLE_ROWS), pd.DataFrame()
+        ).astype(STRING_DTYPE)
+        return get_excel_row_count(file), sample_df
 
-        with open(local_path, "wb") as f:
-            f.write(file_content)
+    # legacy xls has no streaming reader, it is read as a whole
+    file_df = read_attachment_file(file)
+    return len(file_df), file_df.head(ESTIMATE_SAMPLE_ROWS)
 
-        attachment_paths.append(local_path)
 
-    return attachment_paths
+# projected rows, match rate and output size of an attachment from a sample
+def estimate_attachment(file: str, conn, size_bytes: int | None = None) -> dict:
+    """
+    Args:
+        file (str): downloaded attachment path, or the head of a csv attachment
+        conn: mysql connection used for the sampled users lookup
+        size_bytes (int): size of the whole attachment, defaults to the file size
+    Returns:
+        dict: estimated input rows, share of valid identifiers and of users found,
+            projected output rows and output csv bytes
+    """
+    if size_bytes is None:
+        size_bytes = os.path.getsize(file)
+    rows, sample_df = estimate_attachment_rows(file, size_bytes)
+    sample_df = normalize_user_id_column(sample_df)
+    key_column = get_identifier_column(sample_df)
+    valid_df, _ = validate_identifiers(sample_df, key_column)
+    valid_rate = len(valid_df) / len(sample_df) if len(sample_df) else 0.0
+
+    # match rate of a sampled lookup through the same indexes as the extraction
+    lookup_df = valid_df.head(ESTIMATE_LOOKUP_SAMPLE_SIZE)
+    key_types = classify_identifiers(lookup_df[key_column], key_column)
+    lookup_keys = get_lookup_keys(lookup_df[key_column], key_types)
+    db_parts = [
+        fetch_users_by_user_ids(
+            lookup_keys[key_types == key_type].unique().tolist(), conn, key_type
+        )
+        for key_type in key_types.unique()
+    ]
+    found_keys = {key for db_df in db_parts for key in db_df[LOOKUP_KEY_COLUMN]}
+    match_rate = float(lookup_keys.isin(found_keys).mean()) if len(lookup_df) else 0.0
+
+    # output rows are the valid attachment rows plus pii columns of matched users
+    input_bytes_per_row = (
+        len(valid_df.to_csv(index=False, header=False)) / len(valid_df)
+        if len(valid_df)
+        else 0
+    )
+    found_rows = sum(len(db_df) for db_df in db_parts)
+    pii_bytes = sum(
+        len(db_df.drop(columns=[LOOKUP_KEY_COLUMN]).to_csv(index=False, header=False))
+        for db_df in db_parts
+    )
+    pii_bytes_per_row = pii_bytes / found_rows if found_rows else 0
+    output_rows = int(rows * valid_rate)
+
+    return {
+        "file": os.path.basename(file),
+        "size_bytes": size_bytes,
+        "estimated_rows": rows,
+        "sampled_rows": len(sample_df),
+        "valid_rate": valid_rate,
+        "match_rate": match_rate,
+        "projected_output_rows": output_rows,
+        "projected_output_bytes": int(
+            output_rows * (input_bytes_per_row + pii_bytes_per_row * match_rate)
+        ),
+    }
+
+
+# local sample of an attachment: the head of a csv, the whole excel workbook
+def download_estimate_sample(attachment, sample_dir: str) -> str:
+    """
+    Raises:
+        ValueError: if an excel attachment is above ESTIMATE_MAX_EXCEL_BYTES
+    """
+    if attachment.filename.lower().endswith(".csv"):
+        return download_attachment_head(attachment, sample_dir, ESTIMATE_SAMPLE_BYTES)
+
+    # workbooks cannot be read from a prefix, their size is bounded by the
+    # sheet row limit instead
+    if attachment.size > ESTIMATE_MAX_EXCEL_BYTES:
+        raise ValueError(
+            f"Excel attachment of {attachment.size} bytes is too large to sample"
+        )
+    return download_attachment(attachment, sample_dir)["path"]
+
+
+# projected size and runtime of extracting the attachments of a ticket
+def estimate_extraction(attachments: list, sample_dir: str) -> dict:
+    """
+    Attachments are projected from their jira size and a sample read from their
+    start into sample_dir. Runtime is projected from the throughput recorded by
+    finished extractions, ESTIMATE_DEFAULT_ROWS_PER_SECOND until one was recorded.
+
+    Args:
+        attachments (list): jira Attachment resources of the issue
+        sample_dir (str): caller-owned dir the samples are written to
+    Returns:
+        dict: per-file estimates and totals, is_large flags jobs above
+            ESTIMATE_LARGE_JOB_ROWS
+    """
+    conn = get_read_connection()
+    try:
+        files = []
+        for attachment in attachments:
+            try:
+                sample_file = download_estimate_sample(attachment, sample_dir)
+                files.append(estimate_attachment(sample_file, conn, attachment.size))
+            except Exception as e:
+                logger.error(f"Error estimating file {attachment.filename}: {e}")
+                files.append({"file": attachment.filename, "error": str(e)})
+    finally:
+        conn.close()
+
+    estimated = [f for f in files if "error" not in f]
+    output_rows = sum(f["projected_output_rows"] for f in estimated)
+    recorded_rows_per_second = get_recorded_throughput()
+    rows_per_second = recorded_rows_per_second or ESTIMATE_DEFAULT_ROWS_PER_SECOND
+
+    return {
+        "files": files,
+        "estimated_rows": sum(f["estimated_rows"] for f in estimated),
+        "projected_output_rows": output_rows,
+        # weighted by rows, a large file dominates the ticket
+        "match_rate": (
+            sum(f["match_rate"] * f["projected_output_rows"] for f in estimated)
+            / output_rows
+            if output_rows
+            else 0.0
+        ),
+        "projected_output_bytes": sum(f["projected_output_bytes"] for f in estimated),
+        "rows_per_second": rows_per_second,
+        "throughput_source": "recorded" if recorded_rows_per_second else "default",
+        "projected_runtime_seconds": output_rows / rows_per_second,
+        "is_large": output_rows > ESTIMATE_LARGE_JOB_ROWS,
+    }
+
+
+# estimate from private samples of the attachments, removed afterwards
+def estimate_attachments(attachments: list) -> dict:
+    """
+    The synced ticket attachment dir is owned by the extraction holding the
+    ticket lock and by the scratch gc, an estimate never writes into it.
+    """
+    with tempfile.TemporaryDirectory(prefix="estimate-") as tmp_dir:
+        return estimate_extraction(attachments, tmp_dir)
+
+
+# pre-flight estimate of a ticket extraction, before it is approved or run
+@router.get("/extract/{ticket_key}/estimate")
+@is_logged_in
+async def estimate_ticket_extraction(request: Request, ticket_key: str):
+    """
+    Args:
+        request (Request): web request
+        ticket_key (str): jira issue key
+    Returns:
+        dict: projected rows, match rate, output size and runtime
+    """
+    jira = get_jira_object(request)
+    issue = await asyncio.to_thread(jira.issue, ticket_key)
+    estimate = await asyncio.to_thread(estimate_attachments, issue.fields.attachment)
+    return {"ticket_key": ticket_key, **estimate}
 
 
 # get data from query
 @router.post("/extract/{ticket_key}", response_model=None)
-async def get_data_from_query(request: Request, ticket_key: str):
+async def get_data_from_query(request: Request, response: Response, ticket_key: str):
     """
     add PII_data that matches DataFrame
+    admins can profile the extraction with the X-Profile header or ?profile=true,
+    the saved profile id is returned in the X-Profile-Id header
     """
     jira = get_jira_object(request)
-    # get file_lists that was attached in jira ticket
-    attached_files_list = await get_jira_ticket_attached_data(jira, ticket_key)
 
-    # extract data if files exist
-    if len(attached_files_list) > 0:
-        conn = get_db_connection()
+    # extractor id saved in data-extraction log
+    session_id = request.cookies.get("session_id")
+    if not session_id:
+        raise ValueError("No session_id found in request cookies.")
+    jira_email, jira_api_token = get_email_jira_token_value(session_id)
+
+    # profiling overhead only applies to flagged requests of admins
+    profiling = is_profiling_requested(request)
+    if profiling and not is_jira_admin(jira_email, jira_api_token):
+        raise HTTPException(
+            status_code=403, detail="Only Jira admins can profile requests"
+        )
+
+    try:
+        with profile_block(ticket_key) if profiling else nullcontext({}) as profile:
+            await run_extraction(jira, ticket_key, jira_email)
+    except (TicketLockedError, ProfilerBusyError) as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+    if profile.get("profile_id"):
+        response.headers["X-Profile-Id"] = profile["profile_id"]
+
+
+class BatchExtractRequest(BaseModel):
+    ticket_keys: list[str]
+
+
+# extract many tickets at once, looking up their shared users only once
+@router.post("/extract")
+async def batch_extract(request: Request, body: BatchExtractRequest):
+    """
+    Args:
+        request (Request): web request
+        body (BatchExtractRequest): jira issue keys to extract
+    Returns:
+        dict: number of delivered tickets and per-ticket results
+    """
+    if len(body.ticket_keys) > EXTRACTION_BATCH_MAX_TICKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {EXTRACTION_BATCH_MAX_TICKETS} tickets per batch",
+        )
+
+    jira = get_jira_object(request)
+    jira_email, _ = get_email_jira_token_value(request.cookies.get("session_id"))
+
+    try:
+        results = await run_batch_extraction(jira, body.ticket_keys, jira_email)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from e
+
+    delivered = [r for r in results if r["status"] == "delivered"]
+    return {"delivered": len(delivered), "results": results}
+
+
+# live progress of a ticket extraction as server-sent events
+@router.get("/extract/{ticket_key}/progress")
+@is_logged_in
+async def stream_extraction_progress(request: Request, ticket_key: str):
+    """
+    Progress is relayed through redis pub/sub, so the stream works from any
+    worker, not only the one running the job.
+    """
+    return StreamingResponse(
+        stream_progress(ticket_key, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# extract, compress and deliver pii data of a ticket within a memory budget
+async def run_extraction(jira: "JIRA", ticket_key: str, extractor_id: str):
+    """
+    Shared by the extraction route and the queued extraction worker.
+    The job holds the ticket lock, so only one worker extracts a ticket at a time,
+    and starts only when the host has memory budget left for it.
+
+    Args:
+        jira (JIRA): jira object used to download and attach files
+        ticket_key (str): jira issue key
+        extractor_id (str): email saved in data-extraction log
+    Raises:
+        TicketLockedError: if the ticket is being extracted by another worker
+        TimeoutError: if the job was not admitted within the admission timeout
+    """
+    job_uuid = uuid.uuid4().hex
+    job_id = f"{ticket_key}:{job_uuid}"
+    progress = ProgressReporter(ticket_key, job_uuid)
+
+    with ticket_lock(ticket_key) as lock_lost:
+        # progress is published only by the lock owner, a rejected duplicate
+        # run must not report the running job of the ticket as failed
+        try:
+            progress.set_stage("waiting_for_memory")
+            if not await wait_for_memory(job_id, EXTRACTION_MEMORY_BUDGET_BYTES):
+                raise TimeoutError(
+                    f"Host memory budget exhausted, extraction of {ticket_key} was not started."
+                )
 
-        # use loop to open file
-        for file in attached_files_list:
-            file_lower = str(file).lower()
-            file_name = file.split("/")[-1].split(".")[0]
-            logger.info(f"Processing file: {file_name}")
-            # check file extension and read file accordingly
             try:
-                # CSV
-                if file_lower.endswith(".csv"):
-                    file_df = pd.read_csv(file)
-
-                # Excel (xlsx, xls)
-                elif file_lower.endswith(".xlsx") or file_lower.endswith(".xls"):
-                    file_df = pd.read_excel(file)
-
-                # fix column names
-                file_df = normalize_user_id_column(file_df).dropna(subset=["username"])
-                logger.info(
-                    f"normalized {file_name} columns, columns: {file_df.columns}"
+                await extract_and_deliver(
+                    jira,
+                    ticket_key,
+                    extractor_id,
+                    EXTRACTION_MEMORY_BUDGET_BYTES,
+                    job_uuid,
+                    lock_lost,
+                    progress,
                 )
+            finally:
+                release_memory(job_id)
+        except Exception as e:
+            progress.set_stage("failed", str(e))
+            raise
 
-                # create final file path
-                final_file_path = f"/file_path/{ticket_key}"
-                if not os.path.isdir(final_file_path):
-                    os.makedirs(final_file_path, exist_ok=True)
-                logger.info(f"created extraction file dir: {final_file_path}")
 
-                first_write = True  # check first write for append mode
-                # divide dataframe into chunks to avoid memory issues
-                logger.info(f"dividing {file_name} into chunks of size {CHUNK_SIZE}")
-                for i in range(0, len(file_df), CHUNK_SIZE):
-                    chunk_file_df = file_df.iloc[i : i + CHUNK_SIZE]
+# extract and deliver many tickets with one deduplicated users lookup
+async def run_batch_extraction(
+    jira: "JIRA", ticket_keys: list[str], extractor_id: str
+) -> list[dict]:
+    """
+    Usernames requested by several tickets are looked up once for the whole
+    batch, then every ticket gets its own archive and jira upload as in
+    run_extraction. A failing ticket does not fail the rest of the batch.
 
-                    # get unique usernames in chunk
-                    chunk_usernames = chunk_file_df["username"].unique().tolist()
+    Args:
+        jira (JIRA): jira object used to download and attach files
+        ticket_keys (list[str]): jira issue keys
+        extractor_id (str): email saved in data-extraction log
+    Returns:
+        list[dict]: ticket_key, status and detail of every ticket
+    Raises:
+        TimeoutError: if the batch was not admitted within the admission timeout
+    """
+    # drop duplicated ticket keys, keep request order
+    ticket_keys = list(dict.fromkeys(ticket_keys))
+    results = {}
+    batch_id = f"batch:{uuid.uuid4().hex}"
+    prefetch_id = f"{batch_id}:prefetch"
+
+    with ExitStack() as stack:
+        # tickets extracted by another worker are skipped, not waited for
+        lock_lost = {}
+        for ticket_key in ticket_keys:
+            try:
+                lock_lost[ticket_key] = stack.enter_context(ticket_lock(ticket_key))
+            except TicketLockedError as e:
+                results[ticket_key] = {"status": "skipped", "detail": str(e)}
 
-                    # fetch pii data from db
-                    db_data_chunk = fetch_users_by_user_ids(chunk_usernames, conn)
+        progress = {
+            ticket_key: ProgressReporter(ticket_key, uuid.uuid4().hex)
+            for ticket_key in lock_lost
+        }
+        for reporter in progress.values():
+            reporter.set_stage("waiting_for_memory")
+
+        if lock_lost and not await wait_for_memory(
+            batch_id, EXTRACTION_MEMORY_BUDGET_BYTES
+        ):
+            for reporter in progress.values():
+                reporter.set_stage("failed", "host memory budget exhausted")
+            raise TimeoutError(
+                "Host memory budget exhausted, batch extraction was not started."
+            )
 
-                    # merge chunk file df with db data
-                    merged_df = chunk_file_df.merge(
-                        db_data_chunk, on="username", how="left"
+        try:
+            attached_files = {}
+            for ticket_key, reporter in progress.items():
+                reporter.set_stage("downloading")
+                try:
+                    attached_files[ticket_key] = await get_jira_ticket_attached_data(
+                        jira, ticket_key
                     )
+                except Exception as e:
+                    logger.error(f"[Jira {ticket_key}] download failed: {e}")
+                    reporter.set_stage("failed", str(e))
+                    results[ticket_key] = {"status": "failed", "detail": str(e)}
+
+            # one lookup pass over the union of all identifiers of the batch,
+            # its rows are reserved on top of the per-ticket job budget
+            prefetched_users = await asyncio.to_thread(
+                prefetch_batch_users,
+                [file for files in attached_files.values() for file in files],
+                prefetch_id,
+            )
 
-                    save_file_name = f"{final_file_path}/{file_name}.csv"
-                    merged_df.to_csv(
-                        save_file_name,
-                        index=False,
-                        append=not first_write,
+            for ticket_key, files in attached_files.items():
+                reporter = progress[ticket_key]
+                try:
+                    status = await deliver_ticket(
+                        jira,
+                        ticket_key,
+                        files,
+                        extractor_id,
+                        EXTRACTION_MEMORY_BUDGET_BYTES,
+                        reporter.job_id,
+                        lock_lost[ticket_key],
+                        reporter,
+                        prefetched_users,
                     )
-                    first_write = False  # after first loop append data
-                logger.info(f"saved extracted data to {save_file_name}")
+                    results[ticket_key] = {"status": status}
+                except Exception as e:
+                    logger.error(f"[Jira {ticket_key}] batch extraction failed: {e}")
+                    reporter.set_stage("failed", str(e))
+                    results[ticket_key] = {"status": "failed", "detail": str(e)}
+        finally:
+            release_memory(batch_id)
+            release_memory(prefetch_id)
+
+    logger.info(
+        f"batch extraction of {len(ticket_keys)} tickets: "
+        f"{sum(r['status'] == 'delivered' for r in results.values())} delivered"
+    )
+    return [{"ticket_key": key, **results[key]} for key in ticket_keys]
 
-            except Exception as e:
-                logger.error(
-                    f"Error reading file {file}: {e}, expected format CSV or Excel."
-                )
+
+# result cache key of the rejects report of an attachment
+def get_rejects_cache_key(cache_key: str) -> str:
+    return f"{cache_key}_rejects"
+
+
+# extract pii data of a single attachment into final_file_path
+def extract_attachment_file(
+    file: str,
+    conn,
+    ticket_key: str,
+    final_file_path: str,
+    memory_budget: int,
+    progress: ProgressReporter | None = None,
+    prefetched_users: dict | None = None,
+):
+    # attachments sharing a name (re-uploads, users.csv and users.xlsx) get their
+    # own output and checkpoint, keyed by jira attachment id
+    attachment_id = get_attachment_id(file)
+    base_name = os.path.splitext(os.path.basename(file))[0]
+    file_name = f"{base_name}_{attachment_id}"
+    save_file_name = f"{final_file_path}/{file_name}.csv"
+    logger.info(f"Processing file: {file_name}")
+
+    rejects_file_name = f"{final_file_path}/{file_name}{REJECTS_FILE_SUFFIX}"
+
+    # reuse merged output of an identical attachment, skip db and merge
+    cache_key = compute_result_cache_key(file, PII_COLUMNS)
+    cached_result = get_cached_result(cache_key)
+    if cached_result:
+        shutil.copyfile(cached_result, save_file_name)
+        cached_rejects = get_cached_result(get_rejects_cache_key(cache_key))
+        if cached_rejects:
+            shutil.copyfile(cached_rejects, rejects_file_name)
+        logger.info(f"reused cached result for {file_name}: {cache_key}")
+        return
+
+    # report is rebuilt by every run, a resumed run validates skipped rows again
+    if os.path.exists(rejects_file_name):
+        os.remove(rejects_file_name)
+    reasons = Counter()
+
+    extract_file_in_chunks(
+        iter_valid_batches(file, rejects_file_name, reasons),
+        conn,
+        ticket_key,
+        attachment_id,
+        save_file_name,
+        memory_budget,
+        progress,
+        prefetched_users,
+        # approximate for large files, includes rows rejected by validation
+        count_attachment_rows(file),
+        checksum=get_attachment_checksum(file),
+    )
+    logger.info(f"saved extracted data to {save_file_name}")
+
+    if reasons:
+        store_result(get_rejects_cache_key(cache_key), rejects_file_name)
+        logger.info(
+            f"reported {reasons.total()} rows of {file_name}, "
+            f"{reasons.total() - reasons['duplicate']} rejected: {dict(reasons)}"
+        )
+    store_result(cache_key, save_file_name)
+
+
+# normalized and validated batches of an attachment, read one at a time
+def iter_valid_batches(
+    file: str, rejects_file_name: str, reasons: Counter
+) -> Iterator["pd.DataFrame"]:
+    """
+    Only plausible identifiers are looked up, the rest is appended to the
+    rejects report as each batch is read.
+
+    Args:
+        file (str): downloaded attachment path
+        rejects_file_name (str): rejects report path
+        reasons (Counter): counts reported rows by reason
+    """
+    seen_keys = SeenKeys()
+    for file_df in iter_attachment_batches(file):
+        # fix column names
+        file_df = normalize_user_id_column(file_df)
+        file_df, rejects_df = validate_identifiers(
+            file_df, get_identifier_column(file_df), seen_keys
+        )
+        if len(rejects_df):
+            rejects_df.to_csv(
+                rejects_file_name, mode="a", index=False, header=not reasons
+            )
+            reasons.update(rejects_df["reason"])
+        yield file_df
+
+
+# extract pii data of all attachments, compress and upload it to jira
+async def extract_and_deliver(
+    jira: "JIRA",
+    ticket_key: str,
+    extractor_id: str,
+    memory_budget: int,
+    job_id: str,
+    lock_lost: threading.Event,
+    progress: ProgressReporter,
+):
+    # get file_lists that was attached in jira ticket
+    progress.set_stage("downloading")
+    attached_files_list = await get_jira_ticket_attached_data(jira, ticket_key)
+
+    await deliver_ticket(
+        jira,
+        ticket_key,
+        attached_files_list,
+        extractor_id,
+        memory_budget,
+        job_id,
+        lock_lost,
+        progress,
+    )
+
+
+# extract pii data of downloaded attachments, compress and upload it to jira
+async def deliver_ticket(
+    jira: "JIRA",
+    ticket_key: str,
+    attached_files_list: list[str],
+    extractor_id: str,
+    memory_budget: int,
+    job_id: str,
+    lock_lost: threading.Event,
+    progress: ProgressReporter,
+    prefetched_users: dict | None = None,
+) -> str:
+    """
+    Returns:
+        str: "delivered", "no_attachments" or "failed" (upload failed)
+    """
+    # extract data if files exist
+    if len(attached_files_list) == 0:
+        progress.set_stage("done")
+        return "no_attachments"
+
+    # per-job dir on a scratch volume within its disk quota,
+    # or the dir of an interrupted job being resumed
+    final_file_path, scratch_volume = await allocate_job_scratch(
+        ticket_key, job_id, estimate_scratch_bytes(attached_files_list)
+    )
+    progress.files_total = len(attached_files_list)
+    try:
+        # blocking stages run in threads, so this worker keeps serving
+        # progress streams and other requests while the job runs
+        await asyncio.to_thread(
+            profiled(extract_attachment_files),
+            attached_files_list,
+            ticket_key,
+            final_file_path,
+            memory_budget,
+            progress,
+            prefetched_users,
+        )
 
         # compress and encrypt file
         logger.info(f"compressing and encrypting extracted files in {final_file_path}")
+        progress.set_stage("compressing")
 
-        compressed_file_path, password = encrypt_and_compress_files(
-            final_file_path, ticket_key
+        compressed_file_paths, password = await asyncio.to_thread(
+            profiled(encrypt_and_compress_volumes), final_file_path, ticket_key
+        )
+        logger.info(f"data compressed to {compressed_file_paths}")
+
+        # another worker may own the ticket now, do not attach a second copy
+        if lock_lost.is_set():
+            raise RuntimeError(
+                f"Extraction lock of {ticket_key} expired, upload was skipped."
+            )
+
+        progress.set_stage("uploading", f"{len(compressed_file_paths)} volume(s)")
+        upload_result = await asyncio.to_thread(
+            profiled(upload_file_to_jira), jira, compressed_file_paths, ticket_key
         )
-        logger.info(f"data compressed to {compressed_file_path}")
 
-        upload_file_to_jira(jira, compressed_file_path, ticket_key)
+        # keep checkpoints on failed upload so a re-run skips finished chunks;
+        # the password was never shared and nothing was delivered to log
+        if upload_result["status"] != "success":
+            details = upload_result.get("details")
+            logger.error(f"[Jira {ticket_key}] upload failed: {details}")
+            send_slack_message(
+                SLACK_WEBHOOK_URL,
+                f"❌ Delivery of Jira ticket **{ticket_key}** failed: {details}",
+            )
+            progress.set_stage("failed", details)
+            return "failed"
+
         logger.info(f"attached compress data to jira ticket {ticket_key}")
+        clear_checkpoints(ticket_key)
+        # delivered archives live in jira now, free the job's scratch space
+        remove_job_scratch(ticket_key, final_file_path)
 
         # send slack message
         comment_text = (
@@ -440,20 +1626,54 @@ async def get_data_from_query(request: Request, ticket_key: str):
             f"If you encounter any issues or discrepancies in the extracted data, "
             f"please contact **Data Team**."
         )
-        send_slack_message(SLACK_WEBHOOK_URL, comment_text)
+        send_slack_message(SLACK_WEBHOOK_URL, comment_text, secrets=[password])
         logger.info(f"sent slack message for ticket {ticket_key}")
 
         # saving log to MySQL
-        session_id = request.cookies.get("session_id")
-        if not session_id:
-            raise ValueError("No session_id found in request cookies.")
-        jira_email, _ = get_email_jira_token_value(session_id)
+        for compressed_file_path in compressed_file_paths:
+            save_log_to_mysql(
+                extractor_id=extractor_id,
+                ticket_key=ticket_key,
+                file_path=compressed_file_path,
+            )
+    finally:
+        release_job_scratch(scratch_volume, job_id)
 
-        save_log_to_mysql(
-            extractor_id=jira_email,
-            ticket_key=ticket_key,
-            file_path=compressed_file_path,
-        )
+    progress.set_stage("done")
+    return "delivered"
+
+
+# extract pii data of every attachment of a ticket into final_file_path
+def extract_attachment_files(
+    attached_files_list: list[str],
+    ticket_key: str,
+    final_file_path: str,
+    memory_budget: int,
+    progress: ProgressReporter,
+    prefetched_users: dict | None = None,
+):
+    # read-only pii lookups go to a replica, primary if none is healthy
+    conn = get_read_connection()
+    try:
+        # use loop to open file
+        for file in attached_files_list:
+            try:
+                extract_attachment_file(
+                    file,
+                    conn,
+                    ticket_key,
+                    final_file_path,
+                    memory_budget,
+                    progress,
+                    prefetched_users,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error reading file {file}: {e}, expected format CSV or Excel."
+                )
+            progress.files_done += 1
+    finally:
+        conn.close()
 
 
 # create random password
@@ -482,6 +1702,8 @@ def encrypt_and_compress_files(final_file_path: str, ticket_no: str) -> list[str
     # set Password
     password = create_random_password()
 
+    import pyzipper
+
     # zip output path
     compressed_file_path = os.path.join(final_file_path, f"{ticket_no}.zip")
 
@@ -497,39 +1719,233 @@ def encrypt_and_compress_files(final_file_path: str, ticket_no: str) -> list[str
         for file in os.listdir(final_file_path):
             full_path = os.path.join(final_file_path, file)
 
-            # skip the zip file itself (re-run safety)
-            if full_path == compressed_file_path:
+            # skip the zip file itself and earlier volumes (re-run safety)
+            if file.endswith(".zip"):
                 continue
 
             # include only files, no directories
             if os.path.isfile(full_path):
-                with open(full_path, "rb") as f:
-                    zf.writestr(file, f.read())  # Store plain filename
+                zf.write(full_path, arcname=file)  # Store plain filename
 
     return compressed_file_path, password
 
 
+# open a new AES-encrypted zip volume
+def open_zip_volume(
+    final_file_path: str, ticket_no: str, volume_no: int, password: bytes
+) -> "pyzipper.AESZipFile":
+    import pyzipper
+
+    volume_path = os.path.join(final_file_path, f"{ticket_no}.part{volume_no:02d}.zip")
+    zf = pyzipper.AESZipFile(
+        volume_path,
+        "w",
+        compression=zipfile.ZIP_DEFLATED,
+        encryption=pyzipper.WZ_AES,
+    )
+    zf.setpassword(password)
+    return zf
+
+
+# stream csv rows into zip volumes, continuing in a new volume when one is full
+def write_csv_to_volumes(
+    file_path: str, volumes: list, open_next_volume, max_bytes: int
+):
+    file = os.path.basename(file_path)
+    base_name, extension = os.path.splitext(file)
+
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        part_no = 0
+        entry = None
+        lines = f.readlines(VOLUME_WRITE_BLOCK_BYTES)
+
+        while True:
+            # roll over to next volume before current one reaches the limit
+            if volumes[-1].fp.tell() + VOLUME_SIZE_MARGIN_BYTES > max_bytes:
+                if entry:
+                    entry.close()
+                    entry = None
+                open_next_volume()
+
+            # csv part starts with its own header
+            if entry is None:
+                part_no += 1
+                entry_name = (
+                    file
+                    if part_no == 1
+                    else f"{base_name}.part{part_no:02d}{extension}"
+                )
+                entry = volumes[-1].open(entry_name, "w")
+                entry.write(header)
+
+            entry.write(b"".join(lines))
+            lines = f.readlines(VOLUME_WRITE_BLOCK_BYTES)
+            if not lines:
+                break
+
+        entry.close()
+
+
+# encrypt query data and compress into volumes that fit jira attachment size limit
+def encrypt_and_compress_volumes(
+    final_file_path: str, ticket_no: str, max_bytes: int = JIRA_ATTACHMENT_MAX_BYTES
+) -> tuple[list[str], bytes]:
+    """
+    Encrypt and compress extracted files into one or more AES-encrypted zips.
+    If extracted files fit into a single attachment, a single zip is created.
+    Otherwise csv rows are streamed into volumes whose compressed size stays
+    below max_bytes; a csv spanning several volumes repeats its header.
+
+    Args:
+        final_file_path (str): Directory containing the files.
+        ticket_no (str): jira issue key
+        max_bytes (int): maximum size of a single volume
+    Returns:
+        (volume_paths, password): paths of created zips + generated password.
+    """
+
+    # remove archives of earlier runs
+    files = []
+    for file in sorted(os.listdir(final_file_path)):
+        full_path = os.path.join(final_file_path, file)
+        if file.endswith(".zip"):
+            os.remove(full_path)
+        elif os.path.isfile(full_path):
+            files.append(file)
+
+    # compressed size never exceeds uncompressed csv size by much
+    total_size = sum(os.path.getsize(os.path.join(final_file_path, f)) for f in files)
+    if total_size <= max_bytes:
+        compressed_file_path, password = encrypt_and_compress_files(
+            final_file_path, ticket_no
+        )
+        return [compressed_file_path], password
+
+    password = create_random_password()
+    volumes = []
+
+    # close current volume and start the next one
+    def open_next_volume() -> "pyzipper.AESZipFile":
+        if volumes:
+            volumes[-1].close()
+        volumes.append(
+            open_zip_volume(final_file_path, ticket_no, len(volumes) + 1, password)
+        )
+        return volumes[-1]
+
+    open_next_volume()
+    for file in files:
+        write_csv_to_volumes(
+            os.path.join(final_file_path, file), volumes, open_next_volume, max_bytes
+        )
+
+    volumes[-1].close()
+    volume_paths = [zf.filename for zf in volumes]
+    logger.info(f"split {ticket_no} archive into {len(volume_paths)} volumes")
+    return volume_paths, password
+
+
+# upload a single archive, retrying only this archive on failure
+def upload_attachment_with_retry(jira: "JIRA", file_path: str, ticket_no: str):
+    """
+    Returns:
+        Attachment: jira attachment created for the archive
+    """
+    import requests
+    from jira import JIRAError
+
+    for attempt in range(1, JIRA_UPLOAD_RETRIES + 1):
+        try:
+            # jira streams the multipart body from the open file handle
+            with open(file_path, "rb") as f:
+                return jira.add_attachment(
+                    issue=ticket_no, attachment=f, filename=os.path.basename(file_path)
+                )
+
+        except (JIRAError, requests.RequestException) as e:
+            if attempt == JIRA_UPLOAD_RETRIES:
+                raise
+            backoff = JIRA_UPLOAD_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.warning(
+                f"Failed to attach {file_path} to {ticket_no} "
+                f"(attempt {attempt}), retrying in {backoff}s: {e}"
+            )
+            time.sleep(backoff)
+
+
+# delete the volumes of a failed upload from the ticket
+def remove_uploaded_attachments(jira: "JIRA", attachments: list, ticket_no: str):
+    """
+    Their password is never sent, and a retry uploads a new set of volumes
+    encrypted with a new password, so partial uploads are not left behind.
+    """
+    for attachment in attachments:
+        try:
+            jira.delete_attachment(attachment.id)
+            logger.info(
+                f"removed partial upload {attachment.filename} from {ticket_no}"
+            )
+        except Exception as e:
+            logger.error(
+                f"❌ Failed to remove partial upload {attachment.filename} "
+                f"from {ticket_no}: {e}"
+            )
+
+
 # attach zip file to jira ticket
 def upload_file_to_jira(
-    jira: JIRA,
-    file_path: str,
+    jira: "JIRA",
+    file_path: str | list[str],
     ticket_no: str,
 ):
     """
     adding extracted file to jira ticket
+    multiple volumes are uploaded concurrently, each with its own retries;
+    if any of them fails, the ones already attached are deleted again
 
     Args:
-        file_path (str): extracted file dir
+        file_path (str | list[str]): compressed file path or volume paths
         ticket_no (str): jira issue key
     Returns:
         dict: API response JSON or error message 또는 에러 메시지
     """
+    from jira import JIRAError
+
+    file_paths = [file_path] if isinstance(file_path, str) else file_path
+    file_names = [os.path.basename(path) for path in file_paths]
+    uploaded = []
 
     try:
-        with open(file_path, "rb") as f:
-            jira.add_attachment(
-                issue=ticket_no, attachment=f, filename=os.path.basename(file_path)
-            )
+        failed_files = []
+        with ThreadPoolExecutor(
+            max_workers=min(JIRA_UPLOAD_CONCURRENCY, len(file_paths))
+        ) as executor:
+            futures = {
+                executor.submit(upload_attachment_with_retry, jira, path, ticket_no): (
+                    path
+                )
+                for path in file_paths
+            }
+            for future in as_completed(futures):
+                try:
+                    uploaded.append(future.result())
+                    logger.info(
+                        f"📎 File '{futures[future]}' attached successfully to {ticket_no}"
+                    )
+                except JIRAError as e:
+                    logger.error(
+                        f"❌ Jira API error while attaching file: {e.status_code} - {e.text}"
+                    )
+                    failed_files.append(os.path.basename(futures[future]))
+
+        if failed_files:
+            remove_uploaded_attachments(jira, uploaded, ticket_no)
+            return {
+                "status": "error",
+                "details": "Failed to attach files",
+                "failed_files": failed_files,
+            }
 
         # adding additional comments in the ticket
         comment_text = (
@@ -537,23 +1953,29 @@ def upload_file_to_jira(
             f"If you encounter any issues or discrepancies in the extracted data, "
             f"please contact **Data team**."
         )
+        if len(file_names) > 1:
+            comment_text += (
+                f"\n\nThe extracted data is split into {len(file_names)} volumes: "
+                f"{', '.join(file_names)}"
+            )
 
         jira.add_comment(ticket_no, comment_text)
-        logger.info(f"📎 File '{file_path}' attached successfully to {ticket_no}")
 
         # sending message bia slack
         send_slack_message(SLACK_WEBHOOK_URL, comment_text)
 
-        return {"status": "success", "file": os.path.basename(file_path)}
+        return {"status": "success", "files": file_names}
 
     except JIRAError as e:
         logger.error(
             f"❌ Jira API error while attaching file: {e.status_code} - {e.text}"
         )
+        remove_uploaded_attachments(jira, uploaded, ticket_no)
         return {"status": "error", "code": e.status_code, "details": e.text}
 
     except Exception as e:
         logger.error(f"⚠️ Unexpected error: {e}")
+        remove_uploaded_attachments(jira, uploaded, ticket_no)
         return {"status": "error", "details": str(e)}
 
 
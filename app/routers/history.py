@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.config import HISTORY_MAX_PAGE_SIZE, HISTORY_PAGE_SIZE
+from app.core.audit_log import fetch_extraction_history
+from app.core.db_connection import get_db_connection
+from app.core.decorators import is_logged_in
+
+router = APIRouter()
+
+
+# paginated data-extraction history for compliance queries
+@router.get("/history")
+@is_logged_in
+def extraction_history(
+    request: Request,
+    ticket_key: str | None = None,
+    extractor_id: str | None = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=HISTORY_MAX_PAGE_SIZE),
+    cursor: str | None = None,
+):
+    """
+    Args:
+        ticket_key (str): filter by jira issue key
+        extractor_id (str): filter by extractor email
+        limit (int): page size
+        cursor (str): next_cursor returned by previous page
+    Returns:
+        dict: history rows and cursor of next page
+    """
+    conn = get_db_connection()
+    try:
+        rows, next_cursor = fetch_extraction_history(
+            conn, ticket_key, extractor_id, limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    finally:
+        conn.close()
+
+    return {"items": rows, "next_cursor": next_cursor}
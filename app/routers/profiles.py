@@ -0,0 +1,57 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.decorators import is_logged_in
+from app.core.profiler import get_profile_path, list_profiles, render_profile_text
+from app.routers.auth import get_email_jira_token_value
+from app.routers.data_extraction import is_jira_admin
+
+router = APIRouter()
+
+
+# profiles can contain ticket keys and query details, admins only
+def check_jira_admin(request: Request):
+    session_id = request.cookies.get("session_id")
+    email, jira_api_token = get_email_jira_token_value(session_id)
+    if not email or not is_jira_admin(email, jira_api_token):
+        raise HTTPException(
+            status_code=403, detail="User does not have Jira Admin privileges"
+        )
+
+
+# saved request profiles, newest first
+@router.get("/profiles")
+@is_logged_in
+def get_profiles(request: Request):
+    check_jira_admin(request)
+    return {"items": list_profiles()}
+
+
+# download a saved profile as pstats file, or as text report with format=text
+@router.get("/profiles/{profile_id}", response_model=None)
+@is_logged_in
+def download_profile(request: Request, profile_id: str, format: str = "prof"):
+    """
+    Args:
+        profile_id (str): id returned in the X-Profile-Id header
+        format (str): "prof" for the cProfile stats file, "text" for a summary
+    Returns:
+        FileResponse | PlainTextResponse: profile artifact
+    """
+    check_jira_admin(request)
+    try:
+        profile_path = get_profile_path(profile_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if not os.path.isfile(profile_path):
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+    if format == "text":
+        return PlainTextResponse(render_profile_text(profile_id))
+    return FileResponse(
+        profile_path,
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.prof",
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.config import (
+    JIRA_APPROVE_TRANSITION_NAME,
+    JIRA_APPROVED_STATUS_NAME,
+    JIRA_PROJECT_KEY,
+    JIRA_SERVICE_EMAIL,
+    JIRA_WEBHOOK_SECRET,
+)
+from app.core.extraction_queue import (
+    dequeue_extraction_batch,
+    enqueue_extraction,
+    get_approved_tickets,
+    release_extraction,
+)
+from app.core.locks import TicketLockedError
+from app.core.logger import logger
+from app.routers.data_extraction import (
+    get_service_jira_object,
+    run_batch_extraction,
+    run_extraction,
+)
+
+router = APIRouter()
+
+
+# verify jira webhook signature ("X-Hub-Signature: sha256=<hmac>")
+def is_valid_signature(body: bytes, signature: str | None) -> bool:
+    # unsigned webhooks are never trusted, even without a configured secret
+    if not JIRA_WEBHOOK_SECRET or not signature:
+        return False
+
+    expected = hmac.new(
+        JIRA_WEBHOOK_SECRET.encode("utf-8"), body, hashlib.sha256
+    ).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+# check whether webhook event moved the ticket into approved status
+def is_approval_event(payload: dict) -> bool:
+    # workflow post-function webhooks send the executed transition
+    transition = payload.get("transition") or {}
+    if transition.get("transitionName", "").lower() == (
+        JIRA_APPROVE_TRANSITION_NAME.lower()
+    ):
+        return True
+
+    # issue_updated webhooks send status change in changelog
+    for item in (payload.get("changelog") or {}).get("items", []):
+        if item.get("field") == "status" and (
+            (item.get("toString") or "").lower() == JIRA_APPROVED_STATUS_NAME.lower()
+        ):
+            return True
+
+    return False
+
+
+# receive jira issue-transitioned events and queue approved extractions
+@router.post("/webhooks/jira", status_code=202)
+async def jira_webhook(request: Request):
+    # webhooks queue pii extractions, they are refused until a secret is set
+    if not JIRA_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=503, detail="Jira webhook secret is not configured"
+        )
+
+    body = await request.body()
+    if not is_valid_signature(body, request.headers.get("X-Hub-Signature")):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload") from e
+
+    ticket_key = (payload.get("issue") or {}).get("key")
+    if not ticket_key or not ticket_key.startswith(f"{JIRA_PROJECT_KEY}-"):
+        return {"status": "ignored"}
+
+    if not is_approval_event(payload):
+        return {"status": "ignored", "ticket_key": ticket_key}
+
+    queued = enqueue_extraction(ticket_key)
+    return {"status": "queued" if queued else "duplicate", "ticket_key": ticket_key}
+
+
+# drain extraction queue until stop_event is set
+def extraction_worker_loop(stop_event: threading.Event):
+    """
+    Tickets waiting in the queue are extracted together as one batch,
+    so users requested by several of them are looked up only once.
+    Each ticket is re-checked with the service account before it is extracted,
+    the webhook payload that queued it is not trusted.
+    """
+    logger.info("extraction worker started")
+    while not stop_event.is_set():
+        try:
+            ticket_keys = dequeue_extraction_batch()
+        except Exception as e:
+            logger.error(f"Failed to read extraction queue: {e}")
+            stop_event.wait(5)
+            continue
+
+        if not ticket_keys:
+            continue
+
+        try:
+            jira = get_service_jira_object()
+            approved_keys = get_approved_tickets(jira, ticket_keys)
+            if len(approved_keys) == 1:
+                asyncio.run(run_extraction(jira, approved_keys[0], JIRA_SERVICE_EMAIL))
+            elif approved_keys:
+                asyncio.run(
+                    run_batch_extraction(jira, approved_keys, JIRA_SERVICE_EMAIL)
+                )
+        except TicketLockedError:
+            logger.info(f"[Jira {ticket_keys[0]}] already extracted by another worker")
+        except Exception as e:
+            logger.error(
+                f"[Jira {', '.join(ticket_keys)}] queued extraction failed: {e}"
+            )
+        finally:
+            for ticket_key in ticket_keys:
+                release_extraction(ticket_key)
+
+
+# run extraction worker in a background thread, so extractions never block the event loop
+def start_extraction_worker() -> threading.Event:
+    """
+    Returns:
+        threading.Event: set it to stop the worker after its current extraction
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=extraction_worker_loop,
+        args=(stop_event,),
+        name="extraction-worker",
+        daemon=True,
+    ).start()
+    return stop_event
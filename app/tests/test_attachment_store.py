@@ -0,0 +1,83 @@
+# app/tests/test_attachment_store.py
+import os
+from unittest.mock import MagicMock, patch
+
+from app.core.attachment_store import sync_ticket_attachments
+
+
+# create Mock object for jira Attachment resource
+def make_attachment(attachment_id, filename, content):
+    attachment = MagicMock()
+    attachment.id = attachment_id
+    attachment.filename = filename
+    attachment.size = len(content)
+    attachment.iter_content.side_effect = lambda chunk_size: iter([content])
+    return attachment
+
+
+# unchanged attachments are not downloaded again
+@patch("app.core.attachment_store.clear_attachment_checkpoint")
+def test_sync_ticket_attachments_skips_unchanged(mock_clear, tmp_path):
+    attachment = make_attachment("10001", "users.csv", b"username\na\n")
+
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        first_paths = sync_ticket_attachments("TEST-1", [attachment])
+        second_paths = sync_ticket_attachments("TEST-1", [attachment])
+
+    assert first_paths == second_paths
+    assert attachment.iter_content.call_count == 1
+    mock_clear.assert_called_once_with("TEST-1", "10001")
+    assert "TEST-1" in first_paths[0] and "10001" in first_paths[0]
+
+
+# same file name in different tickets does not collide
+@patch("app.core.attachment_store.clear_attachment_checkpoint")
+def test_sync_ticket_attachments_per_ticket_dirs(mock_clear, tmp_path):
+    attachment_1 = make_attachment("1", "users.csv", b"username\na\n")
+    attachment_2 = make_attachment("2", "users.csv", b"username\nb\n")
+
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        [path_1] = sync_ticket_attachments("TEST-1", [attachment_1])
+        [path_2] = sync_ticket_attachments("TEST-2", [attachment_2])
+
+    assert path_1 != path_2
+    assert open(path_1, "rb").read() == b"username\na\n"
+    assert open(path_2, "rb").read() == b"username\nb\n"
+
+
+# attachments removed from the ticket are deleted locally
+@patch("app.core.attachment_store.clear_attachment_checkpoint")
+def test_sync_ticket_attachments_prunes_removed(mock_clear, tmp_path):
+    attachment = make_attachment("1", "users.csv", b"username\na\n")
+
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        [path] = sync_ticket_attachments("TEST-1", [attachment])
+        assert sync_ticket_attachments("TEST-1", []) == []
+
+    assert not os.path.exists(path)
+
+
+# replaced content is downloaded again and its stale checkpoint dropped
+@patch("app.core.attachment_store.clear_attachment_checkpoint")
+def test_sync_ticket_attachments_clears_checkpoint_of_replaced(mock_clear, tmp_path):
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        sync_ticket_attachments(
+            "TEST-1", [make_attachment("1", "users.csv", b"username\na\n")]
+        )
+        [path] = sync_ticket_attachments(
+            "TEST-1", [make_attachment("1", "users.csv", b"username\nb\nc\n")]
+        )
+
+    assert open(path, "rb").read() == b"username\nb\nc\n"
+    assert mock_clear.call_count == 2
+
+
+# uploader-controlled names never leave the attachment's own dir
+@patch("app.core.attachment_store.clear_attachment_checkpoint")
+def test_sync_ticket_attachments_sanitizes_filename(mock_clear, tmp_path):
+    attachment = make_attachment("1", "../../evil.csv", b"username\na\n")
+
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        [path] = sync_ticket_attachments("TEST-1", [attachment])
+
+    assert path == str(tmp_path / "TEST-1" / "attachments" / "1" / "evil.csv")
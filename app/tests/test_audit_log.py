@@ -0,0 +1,51 @@
+# app/tests/test_audit_log.py
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from app.core import audit_log
+from app.core.audit_log import (
+    INSERT_LOG_SQL,
+    decode_history_cursor,
+    fetch_extraction_history,
+    save_log_to_mysql,
+)
+
+
+# insert statement has a placeholder for every value
+@patch("app.core.audit_log.insert_log_rows")
+def test_save_log_to_mysql_without_writer(mock_insert):
+    save_log_to_mysql("user@example.com", "DATA-1", "/file_path/DATA-1/DATA-1.zip")
+
+    [rows] = mock_insert.call_args.args
+    assert len(rows) == 1
+    assert rows[0][2] == "DATA-1.zip"
+    assert INSERT_LOG_SQL.count("%s") == len(rows[0])
+
+
+# buffered rows are flushed in one batch when the writer stops
+@patch("app.core.audit_log.insert_log_rows")
+def test_audit_log_writer_flushes_on_shutdown(mock_insert):
+    audit_log.start_audit_log_writer()
+    for i in range(3):
+        save_log_to_mysql("user@example.com", f"DATA-{i}", None)
+    audit_log.stop_audit_log_writer()
+
+    flushed_rows = [row for call in mock_insert.call_args_list for row in call.args[0]]
+    assert [row[1] for row in flushed_rows] == ["DATA-0", "DATA-1", "DATA-2"]
+
+
+# next_cursor points at the last row of the page
+def test_fetch_extraction_history_keyset_pagination():
+    created_at = datetime(2025, 1, 1, 12, 0, 0)
+    db_rows = [{"id": i, "created_at": created_at} for i in (3, 2, 1)]
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = db_rows
+
+    rows, next_cursor = fetch_extraction_history(conn, ticket_key="DATA-1", limit=2)
+
+    sql, params = cursor.execute.call_args.args
+    assert "ticket_key = %s" in sql
+    assert params == ["DATA-1", 3]
+    assert len(rows) == 2
+    assert decode_history_cursor(next_cursor) == (created_at, 2)
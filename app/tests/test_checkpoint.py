@@ -0,0 +1,149 @@
+# app/tests/test_checkpoint.py
+import json
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.core.checkpoint import get_job_work_dir, restore_output_file
+from app.routers.data_extraction import extract_file_in_chunks
+
+
+# output file is truncated to the last committed offset
+@patch("app.core.checkpoint.redis_client")
+def test_restore_output_file_truncates_to_offset(mock_redis, tmp_path):
+    save_file_name = tmp_path / "users.csv"
+    save_file_name.write_text("username\na\nb\npartial-row")
+    mock_redis.hget.return_value = json.dumps(
+        {
+            "chunk_index": 0,
+            "rows_done": 2,
+            "offset": len("username\na\nb\n"),
+            "checksum": "abc",
+        }
+    )
+
+    checkpoint = restore_output_file("TEST-1", "10001", str(save_file_name), "abc")
+
+    assert checkpoint["rows_done"] == 2
+    assert save_file_name.read_text() == "username\na\nb\n"
+    mock_redis.hget.assert_called_once_with("extraction:checkpoint:TEST-1", "10001")
+
+
+# checkpoint of different attachment content is discarded with its output
+@patch("app.core.checkpoint.redis_client")
+def test_restore_output_file_checksum_changed(mock_redis, tmp_path):
+    save_file_name = tmp_path / "users.csv"
+    save_file_name.write_text("username\na\nb\n")
+    mock_redis.hget.return_value = json.dumps(
+        {"chunk_index": 0, "rows_done": 2, "offset": 13, "checksum": "old"}
+    )
+
+    checkpoint = restore_output_file("TEST-1", "10001", str(save_file_name), "new")
+
+    assert checkpoint["rows_done"] == 0
+    assert not save_file_name.exists()
+
+
+# stale output without checkpoint is removed
+@patch("app.core.checkpoint.redis_client")
+def test_restore_output_file_without_checkpoint(mock_redis, tmp_path):
+    save_file_name = tmp_path / "users.csv"
+    save_file_name.write_text("username\nstale\n")
+    mock_redis.hget.return_value = None
+
+    checkpoint = restore_output_file("TEST-1", "10001", str(save_file_name), "abc")
+
+    assert checkpoint["rows_done"] == 0
+    assert not save_file_name.exists()
+
+
+# re-run only looks up the chunks after the last committed one
+@patch("app.routers.data_extraction.CHUNK_SIZE", 2)
+@patch("app.routers.data_extraction.save_checkpoint")
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+@patch("app.core.checkpoint.redis_client")
+def test_extract_file_in_chunks_resumes(
+    mock_redis, mock_fetch, mock_save_checkpoint, tmp_path
+):
+    save_file_name = tmp_path / "users.csv"
+    save_file_name.write_text("username,email\na,a@x.com\nb,b@x.com\n")
+    mock_redis.hget.return_value = json.dumps(
+        {
+            "chunk_index": 0,
+            "rows_done": 2,
+            "offset": save_file_name.stat().st_size,
+            "checksum": "abc",
+        }
+    )
+    mock_fetch.return_value = pd.DataFrame(
+        {"_lookup_key": ["c"], "username": ["c"], "email": ["c@x.com"]}
+    )
+    file_df = pd.DataFrame({"username": ["a", "b", "c"]})
+
+    extract_file_in_chunks(
+        file_df, None, "TEST-1", "10001", str(save_file_name), checksum="abc"
+    )
+
+    mock_fetch.assert_called_once_with(["c"], None, "username")
+    result_df = pd.read_csv(save_file_name)
+    assert result_df["username"].tolist() == ["a", "b", "c"]
+    assert mock_save_checkpoint.call_args.args[2:4] == (1, 3)
+    assert mock_save_checkpoint.call_args.args[5] == "abc"
+
+
+# resumed job keeps writing into the dir of the interrupted job
+@patch("app.core.checkpoint.redis_client")
+def test_get_job_work_dir_reuses_previous_dir(mock_redis, tmp_path):
+    previous_dir = tmp_path / "TEST-1" / "jobs" / "old"
+    previous_dir.mkdir(parents=True)
+    mock_redis.get.return_value = str(previous_dir)
+
+    assert get_job_work_dir("TEST-1", "new", str(tmp_path)) == str(previous_dir)
+    mock_redis.set.assert_not_called()
+
+
+# new job gets its own dir when nothing can be resumed on this host
+@patch("app.core.checkpoint.redis_client")
+def test_get_job_work_dir_creates_unique_dir(mock_redis, tmp_path):
+    mock_redis.get.return_value = str(tmp_path / "missing")
+
+    work_dir = get_job_work_dir("TEST-1", "new", str(tmp_path))
+
+    assert work_dir == str(tmp_path / "TEST-1" / "jobs" / "new")
+    assert (tmp_path / "TEST-1" / "jobs" / "new").is_dir()
+
+
+# streamed batches committed by an interrupted run are skipped
+@patch("app.routers.data_extraction.save_checkpoint")
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+@patch("app.core.checkpoint.redis_client")
+def test_extract_file_in_chunks_resumes_batches(
+    mock_redis, mock_fetch, mock_save_checkpoint, tmp_path
+):
+    save_file_name = tmp_path / "users.csv"
+    save_file_name.write_text("username,email\na,a@x.com\nb,b@x.com\n")
+    mock_redis.hget.return_value = json.dumps(
+        {
+            "chunk_index": 1,
+            "rows_done": 2,
+            "offset": save_file_name.stat().st_size,
+            "checksum": "abc",
+        }
+    )
+    mock_fetch.side_effect = lambda keys, conn, key_type: pd.DataFrame(
+        {"_lookup_key": keys, "email": [f"{key}@x.com" for key in keys]}
+    )
+    batches = iter(
+        [
+            pd.DataFrame({"username": ["a", "b"]}),
+            pd.DataFrame({"username": ["c", "d"]}, index=[2, 3]),
+        ]
+    )
+
+    extract_file_in_chunks(
+        batches, None, "TEST-1", "10001", str(save_file_name), checksum="abc"
+    )
+
+    mock_fetch.assert_called_once_with(["c", "d"], None, "username")
+    assert pd.read_csv(save_file_name)["username"].tolist() == ["a", "b", "c", "d"]
+    assert mock_save_checkpoint.call_args.args[3] == 4
@@ -1,4 +1,6 @@
 # app/tests/test_data_extraction.py
+import asyncio
+import hashlib
 import pytest
 import pandas as pd
 import os
@@ -6,10 +8,24 @@ from unittest.mock import patch, MagicMock
 from app.main import app
 from fastapi.testclient import TestClient
 import tempfile
+import pyzipper
+from jira import JIRAError
+from app.core.identifiers import validate_identifiers
+from app.core.profiler import profiled
 from app.routers.data_extraction import (
+    deliver_ticket,
+    estimate_attachment,
+    estimate_attachments,
+    extract_attachment_file,
     normalize_user_id_column,
     create_random_password,
     encrypt_and_compress_files,
+    encrypt_and_compress_volumes,
+    join_pii_columns,
+    lookup_users,
+    merge_chunk_with_pii,
+    prefetch_users,
+    read_attachment_file,
     upload_file_to_jira,
     def_jira_ticket_list,
 )
@@ -80,7 +96,7 @@ class DummyRequest:
         self.query_params = {}
 
 
-@patch("app.routers.data_extraction.JIRA")
+@patch("jira.JIRA")
 @patch("app.routers.auth.get_email_jira_token_value")
 def test_def_jira_ticket_list(mock_get_jira_obj, mock_get_email_token):
     # session -> email, jira_api_token
@@ -127,8 +143,8 @@ def test_normalize_user_id_column_basic():
     df = pd.DataFrame({"User ID": [1, 2], "Age": [20, 25]})
     normalized_df = normalize_user_id_column(df)
     assert isinstance(normalized_df, pd.DataFrame)
-    # check if column name has changed into username
-    assert any("username" in col for col in normalized_df.columns)
+    # check if column name has changed into user_id
+    assert "user_id" in normalized_df.columns
 
 
 # random password creation test
@@ -168,3 +184,501 @@ def test_upload_file_to_jira_success(mock_slack):
     mock_jira.add_comment.assert_called_once()
     mock_slack.assert_called_once()
     os.unlink(tmp.name)
+
+
+# large extraction is split into encrypted volumes under the size limit
+@patch("app.routers.data_extraction.VOLUME_SIZE_MARGIN_BYTES", 64 * 1024)
+@patch("app.routers.data_extraction.VOLUME_WRITE_BLOCK_BYTES", 1024)
+def test_encrypt_and_compress_volumes_splits(tmp_path):
+    test_dir = tmp_path / "files"
+    test_dir.mkdir()
+    rows = [f"user{i},{os.urandom(16).hex()}" for i in range(20000)]
+    (test_dir / "users.csv").write_text("username,token\n" + "\n".join(rows) + "\n")
+
+    max_bytes = 256 * 1024
+    volume_paths, password = encrypt_and_compress_volumes(
+        str(test_dir), "TEST-1", max_bytes=max_bytes
+    )
+
+    assert len(volume_paths) > 1
+    extracted_rows = []
+    for volume_path in volume_paths:
+        assert os.path.getsize(volume_path) <= max_bytes
+        with pyzipper.AESZipFile(volume_path) as zf:
+            zf.setpassword(password)
+            for name in zf.namelist():
+                lines = zf.read(name).decode().splitlines()
+                assert lines[0] == "username,token"
+                extracted_rows.extend(lines[1:])
+    assert extracted_rows == rows
+
+
+# failed volume upload is retried without re-uploading other volumes
+@patch("app.routers.data_extraction.time.sleep")
+@patch("app.routers.data_extraction.send_slack_message")
+def test_upload_file_to_jira_retries_failed_volume(mock_slack, mock_sleep, tmp_path):
+    volume_paths = []
+    for i in range(1, 3):
+        volume_path = tmp_path / f"TICKET-123.part0{i}.zip"
+        volume_path.write_bytes(b"data")
+        volume_paths.append(str(volume_path))
+
+    attempts = []
+
+    def add_attachment(issue, attachment, filename):
+        attempts.append(filename)
+        if filename.endswith("part02.zip") and attempts.count(filename) == 1:
+            raise JIRAError(status_code=500, text="temporary failure")
+
+    mock_jira = MagicMock()
+    mock_jira.add_attachment.side_effect = add_attachment
+
+    result = upload_file_to_jira(mock_jira, volume_paths, "TICKET-123")
+
+    assert result["status"] == "success"
+    assert attempts.count("TICKET-123.part01.zip") == 1
+    assert attempts.count("TICKET-123.part02.zip") == 2
+    mock_jira.add_comment.assert_called_once()
+
+
+# volumes attached before another volume failed are removed again
+@patch("app.routers.data_extraction.JIRA_UPLOAD_RETRIES", 1)
+@patch("app.routers.data_extraction.send_slack_message")
+def test_upload_file_to_jira_removes_partial_upload(mock_slack, tmp_path):
+    volume_paths = []
+    for i in range(1, 3):
+        volume_path = tmp_path / f"TICKET-123.part0{i}.zip"
+        volume_path.write_bytes(b"data")
+        volume_paths.append(str(volume_path))
+
+    def add_attachment(issue, attachment, filename):
+        if filename.endswith("part02.zip"):
+            raise JIRAError(status_code=500, text="failure")
+        return MagicMock(id="10001", filename=filename)
+
+    mock_jira = MagicMock()
+    mock_jira.add_attachment.side_effect = add_attachment
+
+    result = upload_file_to_jira(mock_jira, volume_paths, "TICKET-123")
+
+    assert result["status"] == "error"
+    mock_jira.delete_attachment.assert_called_once_with("10001")
+    mock_jira.add_comment.assert_not_called()
+
+
+# failed upload neither shares the password nor writes audit rows
+@patch("app.routers.data_extraction.release_job_scratch")
+@patch("app.routers.data_extraction.save_log_to_mysql")
+@patch("app.routers.data_extraction.send_slack_message")
+@patch("app.routers.data_extraction.clear_checkpoints")
+@patch("app.routers.data_extraction.upload_file_to_jira")
+@patch("app.routers.data_extraction.encrypt_and_compress_volumes")
+@patch("app.routers.data_extraction.extract_attachment_files")
+@patch("app.routers.data_extraction.allocate_job_scratch")
+def test_deliver_ticket_upload_failed(
+    mock_allocate,
+    mock_extract,
+    mock_compress,
+    mock_upload,
+    mock_clear,
+    mock_slack,
+    mock_save_log,
+    mock_release,
+    tmp_path,
+):
+    async def allocate(*args):
+        return str(tmp_path), "volume"
+
+    (tmp_path / "users.csv").write_text("username\na\n")
+    mock_allocate.side_effect = allocate
+    mock_compress.return_value = ([str(tmp_path / "DATA-1.zip")], b"s3cret")
+    mock_upload.return_value = {"status": "error", "details": "Failed to attach"}
+    lock_lost = MagicMock()
+    lock_lost.is_set.return_value = False
+
+    status = asyncio.run(
+        deliver_ticket(
+            MagicMock(),
+            "DATA-1",
+            [str(tmp_path / "users.csv")],
+            "user@example.com",
+            1024,
+            "job",
+            lock_lost,
+            MagicMock(),
+        )
+    )
+
+    assert status == "failed"
+    assert "s3cret" not in mock_slack.call_args.args[1]
+    mock_save_log.assert_not_called()
+    mock_clear.assert_not_called()
+    mock_release.assert_called_once_with("volume", "job")
+
+
+# bulk approval checks admin once and sends one slack summary
+@patch("app.routers.data_extraction.send_slack_message")
+@patch("app.routers.data_extraction.get_jira_object")
+@patch("app.routers.data_extraction.is_jira_admin")
+@patch("app.routers.data_extraction.get_email_jira_token_value")
+def test_bulk_approve_pii_jira_tickets(
+    mock_get_email_token, mock_is_admin, mock_get_jira, mock_slack
+):
+    mock_get_email_token.return_value = ("admin@example.com", "fake_token")
+    mock_is_admin.return_value = True
+
+    def get_issue(ticket_id):
+        issue = MagicMock()
+        pii_value = "N" if ticket_id == "TEST-3" else "Y"
+        issue.raw = {"fields": {"customfield_10071": {"value": pii_value}}}
+        return issue
+
+    mock_jira = MagicMock()
+    mock_jira.issue.side_effect = get_issue
+    mock_jira.transitions.return_value = [
+        {"id": "31", "name": "Approve Data Extraction Request"}
+    ]
+    mock_get_jira.return_value = mock_jira
+
+    response = client.post(
+        "/approve",
+        json={"ticket_ids": ["TEST-1", "TEST-2", "TEST-3", "TEST-1"]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["approved"] == 2
+    assert [r["status"] for r in body["results"]] == ["approved", "approved", "skipped"]
+    mock_is_admin.assert_called_once()
+    assert mock_jira.transition_issue.call_count == 2
+    mock_slack.assert_called_once()
+
+
+@patch("app.routers.data_extraction.run_extraction")
+@patch("app.routers.data_extraction.get_jira_object")
+@patch("app.routers.data_extraction.is_jira_admin")
+@patch("app.routers.data_extraction.get_email_jira_token_value")
+def test_get_data_from_query_profile_admin_only(
+    mock_get_email_token, mock_is_admin, mock_get_jira, mock_run, tmp_path
+):
+    mock_get_email_token.return_value = ("analyst@example.com", "fake_token")
+    mock_is_admin.return_value = False
+    client.cookies.set("session_id", "fake_session")
+
+    response = client.post("/extract/TEST-1?profile=true")
+
+    assert response.status_code == 403
+    mock_run.assert_not_called()
+
+    # admins get the id of the saved profile back
+    mock_is_admin.return_value = True
+
+    async def run_profiled_stage(*args):
+        await asyncio.to_thread(profiled(sum), [1, 2])
+
+    mock_run.side_effect = run_profiled_stage
+    with patch("app.core.profiler.PROFILE_PATH", str(tmp_path)):
+        response = client.post("/extract/TEST-1", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+    assert (tmp_path / f"{profile_id}.prof").exists()
+    client.cookies.clear()
+
+
+# username, email and user_id headers map onto users table columns
+def test_normalize_user_id_column_identifiers():
+    df = pd.DataFrame({"User Name": ["a"], "E-mail": ["a@x.com"], "Age": [20]})
+    normalized_df = normalize_user_id_column(df)
+    assert list(normalized_df.columns) == ["username", "email", "age"]
+
+
+# mixed-identifier chunk is split and looked up by the matching column
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_merge_chunk_with_pii_mixed_identifiers(mock_fetch):
+    users = pd.DataFrame(
+        {
+            "user_id": ["1", "2"],
+            "username": ["alice", "bob"],
+            "email": ["alice@x.com", "bob@x.com"],
+            "gender": ["F", "M"],
+        }
+    )
+
+    def fetch(values, conn, key_type):
+        db_df = users[users[key_type].isin(values)].copy()
+        db_df["_lookup_key"] = db_df[key_type]
+        return db_df[["_lookup_key", "username", "email", "gender"]]
+
+    mock_fetch.side_effect = fetch
+    chunk_file_df = pd.DataFrame({"user_id": ["1", "Bob@x.com", "alice", "3"]})
+
+    merged_df = merge_chunk_with_pii(chunk_file_df, "user_id", None)
+
+    assert sorted(call.args[2] for call in mock_fetch.call_args_list) == [
+        "email",
+        "user_id",
+        "username",
+    ]
+    assert merged_df["user_id"].tolist() == ["1", "Bob@x.com", "alice", "3"]
+    assert merged_df["username"].tolist()[:3] == ["alice", "bob", "alice"]
+    assert pd.isna(merged_df["username"].iloc[3])
+
+
+# pii columns are attached in chunk order with compact dtypes
+def test_join_pii_columns_compact_dtypes():
+    chunk_file_df = pd.DataFrame(
+        {"username": ["bob", "carol", "alice"]}, index=[10, 11, 12]
+    ).astype("string[pyarrow]")
+    db_data = pd.DataFrame(
+        {
+            "_lookup_key": ["alice", "bob"],
+            "username": ["alice", "bob"],
+            "email": ["alice@x.com", "bob@x.com"],
+            "gender": ["F", "M"],
+        }
+    ).astype("string[pyarrow]")
+
+    merged_df = join_pii_columns(
+        chunk_file_df, chunk_file_df["username"], db_data, "username"
+    )
+
+    assert list(merged_df.columns) == ["username", "email", "gender"]
+    assert merged_df["email"].tolist()[::2] == ["bob@x.com", "alice@x.com"]
+    assert pd.isna(merged_df["email"].iloc[1])
+    assert merged_df["email"].dtype == "string[pyarrow]"
+    assert merged_df["gender"].dtype == "category"
+    assert merged_df["gender"].tolist()[::2] == ["M", "F"]
+
+
+# ids stay as written when blank cells would turn the column into floats
+def test_read_attachment_file_keeps_ids_as_strings(tmp_path):
+    file_path = tmp_path / "users.csv"
+    file_path.write_text("user_id,reason\n1,a\n,b\n3,c\n")
+
+    file_df = read_attachment_file(str(file_path))
+
+    assert file_df["user_id"].dropna().tolist() == ["1", "3"]
+    assert file_df["user_id"].dtype == "string[pyarrow]"
+
+
+# prefetched rows are reused, only keys missing from the batch lookup hit the db
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_lookup_users_uses_prefetched_rows(mock_fetch):
+    rows = pd.DataFrame({"_lookup_key": ["alice", "bob"], "gender": ["F", "M"]})
+    prefetched_users = {
+        "username": {"keys": pd.Series(["alice", "bob", "carol"]), "rows": rows}
+    }
+    mock_fetch.return_value = pd.DataFrame({"_lookup_key": ["dave"], "gender": ["M"]})
+
+    db_df = lookup_users(["bob", "carol", "dave"], None, "username", prefetched_users)
+
+    mock_fetch.assert_called_once_with(["dave"], None, "username")
+    assert db_df["_lookup_key"].tolist() == ["bob", "dave"]
+
+
+# keys fetched for an earlier chunk of the attachment are not queried again
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_lookup_users_reuses_resolved_rows(mock_fetch):
+    mock_fetch.side_effect = lambda keys, conn, key_type: pd.DataFrame(
+        {"_lookup_key": [key for key in keys if key != "carol"]}
+    ).astype("string[pyarrow]")
+    resolved_users = {}
+
+    lookup_users(["alice", "carol"], None, "username", None, resolved_users)
+    db_df = lookup_users(
+        ["alice", "bob", "carol"], None, "username", None, resolved_users
+    )
+
+    assert mock_fetch.call_args_list[1].args[0] == ["bob"]
+    assert sorted(db_df["_lookup_key"].tolist()) == ["alice", "bob"]
+
+
+# user_id keys with leading zeros are joined with the db value
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_merge_chunk_with_pii_leading_zero_user_ids(mock_fetch):
+    mock_fetch.return_value = pd.DataFrame(
+        {"_lookup_key": ["123"], "gender": ["F"]}
+    ).astype("string[pyarrow]")
+    chunk_file_df = pd.DataFrame({"user_id": ["00123"]})
+
+    merged_df = merge_chunk_with_pii(chunk_file_df, "user_id", None)
+
+    mock_fetch.assert_called_once_with(["123"], None, "user_id")
+    assert merged_df["gender"].tolist() == ["F"]
+
+
+# batch lookup splits the unique keys into queries of the lookup size
+@patch("app.routers.data_extraction.EXTRACTION_BATCH_LOOKUP_SIZE", 2)
+@patch("app.routers.data_extraction.try_reserve_memory", return_value=True)
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_prefetch_users_batches_queries(mock_fetch, mock_reserve):
+    mock_fetch.side_effect = lambda keys, conn, key_type: pd.DataFrame(
+        {"_lookup_key": keys}
+    )
+
+    prefetched_users = prefetch_users(
+        {"username": pd.Series(["a", "b", "c"])}, None, "batch:1:prefetch"
+    )
+
+    assert [call.args[0] for call in mock_fetch.call_args_list] == [["a", "b"], ["c"]]
+    assert prefetched_users["username"]["rows"]["_lookup_key"].tolist() == [
+        "a",
+        "b",
+        "c",
+    ]
+
+
+# prefetch stops before querying when the memory budget has no room for the rows
+@patch("app.routers.data_extraction.release_memory")
+@patch("app.routers.data_extraction.try_reserve_memory", return_value=False)
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_prefetch_users_falls_back_without_memory(
+    mock_fetch, mock_reserve, mock_release
+):
+    prefetched_users = prefetch_users(
+        {"username": pd.Series(["a", "b"])}, None, "batch:1:prefetch"
+    )
+
+    assert prefetched_users is None
+    mock_fetch.assert_not_called()
+    mock_release.assert_called_once_with("batch:1:prefetch")
+
+
+# implausible identifiers are rejected with a reason, duplicates after cleaning
+# are reported but kept, as their other columns may differ
+def test_validate_identifiers_rejects_and_reports_duplicates():
+    df = pd.DataFrame(
+        {
+            "username": [" Alice\u00a0", "alice", "2e10", None, "x" * 51],
+            "reason": ["a", "b", "c", "d", "e"],
+        },
+        # a blank line skipped by the reader after the first row
+        index=[0, 2, 3, 4, 5],
+    )
+
+    valid_df, rejects_df = validate_identifiers(df, "username")
+
+    assert valid_df["username"].tolist() == ["Alice", "alice", "2e10"]
+    assert valid_df["reason"].tolist() == ["a", "b", "c"]
+    assert rejects_df["row"].tolist() == [4, 6, 7]
+    assert rejects_df["reason"].tolist() == ["duplicate", "blank", "too_long"]
+    assert rejects_df["kept"].tolist() == [True, False, False]
+
+
+# user_ids are compared without leading zeros, scientific notation is an excel
+# artifact only in user_id columns
+def test_validate_identifiers_user_ids():
+    df = pd.DataFrame(
+        {"user_id": ["00123", "123", "1.23457E+11", "0009223372036854775807"]}
+    )
+
+    valid_df, rejects_df = validate_identifiers(df, "user_id")
+
+    assert valid_df["user_id"].tolist() == ["00123", "123", "0009223372036854775807"]
+    assert rejects_df["reason"].tolist() == ["duplicate", "excel_scientific_notation"]
+
+
+# rejects report is written next to the extracted csv, so it ends up in the archive;
+# the attachment is streamed in batches, duplicates are found across batches
+@patch("app.routers.data_extraction.CHUNK_SIZE", 2)
+@patch("app.routers.data_extraction.store_result")
+@patch("app.routers.data_extraction.get_cached_result", return_value=None)
+@patch("app.routers.data_extraction.extract_file_in_chunks")
+def test_extract_attachment_file_writes_rejects_report(
+    mock_extract, mock_cached, mock_store, tmp_path
+):
+    (tmp_path / "10001").mkdir()
+    attachment = tmp_path / "10001" / "users.csv"
+    attachment.write_text("User ID\n1\n\n1.0\n12.5\n")
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    batches = []
+    mock_extract.side_effect = lambda file_batches, *args, **kwargs: batches.extend(
+        file_batches
+    )
+
+    extract_attachment_file(str(attachment), None, "DATA-1", str(output_dir), 1024)
+
+    assert [batch["user_id"].tolist() for batch in batches] == [["1"], ["1", "12.5"]]
+    # output and checkpoint are keyed by attachment id, checkpoint by content too
+    assert mock_extract.call_args.args[3] == "10001"
+    assert mock_extract.call_args.args[4] == f"{output_dir}/users_10001.csv"
+    assert (
+        mock_extract.call_args.kwargs["checksum"]
+        == hashlib.sha256(attachment.read_bytes()).hexdigest()
+    )
+    rejects_df = pd.read_csv(output_dir / "users_10001_rejects.csv")
+    assert rejects_df[["row", "reason", "kept"]].values.tolist() == [
+        [4, "duplicate", True]
+    ]
+
+
+# row count is projected from the sampled lines, match rate from a sampled lookup
+@patch("app.routers.data_extraction.ESTIMATE_SAMPLE_ROWS", 10)
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+def test_estimate_attachment_from_sample(mock_fetch, tmp_path):
+    attachment = tmp_path / "users.csv"
+    attachment.write_text("username\n" + "".join(f"user{i:03d}\n" for i in range(100)))
+    # half of the sampled users exist
+    mock_fetch.side_effect = lambda keys, conn, key_type: pd.DataFrame(
+        {"_lookup_key": keys[::2], "gender": ["F"] * len(keys[::2])}
+    )
+
+    estimate = estimate_attachment(str(attachment), None)
+
+    assert estimate["estimated_rows"] == 100
+    assert estimate["sampled_rows"] == 10
+    assert estimate["valid_rate"] == 1.0
+    assert estimate["match_rate"] == 0.5
+    assert estimate["projected_output_rows"] == 100
+    assert estimate["projected_output_bytes"] > 0
+
+    # only the head of the attachment is on disk, jira reports its full size
+    head = tmp_path / "head.csv"
+    head.write_bytes(attachment.read_bytes()[: len("username\n") + 20 * 8])
+    estimate = estimate_attachment(str(head), None, attachment.stat().st_size)
+    assert estimate["estimated_rows"] == 100
+    assert estimate["size_bytes"] == attachment.stat().st_size
+
+
+# estimate streams only the head of a csv into a private dir, sized by jira metadata
+@patch("app.routers.data_extraction.ESTIMATE_SAMPLE_BYTES", 50)
+@patch("app.routers.data_extraction.ESTIMATE_MAX_EXCEL_BYTES", 1000)
+@patch("app.routers.data_extraction.get_recorded_throughput", return_value=None)
+@patch("app.routers.data_extraction.get_read_connection")
+@patch("app.routers.data_extraction.estimate_attachment")
+def test_estimate_attachments_reads_sample(
+    mock_estimate, mock_conn, mock_throughput, tmp_path
+):
+    content = b"username\n" + b"".join(b"user%04d\n" % i for i in range(1000))
+    blocks = iter([content[:30], content[30:]])
+    attachment = MagicMock(id="10001", filename="users.csv", size=len(content))
+    attachment.iter_content.side_effect = lambda chunk_size: blocks
+    workbook = MagicMock(id="10002", filename="users.xlsx", size=5000)
+    samples = {}
+
+    def estimate(file, conn, size_bytes):
+        samples[file] = open(file, "rb").read()
+        return {
+            "file": os.path.basename(file),
+            "estimated_rows": 1000,
+            "projected_output_rows": 1000,
+            "projected_output_bytes": 9000,
+            "match_rate": 1.0,
+        }
+
+    mock_estimate.side_effect = estimate
+
+    with patch("app.core.attachment_store.SCRATCH_PATH", str(tmp_path)):
+        result = estimate_attachments([attachment, workbook])
+
+    [(sample_file, sample)] = samples.items()
+    # only complete lines of the first 50 bytes were fetched
+    assert sample == content[: content.rfind(b"\n", 0, 50) + 1]
+    assert mock_estimate.call_args.args[2] == len(content)
+    assert not os.path.exists(sample_file)
+    assert os.listdir(tmp_path) == []
+    workbook.iter_content.assert_not_called()
+    assert "too large" in result["files"][1]["error"]
+    assert result["estimated_rows"] == 1000
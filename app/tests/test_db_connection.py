@@ -0,0 +1,67 @@
+# app/tests/test_db_connection.py
+import itertools
+from unittest.mock import MagicMock, patch
+
+from app.core import db_connection
+from app.core.db_connection import get_read_connection, is_replica_healthy
+
+REPLICAS = ["replica-1:3306", "replica-2:3306"]
+
+
+# mysql connection stand-in returning given replica status
+def make_connection(status):
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = status
+    return conn
+
+
+# read connections are spread round-robin across healthy replicas
+@patch("app.core.db_connection.is_replica_healthy", return_value=True)
+@patch("app.core.db_connection.get_pooled_connection")
+def test_get_read_connection_round_robin(mock_pooled, mock_healthy):
+    with (
+        patch("app.core.db_connection.MYSQL_REPLICA_HOSTS", REPLICAS),
+        patch("app.core.db_connection.replica_cycle", itertools.cycle(REPLICAS)),
+    ):
+        for _ in range(4):
+            get_read_connection()
+
+    hosts = [call.args[0] for call in mock_pooled.call_args_list]
+    assert hosts == REPLICAS * 2
+
+
+# primary is used when every replica is lagging
+@patch("app.core.db_connection.is_replica_healthy", return_value=False)
+@patch("app.core.db_connection.get_db_connection")
+@patch("app.core.db_connection.get_pooled_connection")
+def test_get_read_connection_falls_back_to_primary(
+    mock_pooled, mock_primary, mock_healthy
+):
+    with (
+        patch("app.core.db_connection.MYSQL_REPLICA_HOSTS", REPLICAS),
+        patch("app.core.db_connection.replica_cycle", itertools.cycle(REPLICAS)),
+    ):
+        get_read_connection()
+
+    mock_pooled.assert_not_called()
+    mock_primary.assert_called_once()
+
+
+# replica lag is compared with MYSQL_REPLICA_MAX_LAG_SECONDS
+@patch("app.core.db_connection.MYSQL_REPLICA_MAX_LAG_SECONDS", 30)
+@patch("app.core.db_connection.get_pooled_connection")
+def test_is_replica_healthy_lag(mock_pooled):
+    db_connection.replica_health.clear()
+    mock_pooled.side_effect = [
+        make_connection({"Seconds_Behind_Source": 5}),
+        make_connection({"Seconds_Behind_Source": 120}),
+        make_connection(None),
+    ]
+
+    assert is_replica_healthy("replica-1:3306") is True
+    assert is_replica_healthy("replica-2:3306") is False
+    assert is_replica_healthy("stand-in:3306") is True
+    # result is cached until next lag check
+    assert is_replica_healthy("replica-2:3306") is False
+    assert mock_pooled.call_count == 3
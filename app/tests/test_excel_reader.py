@@ -0,0 +1,56 @@
+# app/tests/test_excel_reader.py
+import pandas as pd
+from openpyxl import Workbook
+
+from app.core.excel_reader import iter_excel_batches, read_excel_file
+
+
+# create xlsx file with username list
+def create_workbook(file_path, num_rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["User ID", "reason"])
+    for i in range(num_rows):
+        sheet.append([f"user{i}", "campaign"])
+    sheet.append([None, None])  # blank row
+    workbook.save(file_path)
+
+
+# rows are streamed in batches of batch_size
+def test_iter_excel_batches(tmp_path):
+    file_path = tmp_path / "users.xlsx"
+    create_workbook(file_path, 5)
+
+    batches = list(iter_excel_batches(str(file_path), batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert list(batches[0].columns) == ["User ID", "reason"]
+    assert batches[1].index.tolist() == [2, 3]
+
+
+# skipped blank rows keep the sheet row numbers of the rows after them
+def test_iter_excel_batches_index_follows_sheet_rows(tmp_path):
+    file_path = tmp_path / "users.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["User ID"])
+    sheet.append(["user0"])
+    sheet.append([None])
+    sheet.append(["user1"])
+    workbook.save(file_path)
+
+    (batch,) = iter_excel_batches(str(file_path))
+
+    # sheet rows 2 and 4
+    assert batch.index.tolist() == [0, 2]
+
+
+# streaming reader returns same data as pandas read_excel
+def test_read_excel_file_matches_pandas(tmp_path):
+    file_path = tmp_path / "users.xlsx"
+    create_workbook(file_path, 3)
+
+    expected_df = pd.read_excel(file_path).dropna(how="all")
+    result_df = read_excel_file(str(file_path))
+
+    pd.testing.assert_frame_equal(result_df, expected_df)
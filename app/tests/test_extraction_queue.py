@@ -0,0 +1,70 @@
+# app/tests/test_extraction_queue.py
+from unittest.mock import MagicMock, create_autospec, patch
+
+from redis import Redis
+
+from app.core.extraction_queue import dequeue_extraction_batch, get_approved_tickets
+
+
+# redis mock with the signatures of the real client, so wrong calls raise
+def make_redis():
+    return create_autospec(Redis, instance=True)
+
+
+# first ticket is waited for, tickets queued behind it are drained with LPOP
+def test_dequeue_extraction_batch_drains_queue():
+    mock_redis = make_redis()
+    mock_redis.blpop.return_value = ("extraction:queue", "DATA-1")
+    mock_redis.lpop.return_value = ["DATA-2", "DATA-3"]
+
+    with patch("app.core.extraction_queue.redis_client", mock_redis):
+        ticket_keys = dequeue_extraction_batch(max_tickets=5)
+
+    assert ticket_keys == ["DATA-1", "DATA-2", "DATA-3"]
+    mock_redis.lpop.assert_called_once_with("extraction:queue", 4)
+
+
+# empty queue returns no tickets and does not drain
+def test_dequeue_extraction_batch_empty_queue():
+    mock_redis = make_redis()
+    mock_redis.blpop.return_value = None
+
+    with patch("app.core.extraction_queue.redis_client", mock_redis):
+        assert dequeue_extraction_batch() == []
+
+    mock_redis.lpop.assert_not_called()
+
+
+# jira issue with the given status and PII_YN value
+def make_issue(status, pii_value):
+    issue = MagicMock()
+    issue.raw = {
+        "fields": {
+            "status": {"name": status},
+            "customfield_10071": {"value": pii_value} if pii_value else None,
+        }
+    }
+    return issue
+
+
+# only tickets jira reports as approved pii requests are extracted
+def test_get_approved_tickets():
+    issues = {
+        "DATA-1": make_issue("Request Approved", "Y"),
+        "DATA-2": make_issue("To Do", "Y"),
+        "DATA-3": make_issue("Request Approved", "N"),
+        "DATA-4": make_issue("Request Approved", None),
+    }
+
+    # unknown tickets fail like a jira 404
+    def get_issue(ticket_key, fields):
+        return issues[ticket_key]
+
+    jira = MagicMock()
+    jira.issue.side_effect = get_issue
+
+    approved = get_approved_tickets(
+        jira, ["DATA-1", "DATA-2", "DATA-3", "DATA-4", "DATA-5"]
+    )
+
+    assert approved == ["DATA-1"]
@@ -0,0 +1,96 @@
+# app/tests/test_jira_rate_limiter.py
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from app.core.jira_rate_limiter import (
+    BLOCKED_KEY,
+    JiraRateLimitAdapter,
+    acquire_jira_slot,
+)
+
+
+# create Mock object for jira response
+def make_response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+# create prepared request sent by jira client
+def make_request():
+    return requests.Request(
+        "GET", "https://jira.example.com/rest/api/3/myself"
+    ).prepare()
+
+
+# all workers wait while the shared bucket is empty
+@patch("app.core.jira_rate_limiter.time.sleep")
+@patch("app.core.jira_rate_limiter.acquire_script")
+def test_acquire_jira_slot_waits_for_token(mock_acquire, mock_sleep):
+    mock_acquire.side_effect = ["0.5", "0"]
+
+    assert acquire_jira_slot()
+    mock_sleep.assert_called_once_with(0.5)
+
+
+# throttled request is retried after Retry-After and concurrency is halved
+@patch("app.core.jira_rate_limiter.redis_client")
+@patch("app.core.jira_rate_limiter.adjust_script")
+@patch("app.core.jira_rate_limiter.acquire_script", return_value="0")
+@patch("requests.adapters.HTTPAdapter.send")
+def test_adapter_retries_after_retry_after(
+    mock_send, mock_acquire, mock_adjust, mock_redis
+):
+    mock_send.side_effect = [
+        make_response(429, {"Retry-After": "2"}),
+        make_response(200),
+    ]
+    mock_adjust.return_value = "8"
+
+    response = JiraRateLimitAdapter().send(make_request())
+
+    assert response.status_code == 200
+    assert mock_send.call_count == 2
+    mock_redis.set.assert_called_once_with(BLOCKED_KEY, 1, px=2000)
+    assert [c.kwargs["args"][0] for c in mock_adjust.call_args_list] == [
+        "decrease",
+        "increase",
+    ]
+
+
+# streamed upload body is not sent twice, caller retries with a fresh stream
+@patch("app.core.jira_rate_limiter.redis_client")
+@patch("app.core.jira_rate_limiter.adjust_script", return_value="8")
+@patch("app.core.jira_rate_limiter.acquire_script", return_value="0")
+@patch("requests.adapters.HTTPAdapter.send")
+def test_adapter_returns_throttled_stream(
+    mock_send, mock_acquire, mock_adjust, mock_redis
+):
+    mock_send.return_value = make_response(429)
+    request = make_request()
+    request.body = MagicMock()
+
+    response = JiraRateLimitAdapter().send(request)
+
+    assert response.status_code == 429
+    assert mock_send.call_count == 1
+    mock_redis.set.assert_called_once_with(BLOCKED_KEY, 1, px=5000)
+
+
+# the server info request of a new jira client goes through the rate limiter
+@patch("app.core.jira_rate_limiter.JiraRateLimitAdapter.send")
+def test_connect_jira_server_info_is_rate_limited(mock_send):
+    from app.routers.data_extraction import connect_jira
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'{"versionNumbers": [1001, 0, 0], "deploymentType": "Cloud"}'
+    mock_send.return_value = response
+
+    jira = connect_jira("analyst@example.com", "fake_token")
+
+    mock_send.assert_called_once()
+    assert mock_send.call_args.args[0].url.endswith("/serverInfo")
+    assert jira.deploymentType == "Cloud"
@@ -0,0 +1,46 @@
+# app/tests/test_locks.py
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from redis.exceptions import LockNotOwnedError
+
+from app.core.locks import TicketLockedError, renew_lease, ticket_lock
+
+
+# second worker cannot extract a ticket that is already locked
+@patch("app.core.locks.redis_client")
+def test_ticket_lock_already_held(mock_redis):
+    mock_redis.lock.return_value.acquire.return_value = False
+
+    with pytest.raises(TicketLockedError):
+        with ticket_lock("TEST-1"):
+            pass
+
+
+# lock is released after the extraction, even if it fails
+@patch("app.core.locks.redis_client")
+def test_ticket_lock_released_on_error(mock_redis):
+    lock = mock_redis.lock.return_value
+    lock.acquire.return_value = True
+
+    with pytest.raises(ValueError):
+        with ticket_lock("TEST-1") as lock_lost:
+            assert not lock_lost.is_set()
+            raise ValueError("extraction failed")
+
+    lock.release.assert_called_once()
+    assert mock_redis.lock.call_args.args[0] == "extraction:lock:TEST-1"
+
+
+# lost lease is flagged so the owner does not upload a second copy
+@patch("app.core.locks.TICKET_LOCK_RENEW_SECONDS", 0)
+def test_renew_lease_flags_lost_lock():
+    lock = MagicMock()
+    lock.reacquire.side_effect = LockNotOwnedError("expired")
+    stop = threading.Event()
+    lost = threading.Event()
+
+    renew_lease(lock, "TEST-1", stop, lost)
+
+    assert lost.is_set()
@@ -1,4 +1,8 @@
 # import pytest
+import subprocess
+import sys
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from app.main import app  # main.py에 있는 FastAPI 앱 import
 
@@ -17,3 +21,54 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "data-request-automation-app is active"}
+
+
+# readiness returns 503 with per-dependency results when a required check fails
+@patch("app.main.check_readiness")
+def test_readiness_check(mock_check_readiness):
+    checks = {"redis": {"ok": False, "latency_ms": 3.0, "error": "down"}}
+    mock_check_readiness.return_value = {"ready": False, "checks": checks}
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"] == checks
+
+
+# scratch usage needs a session of a jira admin
+@patch("app.main.get_scratch_usage", return_value={"default": {}})
+@patch("app.routers.profiles.is_jira_admin")
+@patch("app.routers.profiles.get_email_jira_token_value")
+@patch("app.core.decorators.redis_client")
+def test_scratch_usage_admin_only(
+    mock_redis, mock_get_email_token, mock_is_admin, mock_usage
+):
+    response = client.get("/scratch/usage", follow_redirects=False)
+    assert response.status_code == 302
+
+    mock_redis.get.return_value = '{"user_email": "user@example.com"}'
+    mock_get_email_token.return_value = ("user@example.com", "token")
+    mock_is_admin.return_value = False
+    client.cookies.set("session_id", "session")
+    try:
+        assert client.get("/scratch/usage").status_code == 403
+
+        mock_is_admin.return_value = True
+        response = client.get("/scratch/usage")
+    finally:
+        client.cookies.clear()
+
+    assert response.json() == {"default": {}}
+
+
+# extraction dependencies are not loaded by workers serving only login or health
+def test_import_does_not_load_extraction_dependencies():
+    script = (
+        "import sys, app.main; "
+        "print([m for m in ('pandas', 'jira', 'pyzipper', 'requests') "
+        "if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,54 @@
+# app/tests/test_memory_budget.py
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.core.memory_budget import get_adaptive_chunk_size, get_bytes_per_row
+from app.routers.data_extraction import extract_file_in_chunks
+
+
+# chunk size shrinks as rows get wider and is clamped to min/max
+@patch("app.core.memory_budget.MIN_CHUNK_SIZE", 10)
+@patch("app.core.memory_budget.MAX_CHUNK_SIZE", 1000)
+@patch("app.core.memory_budget.CHUNK_MEMORY_FACTOR", 4)
+def test_get_adaptive_chunk_size():
+    assert get_adaptive_chunk_size(100, 40000) == 100
+    assert get_adaptive_chunk_size(1000, 40000) == 10
+    assert get_adaptive_chunk_size(1, 40000) == 1000
+    assert get_adaptive_chunk_size(0, 40000) == 1000
+
+
+# bytes per row includes python string objects
+def test_get_bytes_per_row():
+    df = pd.DataFrame({"username": ["a" * 100, "b" * 100]})
+    assert get_bytes_per_row(df) > 100
+    assert get_bytes_per_row(df.iloc[0:0]) == 0
+
+
+# chunks follow measured bytes per row within the job memory budget
+@patch("app.core.memory_budget.MIN_CHUNK_SIZE", 1)
+@patch("app.routers.data_extraction.save_checkpoint")
+@patch("app.routers.data_extraction.fetch_users_by_user_ids")
+@patch("app.core.checkpoint.redis_client")
+def test_extract_file_in_chunks_adapts_chunk_size(
+    mock_redis, mock_fetch, mock_save_checkpoint, tmp_path
+):
+    mock_redis.hget.return_value = None
+    mock_fetch.side_effect = lambda usernames, conn, key_type: pd.DataFrame(
+        {
+            "_lookup_key": usernames,
+            "username": usernames,
+            "email": [f"{u}@x.com" for u in usernames],
+        }
+    )
+    file_df = pd.DataFrame({"username": [f"user{i}" for i in range(100)]})
+    memory_budget = int(get_bytes_per_row(file_df) * 100) + 5000
+
+    extract_file_in_chunks(
+        file_df, None, "TEST-1", "users", str(tmp_path / "users.csv"), memory_budget
+    )
+
+    chunk_sizes = [len(call.args[0]) for call in mock_fetch.call_args_list]
+    assert sum(chunk_sizes) == 100
+    assert max(chunk_sizes) < 100
+    assert len(pd.read_csv(tmp_path / "users.csv")) == 100
@@ -0,0 +1,64 @@
+# app/tests/test_migrations.py
+from unittest.mock import MagicMock
+
+from app.core.migrations import (
+    apply_migrations,
+    find_uncovered_lookups,
+    list_migrations,
+    render_covering_index_sql,
+    split_sql_statements,
+)
+
+
+# mysql connection whose cursor returns the given fetch results
+def make_conn(fetchall_results):
+    cursor = MagicMock()
+    cursor.fetchone.return_value = (1,)
+    cursor.fetchall.side_effect = fetchall_results
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    return conn, cursor
+
+
+# only pending migrations run, in version order, and are recorded
+def test_apply_migrations_runs_pending_in_order(tmp_path):
+    (tmp_path / "0002_second.sql").write_text("-- comment\nSELECT 2;\nSELECT 3;")
+    (tmp_path / "0001_first.sql").write_text("SELECT 1;")
+    (tmp_path / "README.md").write_text("not a migration")
+    first = list_migrations(str(tmp_path))[0]
+    conn, cursor = make_conn([[(1, "first", first["checksum"])], []])
+
+    applied = apply_migrations(conn, str(tmp_path))
+
+    assert applied == ["0002_second"]
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert "SELECT 1" not in statements
+    assert statements.index("SELECT 2") < statements.index("SELECT 3")
+    assert statements[-1] == "SELECT RELEASE_LOCK(%s)"
+    conn.commit.assert_called_once()
+
+
+# shipped migration creates the covering indexes of the configured PII_COLUMNS
+def test_covering_index_migration_matches_pii_columns():
+    shipped_sql = " ".join(
+        " ".join(split_sql_statements(m["sql"])) for m in list_migrations()
+    )
+    for line in render_covering_index_sql().splitlines()[1:-1]:
+        assert line.strip().rstrip(",") in shipped_sql
+
+
+# unique indexes alone do not cover the pii columns
+def test_find_uncovered_lookups():
+    conn, _ = make_conn(
+        [
+            [
+                ("PRIMARY", "user_id"),
+                ("username", "username"),
+                ("idx_users_email_pii", "email"),
+                ("idx_users_email_pii", "username"),
+                ("idx_users_email_pii", "gender"),
+            ]
+        ]
+    )
+
+    assert find_uncovered_lookups(conn) == ["username"]
@@ -0,0 +1,101 @@
+# app/tests/test_profiler.py
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.profiler import (
+    ProfilerBusyError,
+    get_profile_path,
+    is_profiling_requested,
+    profile_block,
+    profiled,
+    prune_profiles,
+    render_profile_text,
+)
+
+
+# header and query flag both turn profiling on, anything else leaves it off
+def test_is_profiling_requested():
+    request = MagicMock()
+    request.headers = {"X-Profile": "true"}
+    request.query_params = {}
+    assert is_profiling_requested(request)
+
+    request.headers = {}
+    request.query_params = {"profile": "1"}
+    assert is_profiling_requested(request)
+
+    request.query_params = {"profile": "no"}
+    assert not is_profiling_requested(request)
+
+
+def extraction_stage():
+    return sum(range(1000))
+
+
+# profile is saved even when the block fails, and only one runs at a time
+def test_profile_block(tmp_path):
+    with patch("app.core.profiler.PROFILE_PATH", str(tmp_path)):
+        with pytest.raises(ValueError):
+            with profile_block("DATA-1") as profile:
+                with pytest.raises(ProfilerBusyError):
+                    with profile_block("DATA-2"):
+                        pass
+                profiled(extraction_stage)()
+                raise ValueError("extraction failed")
+
+        assert os.path.isfile(get_profile_path(profile["profile_id"]))
+        assert "function calls" in render_profile_text(profile["profile_id"])
+
+        # no profile is saved when no stage ran
+        with profile_block("DATA-3") as profile:
+            pass
+        assert "profile_id" not in profile
+
+
+# stages run by asyncio.to_thread are profiled in their worker thread
+def test_profiled_stage_runs_in_worker_thread(tmp_path):
+    async def run():
+        with profile_block("DATA-1") as profile:
+            result = await asyncio.to_thread(profiled(extraction_stage))
+        return profile, result
+
+    with patch("app.core.profiler.PROFILE_PATH", str(tmp_path)):
+        profile, result = asyncio.run(run())
+        text = render_profile_text(profile["profile_id"])
+
+    assert result == 499500
+    assert "extraction_stage" in text
+
+
+# outside a profiled request the wrapper only calls the stage
+def test_profiled_without_profile_block():
+    assert profiled(extraction_stage)() == 499500
+
+
+# stale profiles and profiles above the file limit are deleted, newest kept
+@patch("app.core.profiler.PROFILE_MAX_FILES", 1)
+def test_prune_profiles(tmp_path):
+    now = time.time()
+    with patch("app.core.profiler.PROFILE_PATH", str(tmp_path)):
+        for profile_id, age in [
+            ("1_DATA-1_0000000a", 10),
+            ("2_DATA-2_0000000b", 0),
+            ("3_DATA-3_0000000c", 30 * 24 * 3600),
+        ]:
+            path = get_profile_path(profile_id)
+            open(path, "wb").close()
+            os.utime(path, (now - age, now - age))
+
+        prune_profiles()
+
+    assert os.listdir(tmp_path) == ["2_DATA-2_0000000b.prof"]
+
+
+# ids are checked so downloads cannot escape the profile dir
+def test_get_profile_path_rejects_traversal():
+    with pytest.raises(ValueError):
+        get_profile_path("../../etc/passwd")
@@ -0,0 +1,65 @@
+# app/tests/test_progress.py
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.progress import ProgressReporter, stream_progress
+
+
+# events carry rows, throughput and eta, and go to both the latest key and channel
+@patch("app.core.progress.time.monotonic")
+@patch("app.core.progress.redis_client")
+def test_progress_reporter_publish(mock_redis, mock_monotonic):
+    pipe = mock_redis.pipeline.return_value
+    mock_monotonic.return_value = 100.0
+    progress = ProgressReporter("TEST-1", "job1")
+
+    # 1000 rows restored from a checkpoint, 2000 more processed in 2 seconds
+    progress.start_file("users", 10000, rows_done=1000)
+    mock_monotonic.return_value = 102.0
+    progress.update_rows(3000)
+
+    event = json.loads(pipe.publish.call_args.args[1])
+    assert pipe.publish.call_args.args[0] == "extraction:progress:events:TEST-1"
+    assert pipe.set.call_args.args[0] == "extraction:progress:TEST-1"
+    assert event["stage"] == "extracting"
+    assert event["rows_done"] == 3000
+    assert event["rows_per_second"] == 1000
+    assert event["eta_seconds"] == 7
+
+
+# redis errors are logged, the extraction keeps running
+@patch("app.core.progress.redis_client")
+def test_progress_reporter_publish_failure(mock_redis):
+    mock_redis.pipeline.return_value.execute.side_effect = ConnectionError("down")
+
+    ProgressReporter("TEST-1", "job1").set_stage("compressing")
+
+
+# stream starts from the running job's latest event and ends on its final event
+@patch("app.core.progress.create_async_redis_client")
+def test_stream_progress(mock_create_client):
+    latest = json.dumps({"stage": "extracting", "rows_done": 10})
+    final = json.dumps({"stage": "done"})
+    client = MagicMock()
+    client.get = AsyncMock(return_value=latest)
+    client.aclose = AsyncMock()
+    pubsub = client.pubsub.return_value
+    pubsub.subscribe = AsyncMock()
+    pubsub.aclose = AsyncMock()
+    pubsub.get_message = AsyncMock(side_effect=[None, {"data": final}])
+    mock_create_client.return_value = client
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+
+    async def collect():
+        return [event async for event in stream_progress("TEST-1", request)]
+
+    events = asyncio.run(collect())
+
+    assert events == [
+        f"event: progress\ndata: {latest}\n\n",
+        f"event: progress\ndata: {final}\n\n",
+    ]
+    pubsub.subscribe.assert_awaited_once_with("extraction:progress:events:TEST-1")
+    client.aclose.assert_awaited_once()
@@ -0,0 +1,86 @@
+# app/tests/test_readiness.py
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import readiness
+from app.core.readiness import check_readiness, warm_up
+
+
+@pytest.fixture(autouse=True)
+def reset_readiness():
+    readiness.readiness_cache.update(checked_at=0.0, result=None)
+    readiness.warm_up_done.set()
+    yield
+    readiness.readiness_cache.update(checked_at=0.0, result=None)
+    readiness.warm_up_done.clear()
+
+
+def fake_probes(jira_probe=None, mysql_probe=None):
+    return {
+        "redis": MagicMock(),
+        "mysql": mysql_probe or MagicMock(),
+        "jira": jira_probe or MagicMock(),
+    }
+
+
+# dependencies are probed once per cache window
+def test_check_readiness_cached():
+    probes = fake_probes()
+    with patch.dict(readiness.PROBES, probes):
+        first = check_readiness()
+        second = check_readiness()
+
+    assert first is second
+    assert first["ready"]
+    assert set(first["checks"]) == {"redis", "mysql", "jira"}
+    probes["redis"].assert_called_once()
+
+
+# required checks decide readiness, jira failures are only reported
+def test_check_readiness_required_checks():
+    probes = fake_probes(jira_probe=MagicMock(side_effect=ConnectionError("down")))
+    with patch.dict(readiness.PROBES, probes):
+        result = check_readiness()
+
+    assert result["ready"]
+    assert result["checks"]["jira"] == {
+        "ok": False,
+        "latency_ms": result["checks"]["jira"]["latency_ms"],
+        "error": "down",
+    }
+
+    probes["mysql"].side_effect = ConnectionError("down")
+    with patch.dict(readiness.PROBES, probes):
+        assert not check_readiness(force=True)["ready"]
+
+
+# a hung probe is reported as timed out instead of blocking the endpoint
+@patch("app.core.readiness.READINESS_PROBE_TIMEOUT_SECONDS", 0.05)
+def test_check_readiness_probe_timeout():
+    probes = fake_probes(mysql_probe=MagicMock(side_effect=lambda: time.sleep(0.5)))
+    with patch.dict(readiness.PROBES, probes):
+        result = check_readiness()
+
+    assert not result["ready"]
+    assert result["checks"]["mysql"]["error"] == "timed out"
+
+
+# warm-up compiles every template and opens primary and replica pools
+@patch("app.core.readiness.MYSQL_REPLICA_HOSTS", ["replica-1"])
+@patch("app.core.readiness.get_pooled_connection")
+@patch("app.core.readiness.templates")
+def test_warm_up(mock_templates, mock_get_pooled):
+    readiness.warm_up_done.clear()
+    mock_templates.env.list_templates.return_value = ["login.html", "menu.html"]
+
+    with patch.dict(readiness.PROBES, fake_probes()):
+        warm_up()
+
+    assert mock_templates.env.get_template.call_count == 2
+    assert [c.args[0] for c in mock_get_pooled.call_args_list] == [
+        "127.0.0.1:3306",
+        "replica-1",
+    ]
+    assert readiness.readiness_cache["result"]["ready"]
@@ -0,0 +1,81 @@
+# app/tests/test_result_cache.py
+import json
+import time
+from unittest.mock import patch
+
+from app.core.result_cache import (
+    compute_result_cache_key,
+    evict_results,
+    get_cached_result,
+)
+
+
+# same attachment with different columns must not share a cache entry
+def test_compute_result_cache_key(tmp_path):
+    file_path = tmp_path / "users.csv"
+    file_path.write_text("username\na\n")
+
+    key = compute_result_cache_key(str(file_path), ["username", "email"])
+
+    assert key == compute_result_cache_key(str(file_path), ["username", "email"])
+    assert key != compute_result_cache_key(str(file_path), ["username"])
+
+
+# cache index is kept per host, since the cached files are node-local
+@patch("app.core.result_cache.socket.gethostname", return_value="worker-1")
+@patch("app.core.result_cache.redis_client")
+def test_get_cached_result_reads_host_index(mock_redis, mock_hostname, tmp_path):
+    cached_path = tmp_path / "cached.csv"
+    cached_path.write_text("username\na\n")
+    mock_redis.hget.return_value = json.dumps(
+        {"path": str(cached_path), "size": 12, "created_at": time.time()}
+    )
+
+    assert get_cached_result("key") == str(cached_path)
+    mock_redis.hget.assert_called_once_with("extraction:result_cache:worker-1", "key")
+
+
+# a missing file is a cache miss, the index entry is left in place
+@patch("app.core.result_cache.redis_client")
+def test_get_cached_result_missing_file(mock_redis, tmp_path):
+    mock_redis.hget.return_value = json.dumps(
+        {"path": str(tmp_path / "missing.csv"), "size": 12, "created_at": time.time()}
+    )
+
+    assert get_cached_result("key") is None
+    mock_redis.hdel.assert_not_called()
+
+
+# stale cache entries are dropped instead of reused
+@patch("app.core.result_cache.redis_client")
+def test_get_cached_result_stale(mock_redis, tmp_path):
+    cached_path = tmp_path / "cached.csv"
+    cached_path.write_text("username\na\n")
+    mock_redis.hget.return_value = json.dumps(
+        {"path": str(cached_path), "size": 12, "created_at": 0}
+    )
+
+    assert get_cached_result("key") is None
+    mock_redis.hdel.assert_called_once()
+    assert not cached_path.exists()
+
+
+# oldest entries are evicted when cache exceeds size limit
+@patch("app.core.result_cache.RESULT_CACHE_MAX_BYTES", 10)
+@patch("app.core.result_cache.socket.gethostname", return_value="worker-1")
+@patch("app.core.result_cache.redis_client")
+def test_evict_results_by_size(mock_redis, mock_hostname, tmp_path):
+    now = time.time()
+    mock_redis.hgetall.return_value = {
+        "old": json.dumps(
+            {"path": str(tmp_path / "old.csv"), "size": 8, "created_at": now - 10}
+        ),
+        "new": json.dumps(
+            {"path": str(tmp_path / "new.csv"), "size": 8, "created_at": now}
+        ),
+    }
+
+    evict_results()
+
+    mock_redis.hgetall.assert_called_once_with("extraction:result_cache:worker-1")
+    mock_redis.hdel.assert_called_once_with("extraction:result_cache:worker-1", "old")
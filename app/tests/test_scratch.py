@@ -0,0 +1,107 @@
+# app/tests/test_scratch.py
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+from app.core.scratch import (
+    allocate_job_scratch,
+    collect_scratch_garbage,
+    evict_attachment_dirs,
+    remove_job_scratch,
+    select_scratch_volume,
+)
+
+
+# small jobs go to the fast volume, resumed jobs stay on the volume of their dir
+@patch("app.core.scratch.SCRATCH_SMALL_JOB_MAX_BYTES", 100)
+@patch("app.core.scratch.get_previous_work_dir")
+def test_select_scratch_volume(mock_previous_dir, tmp_path):
+    mock_previous_dir.return_value = None
+    with (
+        patch("app.core.scratch.SCRATCH_PATH", str(tmp_path / "ssd")),
+        patch("app.core.scratch.SCRATCH_SMALL_JOB_PATH", str(tmp_path / "tmpfs")),
+    ):
+        assert select_scratch_volume("TEST-1", 50) == "small"
+        assert select_scratch_volume("TEST-1", 500) == "default"
+
+        mock_previous_dir.return_value = str(tmp_path / "ssd" / "TEST-1" / "jobs" / "a")
+        assert select_scratch_volume("TEST-1", 50) == "default"
+
+    # without a fast volume every job uses the default volume
+    mock_previous_dir.return_value = None
+    assert select_scratch_volume("TEST-1", 50) == "default"
+
+
+# jobs above the quota reserve the whole quota and get a dir on the volume
+@patch("app.core.scratch.SCRATCH_QUOTA_BYTES", 1000)
+@patch("app.core.scratch.get_job_work_dir")
+@patch("app.core.scratch.get_previous_work_dir", return_value=None)
+@patch("app.core.scratch.try_reserve", return_value=True)
+def test_allocate_job_scratch(mock_reserve, _, mock_get_work_dir, tmp_path):
+    mock_get_work_dir.return_value = str(tmp_path / "TEST-1" / "jobs" / "job1")
+
+    with patch("app.core.scratch.SCRATCH_PATH", str(tmp_path)):
+        work_dir, volume = asyncio.run(allocate_job_scratch("TEST-1", "job1", 5000))
+
+    assert (work_dir, volume) == (mock_get_work_dir.return_value, "default")
+    assert mock_reserve.call_args.args[1:4] == ("job1", 1000, 1000)
+    mock_get_work_dir.assert_called_once_with("TEST-1", "job1", str(tmp_path))
+
+
+# expired artifacts are deleted unless their ticket is being extracted
+@patch("app.core.scratch.SCRATCH_TTL_SECONDS", 3600)
+@patch("app.core.scratch.redis_client")
+def test_collect_scratch_garbage(mock_redis, tmp_path):
+    old = time.time() - 7200
+    for ticket_key, age in [("OLD-1", old), ("LOCKED-1", old), ("NEW-1", None)]:
+        job_dir = tmp_path / ticket_key / "jobs" / "job1"
+        job_dir.mkdir(parents=True)
+        (job_dir / "users.csv").write_text("username\na\n")
+        if age:
+            os.utime(job_dir / "users.csv", (age, age))
+            os.utime(job_dir, (age, age))
+    mock_redis.exists.side_effect = lambda key: key.endswith("LOCKED-1")
+
+    with patch("app.core.scratch.SCRATCH_PATH", str(tmp_path)):
+        result = collect_scratch_garbage()
+
+    assert result["removed_dirs"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["LOCKED-1", "NEW-1"]
+
+
+# delivered jobs leave no job dir behind, synced attachments are kept
+def test_remove_job_scratch(tmp_path):
+    job_dir = tmp_path / "TEST-1" / "jobs" / "job1"
+    attachment_dir = tmp_path / "TEST-1" / "attachments" / "10001"
+    job_dir.mkdir(parents=True)
+    attachment_dir.mkdir(parents=True)
+    (job_dir / "TEST-1.zip").write_bytes(b"zip")
+    (attachment_dir / "users.csv").write_text("username\na\n")
+
+    with patch("app.core.scratch.SCRATCH_PATH", str(tmp_path)):
+        remove_job_scratch("TEST-1", str(job_dir))
+
+    assert os.listdir(tmp_path / "TEST-1") == ["attachments"]
+    assert (attachment_dir / "users.csv").exists()
+
+
+# least recently used attachments of unlocked tickets are evicted until space is free
+@patch("app.core.scratch.shutil.disk_usage")
+@patch("app.core.scratch.redis_client")
+def test_evict_attachment_dirs(mock_redis, mock_disk_usage, tmp_path):
+    now = time.time()
+    for ticket_key, age in [("OLD-1", 300), ("LOCKED-1", 200), ("NEW-1", 100)]:
+        attachment_dir = tmp_path / ticket_key / "attachments" / "10001"
+        attachment_dir.mkdir(parents=True)
+        (attachment_dir / "users.csv").write_text("username\na\n")
+        for path in [attachment_dir / "users.csv", attachment_dir]:
+            os.utime(path, (now - age, now - age))
+    mock_redis.exists.side_effect = lambda key: key.endswith("LOCKED-1")
+    # enough space once the first attachment dir is gone
+    mock_disk_usage.side_effect = [MagicMock(free=0), MagicMock(free=100)]
+
+    freed_bytes = evict_attachment_dirs(str(tmp_path), 100)
+
+    assert freed_bytes == len("username\na\n")
+    assert sorted(os.listdir(tmp_path)) == ["LOCKED-1", "NEW-1"]
@@ -0,0 +1,186 @@
+# app/tests/test_slack_outbox.py
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.slack_outbox import (
+    coalesce_items,
+    drain_outbox,
+    recover_expired_senders,
+    redact_message,
+    send_channel_messages,
+)
+
+
+# create outbox item
+def make_item(text):
+    return {
+        "webhook_url": "https://hooks.slack.test/1",
+        "username": "Data Bot",
+        "icon_emoji": ":robot_face:",
+        "text": text,
+        "secrets": [],
+        "attempts": 0,
+        "next_attempt_at": 0,
+        "expires_at": time.time() + 60,
+    }
+
+
+# messages are joined until slack text length limit
+@patch("app.core.slack_outbox.SLACK_MAX_TEXT_LENGTH", 10)
+def test_coalesce_items():
+    items = [make_item("aaa"), make_item("bbb"), make_item("cccccc")]
+
+    messages = coalesce_items(items)
+
+    assert [[item["text"] for item in message] for message in messages] == [
+        ["aaa", "bbb"],
+        ["cccccc"],
+    ]
+
+
+# messages of one channel are sent as a single slack message
+@patch("app.core.slack_outbox.post_slack_message")
+@patch("app.core.slack_outbox.redis_client")
+def test_send_channel_messages_coalesces(mock_redis, mock_post):
+    mock_redis.set.return_value = True
+    mock_post.return_value = MagicMock(status_code=200)
+
+    retry_items = send_channel_messages(
+        "https://hooks.slack.test/1", [make_item("first"), make_item("second")]
+    )
+
+    assert retry_items == []
+    mock_post.assert_called_once()
+    assert mock_post.call_args.args[1] == "first\n\nsecond"
+
+
+# throttled messages are retried after Retry-After
+@patch("app.core.slack_outbox.post_slack_message")
+@patch("app.core.slack_outbox.redis_client")
+def test_send_channel_messages_rate_limited(mock_redis, mock_post):
+    mock_redis.set.return_value = True
+    mock_post.return_value = MagicMock(status_code=429, headers={"Retry-After": "30"})
+
+    retry_items = send_channel_messages(
+        "https://hooks.slack.test/1", [make_item("first")]
+    )
+
+    assert len(retry_items) == 1
+    assert retry_items[0]["attempts"] == 1
+    mock_redis.set.assert_called_with(mock_redis.set.call_args.args[0], 1, ex=30)
+
+
+# webhook used by another sender within rate limit window is skipped
+@patch("app.core.slack_outbox.post_slack_message")
+@patch("app.core.slack_outbox.redis_client")
+def test_send_channel_messages_respects_rate_limit(mock_redis, mock_post):
+    mock_redis.set.return_value = None
+    items = [make_item("first")]
+
+    assert send_channel_messages("https://hooks.slack.test/1", items) == items
+    mock_post.assert_not_called()
+
+
+# only messages of the failed slack message onwards are retried,
+# posts of one drain are spaced by the webhook rate limit
+@patch("app.core.slack_outbox.SLACK_MAX_TEXT_LENGTH", 10)
+@patch("app.core.slack_outbox.time.sleep")
+@patch("app.core.slack_outbox.post_slack_message")
+@patch("app.core.slack_outbox.redis_client")
+def test_send_channel_messages_retries_unsent_only(mock_redis, mock_post, mock_sleep):
+    mock_redis.set.return_value = True
+    mock_post.side_effect = [MagicMock(status_code=200), MagicMock(status_code=500)]
+
+    retry_items = send_channel_messages(
+        "https://hooks.slack.test/1",
+        [make_item("aaa"), make_item("bbb"), make_item("cccccc")],
+    )
+
+    assert mock_post.call_count == 2
+    assert [item["text"] for item in retry_items] == ["cccccc"]
+    mock_sleep.assert_called_once_with(1)
+
+
+# fractional Retry-After is honoured, unexpected errors are retried too
+@patch("app.core.slack_outbox.time.sleep")
+@patch("app.core.slack_outbox.post_slack_message")
+@patch("app.core.slack_outbox.redis_client")
+def test_send_channel_messages_unexpected_responses(mock_redis, mock_post, mock_sleep):
+    mock_redis.set.return_value = True
+    mock_post.return_value = MagicMock(status_code=429, headers={"Retry-After": "1.5"})
+
+    [retry_item] = send_channel_messages(
+        "https://hooks.slack.test/1", [make_item("first")]
+    )
+
+    assert retry_item["next_attempt_at"] >= time.time() + 1.5
+    mock_redis.set.assert_called_with(mock_redis.set.call_args.args[0], 1, ex=2)
+
+    mock_post.side_effect = ValueError("unexpected body")
+    [retry_item] = send_channel_messages(
+        "https://hooks.slack.test/1", [make_item("second")]
+    )
+    assert retry_item["attempts"] == 1
+
+
+# claimed messages go back to the outbox when a drain fails unexpectedly
+@patch("app.core.slack_outbox.send_claimed_messages")
+@patch("app.core.slack_outbox.redis_client")
+def test_drain_outbox_returns_claimed_messages_on_error(mock_redis, mock_send):
+    mock_redis.lmove.side_effect = ["message", None, "message", None]
+    mock_send.side_effect = RuntimeError("redis pipeline failed")
+
+    with pytest.raises(RuntimeError):
+        drain_outbox("host:1:live")
+
+    mock_redis.lmove.assert_called_with(
+        "slack:outbox:processing:host:1:live", "slack:outbox", "RIGHT", "LEFT"
+    )
+
+
+# secrets never reach the dead letter list
+def test_redact_message():
+    item = make_item("password: `s3cret`")
+    item["secrets"] = ["s3cret"]
+
+    redacted = redact_message(item)
+
+    assert redacted["text"] == "password: `[redacted]`"
+    assert redacted["secrets"] == []
+
+
+# only messages of senders whose lease expired are moved back to the outbox
+@patch("app.core.slack_outbox.redis_client")
+def test_recover_expired_senders(mock_redis):
+    mock_redis.zrangebyscore.return_value = ["host:1:dead"]
+    mock_redis.lmove.side_effect = ["message", None]
+
+    assert recover_expired_senders() == 1
+
+    mock_redis.lmove.assert_called_with(
+        "slack:outbox:processing:host:1:dead", "slack:outbox", "RIGHT", "LEFT"
+    )
+    mock_redis.zrem.assert_called_once_with("slack:outbox:senders", "host:1:dead")
+
+
+# messages past their ttl are dead-lettered redacted instead of sent
+@patch("app.core.slack_outbox.send_channel_messages")
+@patch("app.core.slack_outbox.redis_client")
+def test_drain_outbox_drops_expired_messages(mock_redis, mock_send):
+    item = make_item("password: `s3cret`")
+    item["secrets"] = ["s3cret"]
+    item["expires_at"] = time.time() - 1
+    mock_redis.lmove.side_effect = [json.dumps(item), None]
+
+    assert drain_outbox("host:1:live") == 0
+
+    mock_send.assert_not_called()
+    dead_letter = mock_redis.pipeline.return_value.rpush.call_args_list[0]
+    assert dead_letter.args[0] == "slack:outbox:dead"
+    assert "s3cret" not in dead_letter.args[1]
+    mock_redis.pipeline.return_value.lrem.assert_called_once_with(
+        "slack:outbox:processing:host:1:live", 1, json.dumps(item)
+    )
@@ -0,0 +1,30 @@
+# app/tests/test_throughput.py
+import json
+from unittest.mock import patch
+
+from app.core.throughput import get_recorded_throughput, record_throughput
+
+
+# small files are not recorded, they are dominated by fixed overhead
+@patch("app.core.throughput.redis_client")
+def test_record_throughput_skips_small_files(mock_redis):
+    record_throughput(10, 1.0)
+    mock_redis.pipeline.assert_not_called()
+
+    record_throughput(100000, 2.0)
+    pipe = mock_redis.pipeline.return_value
+    assert json.loads(pipe.lpush.call_args.args[1]) == {"rows": 100000, "seconds": 2.0}
+    pipe.ltrim.assert_called_once()
+
+
+# recorded throughput is weighted by rows, None until something was recorded
+@patch("app.core.throughput.redis_client")
+def test_get_recorded_throughput(mock_redis):
+    mock_redis.lrange.return_value = []
+    assert get_recorded_throughput() is None
+
+    mock_redis.lrange.return_value = [
+        json.dumps({"rows": 90000, "seconds": 1.0}),
+        json.dumps({"rows": 10000, "seconds": 1.0}),
+    ]
+    assert get_recorded_throughput() == 50000
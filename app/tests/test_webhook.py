@@ -0,0 +1,86 @@
+# app/tests/test_webhook.py
+import hashlib
+import hmac
+import json
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+# jira issue_updated payload moving ticket into approved status
+def make_payload(ticket_key, to_status="Request Approved"):
+    return {
+        "webhookEvent": "jira:issue_updated",
+        "issue": {"key": ticket_key},
+        "changelog": {
+            "items": [{"field": "status", "fromString": "To Do", "toString": to_status}]
+        },
+    }
+
+
+# post payload signed with the configured secret
+def post_signed(payload, secret=b"secret"):
+    body = json.dumps(payload).encode()
+    signature = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return client.post(
+        "/webhooks/jira",
+        content=body,
+        headers={"X-Hub-Signature": f"sha256={signature}"},
+    )
+
+
+# approved ticket is queued, second event for same ticket is deduped
+@patch("app.routers.webhook.JIRA_WEBHOOK_SECRET", "secret")
+@patch("app.routers.webhook.enqueue_extraction")
+def test_jira_webhook_queues_approved_ticket(mock_enqueue):
+    mock_enqueue.side_effect = [True, False]
+
+    first = post_signed(make_payload("DATA-1"))
+    second = post_signed(make_payload("DATA-1"))
+
+    assert first.status_code == 202
+    assert first.json()["status"] == "queued"
+    assert second.json()["status"] == "duplicate"
+    mock_enqueue.assert_called_with("DATA-1")
+
+
+# other status changes are ignored
+@patch("app.routers.webhook.JIRA_WEBHOOK_SECRET", "secret")
+@patch("app.routers.webhook.enqueue_extraction")
+def test_jira_webhook_ignores_other_transitions(mock_enqueue):
+    response = post_signed(make_payload("DATA-1", to_status="In Progress"))
+
+    assert response.json()["status"] == "ignored"
+    mock_enqueue.assert_not_called()
+
+
+# requests without valid signature are rejected
+@patch("app.routers.webhook.JIRA_WEBHOOK_SECRET", "secret")
+@patch("app.routers.webhook.enqueue_extraction")
+def test_jira_webhook_signature(mock_enqueue):
+    mock_enqueue.return_value = True
+    body = json.dumps(make_payload("DATA-1")).encode()
+
+    invalid = client.post(
+        "/webhooks/jira", content=body, headers={"X-Hub-Signature": "sha256=bad"}
+    )
+    unsigned = client.post("/webhooks/jira", content=body)
+    valid = post_signed(make_payload("DATA-1"))
+
+    assert invalid.status_code == 401
+    assert unsigned.status_code == 401
+    assert valid.json()["status"] == "queued"
+
+
+# every webhook is refused while no secret is configured
+@patch("app.routers.webhook.JIRA_WEBHOOK_SECRET", None)
+@patch("app.routers.webhook.enqueue_extraction")
+def test_jira_webhook_without_secret(mock_enqueue):
+    response = post_signed(make_payload("DATA-1"))
+
+    assert response.status_code == 503
+    mock_enqueue.assert_not_called()
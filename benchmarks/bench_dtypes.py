@@ -0,0 +1,130 @@
+"""
+Compare bytes per row of extraction dataframes with pandas default object
+strings and with arrow-backed strings and categorical pii columns.
+
+usage: python -m benchmarks.bench_dtypes [--rows 1000000]
+
+Uses SAMPLE_DATA_PATH (1M sample users) when it exists, otherwise generates
+users with the same columns.
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.config import PII_COLUMNS, SAMPLE_DATA_PATH, STRING_DTYPE
+from app.core.identifiers import LOOKUP_KEY_COLUMN
+from app.routers.data_extraction import join_pii_columns, read_attachment_file
+
+
+# sample users table, same columns as the users table in mysql
+def load_users(num_rows: int) -> pd.DataFrame:
+    if os.path.isfile(SAMPLE_DATA_PATH):
+        return pd.read_csv(SAMPLE_DATA_PATH, nrows=num_rows)
+
+    user_ids = np.arange(1, num_rows + 1)
+    return pd.DataFrame(
+        {
+            "user_id": user_ids,
+            "username": [f"user{i}" for i in user_ids],
+            "email": [f"user{i}@example.com" for i in user_ids],
+            "gender": np.random.default_rng(0).choice(["F", "M", "U"], num_rows),
+        }
+    )
+
+
+# rows returned by fetch_users_by_user_ids before this change
+def object_db_rows(users: pd.DataFrame) -> pd.DataFrame:
+    db_df = users[PII_COLUMNS].copy()
+    db_df.insert(0, LOOKUP_KEY_COLUMN, users["username"].astype(str))
+    return db_df
+
+
+# default dtypes: object strings and a left merge on a copied chunk
+def run_object_pipeline(attachment_path: str, users: pd.DataFrame):
+    file_df = pd.read_csv(attachment_path)
+    db_df = object_db_rows(users)
+    chunk_df = file_df.assign(**{LOOKUP_KEY_COLUMN: file_df["username"].astype(str)})
+    merged_df = chunk_df.merge(
+        db_df.drop(columns=["username"]), on=LOOKUP_KEY_COLUMN, how="left"
+    ).drop(columns=[LOOKUP_KEY_COLUMN])
+    return file_df, db_df, merged_df
+
+
+# compact dtypes: arrow strings, categorical pii columns, reindex join
+def run_compact_pipeline(attachment_path: str, users: pd.DataFrame):
+    file_df = read_attachment_file(attachment_path)
+    # fetch_users_by_user_ids reads arrow-backed columns straight from mysql
+    db_df = pd.DataFrame(
+        {
+            LOOKUP_KEY_COLUMN: users["username"].astype(STRING_DTYPE),
+            **{col: users[col].astype(STRING_DTYPE) for col in PII_COLUMNS},
+        }
+    )
+    merged_df = join_pii_columns(file_df, file_df["username"], db_df, "username")
+    return file_df, db_df, merged_df
+
+
+# bytes per row of each dataframe, elapsed time and peak rss growth in a fresh process
+def measure(pipeline, attachment_path: str, num_rows: int) -> dict:
+    users = load_users(num_rows)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    frames = pipeline(attachment_path, users)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    names = ["attachment", "db rows", "merged"]
+    return {
+        "bytes_per_row": {
+            name: df.memory_usage(index=True, deep=True).sum() / len(df)
+            for name, df in zip(names, frames, strict=True)
+        },
+        "elapsed": elapsed,
+        "peak_mb": (rss_after - rss_before) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    pipelines = {
+        "object dtypes": run_object_pipeline,
+        "compact dtypes": run_compact_pipeline,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # attachment lists every sample user once, in shuffled order
+        attachment_path = os.path.join(tmp_dir, "attachment.csv")
+        users = load_users(args.rows)
+        users[["username"]].sample(frac=1, random_state=0).assign(
+            request_reason="marketing campaign"
+        ).to_csv(attachment_path, index=False)
+        del users
+
+        print(f"{args.rows} rows")
+        for name, pipeline in pipelines.items():
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(
+                    measure, pipeline, attachment_path, args.rows
+                ).result()
+            sizes = "  ".join(
+                f"{frame} {size:6.1f}B/row"
+                for frame, size in result["bytes_per_row"].items()
+            )
+            print(
+                f"  {name:<15} {sizes}  {result['elapsed']:6.2f}s  "
+                f"peak rss +{result['peak_mb']:7.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
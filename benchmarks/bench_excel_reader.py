@@ -0,0 +1,77 @@
+"""
+Compare pandas default read_excel with the read-only streaming excel reader,
+read as a whole and batch by batch as the extraction consumes it.
+
+usage: python -m benchmarks.bench_excel_reader [--rows 100000 1000000]
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import Workbook
+
+from app.core.excel_reader import iter_excel_batches, read_excel_file
+
+
+# create xlsx workbook with username list, similar to jira attachments
+def create_workbook(file_path: str, num_rows: int):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["User ID", "request_reason", "requested_at"])
+    for i in range(num_rows):
+        sheet.append([f"user{i}", "marketing campaign", "2025-01-01"])
+    workbook.save(file_path)
+
+
+# rows of the workbook, holding only one batch at a time
+def count_batch_rows(file_path: str) -> int:
+    return sum(len(batch) for batch in iter_excel_batches(file_path))
+
+
+# measure elapsed time and peak memory growth of a reader in a fresh process
+def measure(reader, file_path: str) -> tuple[float, float, int]:
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = reader(file_path)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    row_count = result if isinstance(result, int) else len(result)
+    return elapsed, (rss_after - rss_before) / 1024, row_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    readers = {
+        "pandas read_excel": pd.read_excel,
+        "streaming reader": read_excel_file,
+        "streamed batches": count_batch_rows,
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in args.rows:
+            file_path = os.path.join(tmp_dir, f"users_{num_rows}.xlsx")
+            create_workbook(file_path, num_rows)
+            file_size = os.path.getsize(file_path) / 1024 / 1024
+            print(f"\n{num_rows} rows, file size {file_size:.1f}MB")
+
+            for name, reader in readers.items():
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    elapsed, peak_mb, row_count = executor.submit(
+                        measure, reader, file_path
+                    ).result()
+                print(
+                    f"  {name:<18} {elapsed:8.2f}s  peak rss +{peak_mb:8.1f}MB  "
+                    f"rows {row_count}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Check with EXPLAIN that the users lookups of the extraction are index-only,
+and time each lookup.
+
+usage: python -m benchmarks.bench_index_only [--keys 1000]
+
+Needs the MySQL from `docker compose up mysql` with migrations applied
+(`python -m app.core.migrations`). Exits with status 1 when a lookup reads rows.
+"""
+
+import argparse
+import sys
+import time
+
+from app.core.db_connection import get_read_connection
+from app.core.identifiers import IDENTIFIER_COLUMNS
+from app.routers.data_extraction import get_users_lookup_sql
+
+
+# sample keys of each identifier column, as an attachment would list them
+def sample_keys(conn, key_type: str, num_keys: int) -> list:
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {key_type} FROM users ORDER BY user_id LIMIT %s", (num_keys,)
+        )
+        keys = [row[0] for row in cursor.fetchall()]
+    return keys or [f"missing{i}" for i in range(num_keys)]
+
+
+# EXPLAIN the lookup, returns used index, access type and whether it reads rows
+def explain_lookup(conn, key_type: str, keys: list) -> dict:
+    with conn.cursor(dictionary=True) as cursor:
+        cursor.execute(
+            f"EXPLAIN {get_users_lookup_sql(key_type)}",
+            {"username_list": tuple(keys)},
+        )
+        plan = cursor.fetchall()[0]
+
+    extra = [item.strip() for item in (plan.get("Extra") or "").split(";")]
+    # "Using index condition" is index condition pushdown, rows are still read;
+    # the clustered primary key holds every column, so it never reads rows
+    is_index_only = "Using index" in extra or plan.get("key") == "PRIMARY"
+    return {
+        "key": plan.get("key"),
+        "type": plan.get("type"),
+        "extra": plan.get("Extra") or "",
+        "index_only": is_index_only,
+    }
+
+
+# elapsed seconds of the lookup itself
+def time_lookup(conn, key_type: str, keys: list) -> float:
+    start = time.perf_counter()
+    with conn.cursor() as cursor:
+        cursor.execute(get_users_lookup_sql(key_type), {"username_list": tuple(keys)})
+        cursor.fetchall()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=1000)
+    args = parser.parse_args()
+
+    conn = get_read_connection()
+    try:
+        failed = []
+        for key_type in IDENTIFIER_COLUMNS:
+            keys = sample_keys(conn, key_type, args.keys)
+            plan = explain_lookup(conn, key_type, keys)
+            elapsed = time_lookup(conn, key_type, keys)
+            status = "index-only" if plan["index_only"] else "READS ROWS"
+            print(
+                f"{key_type:<9} {status:<11} key {plan['key'] or '-':<24} "
+                f"type {plan['type'] or '-':<6} {elapsed * 1000:8.1f}ms  "
+                f"{plan['extra']}"
+            )
+            if not plan["index_only"]:
+                failed.append(key_type)
+    finally:
+        conn.close()
+
+    if failed:
+        print(f"lookups by {', '.join(failed)} are not index-only")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
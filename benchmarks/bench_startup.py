@@ -0,0 +1,105 @@
+"""
+Measure cold start of the FastAPI app: import time of app.main and time until
+the first /health response of a fresh uvicorn worker.
+
+usage: python -m benchmarks.bench_startup [--runs 5]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+# dependencies that should only be loaded by the extraction path
+HEAVY_MODULES = ["pandas", "numpy", "jira", "pyzipper", "requests", "openpyxl"]
+
+IMPORT_SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+# import app.main in a fresh interpreter, returns seconds and heavy modules loaded
+def measure_import() -> tuple[float, list[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    loaded = output[1].split(",") if len(output) > 1 else []
+    return float(output[0]), loaded
+
+
+# find a free local port for the uvicorn worker
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# start uvicorn and poll /health, returns seconds until the first 200 response
+def measure_first_health(timeout: float = 60) -> float:
+    port = get_free_port()
+    env = {
+        **os.environ,
+        "ENABLE_EXTRACTION_WORKER": "false",
+        "ENABLE_SLACK_SENDER": "false",
+        # framework cold start only, warm-up time depends on redis/mysql/jira
+        "ENABLE_STARTUP_WARM_UP": "false",
+        "RUN_MIGRATIONS_ON_STARTUP": "false",
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}/health", timeout=1
+                ) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health did not respond within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    import_results = [measure_import() for _ in range(args.runs)]
+    import_times = [elapsed for elapsed, _ in import_results]
+    loaded = sorted({m for _, modules in import_results for m in modules})
+    print(
+        f"import app.main     median {statistics.median(import_times):6.3f}s  "
+        f"min {min(import_times):6.3f}s"
+    )
+    print(f"  heavy modules loaded on import: {', '.join(loaded) or 'none'}")
+
+    health_times = [measure_first_health() for _ in range(args.runs)]
+    print(
+        f"first /health       median {statistics.median(health_times):6.3f}s  "
+        f"min {min(health_times):6.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
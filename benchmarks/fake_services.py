@@ -0,0 +1,226 @@
+"""
+Local fake Jira and Slack servers for load tests.
+
+Only the Jira REST endpoints used by the portal are implemented. Every response
+is delayed by a configurable latency, and a configurable share of requests fails
+with 500 (or 429 with Retry-After when throttle=True), so the app can be driven
+without a Jira Cloud tenant.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from app.config import JIRA_APPROVE_TRANSITION_NAME, JIRA_PII_FIELD
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        handler,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        throttle: bool = False,
+    ):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle = throttle
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    # serve requests in a daemon thread until shutdown()
+    def start(self) -> "FakeServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body=None, headers: dict | None = None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # simulated network and server time, plus injected failures
+    def delay_or_fail(self) -> bool:
+        # request body is always drained, so keep-alive connections stay usable
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+
+        server = self.server
+        time.sleep(max(server.latency + random.uniform(-1, 1) * server.jitter, 0))
+        if random.random() >= server.error_rate:
+            return False
+        if server.throttle:
+            self.send_json(
+                429, {"errorMessages": ["rate limited"]}, {"Retry-After": "1"}
+            )
+        else:
+            self.send_json(500, {"errorMessages": ["injected failure"]})
+        return True
+
+
+class FakeSlackHandler(FakeHandler):
+    def do_POST(self):
+        if self.delay_or_fail():
+            return
+        payload = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeJiraHandler(FakeHandler):
+    """
+    Tickets DATA-1 .. DATA-<num_tickets> are PII tickets, each with one csv
+    attachment of <attachment_rows> usernames (user1 .. userN of the sample data).
+    """
+
+    num_tickets = 50
+    attachment_rows = 1000
+
+    def issue_json(self, key: str) -> dict:
+        base = self.server.url
+        number = int(key.rsplit("-", 1)[-1])
+        attachment_id = str(20000 + number)
+        return {
+            "id": str(10000 + number),
+            "key": key,
+            "self": f"{base}/rest/api/2/issue/{10000 + number}",
+            "fields": {
+                "summary": f"PII data request {number}",
+                "status": {"name": "To Do"},
+                JIRA_PII_FIELD: {"value": "Y"},
+                "attachment": [
+                    {
+                        "id": attachment_id,
+                        "self": f"{base}/rest/api/2/attachment/{attachment_id}",
+                        "filename": "users.csv",
+                        "size": len(self.attachment_csv()),
+                        "content": f"{base}/secure/attachment/{attachment_id}/users.csv",
+                    }
+                ],
+            },
+        }
+
+    def attachment_csv(self) -> bytes:
+        rows = "\n".join(f"user{i}" for i in range(1, self.attachment_rows + 1))
+        return f"username\n{rows}\n".encode()
+
+    def search_page(self, max_results: int, next_page_token: str | None) -> dict:
+        start = int(next_page_token or 0)
+        end = min(start + max_results, self.num_tickets)
+        keys = [
+            f"DATA-{n}"
+            for n in range(self.num_tickets - start, self.num_tickets - end, -1)
+        ]
+        page = {
+            "issues": [self.issue_json(key) for key in keys],
+            "isLast": end >= self.num_tickets,
+        }
+        if not page["isLast"]:
+            page["nextPageToken"] = str(end)
+        return page
+
+    def do_GET(self):
+        if self.delay_or_fail():
+            return
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        if path.endswith("/serverInfo"):
+            return self.send_json(
+                200,
+                {
+                    "baseUrl": self.server.url,
+                    "version": "1001.0.0",
+                    "versionNumbers": [1001, 0, 0],
+                    "deploymentType": "Cloud",
+                },
+            )
+        if path.endswith("/myself"):
+            return self.send_json(200, {"emailAddress": "analyst@example.com"})
+        if path.endswith("/group/member"):
+            return self.send_json(
+                200, {"values": [{"emailAddress": "analyst@example.com"}]}
+            )
+        if path.endswith("/search/jql"):
+            return self.send_json(
+                200,
+                self.search_page(
+                    int(query.get("maxResults", ["50"])[0]),
+                    query.get("nextPageToken", [None])[0],
+                ),
+            )
+        if path.endswith("/search"):
+            return self.send_json(
+                200,
+                {
+                    "startAt": 0,
+                    "maxResults": 0,
+                    "total": self.num_tickets,
+                    "issues": [],
+                },
+            )
+        if re.search(r"/issue/[A-Z]+-\d+/transitions$", path):
+            return self.send_json(
+                200,
+                {"transitions": [{"id": "31", "name": JIRA_APPROVE_TRANSITION_NAME}]},
+            )
+        if match := re.search(r"/issue/([A-Z]+-\d+)$", path):
+            return self.send_json(200, self.issue_json(match.group(1)))
+        if path.startswith("/secure/attachment/"):
+            payload = self.attachment_csv()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        # anything else the client asks for on startup, e.g. field lists
+        return self.send_json(200, [])
+
+    def do_POST(self):
+        if self.delay_or_fail():
+            return
+        path = urlparse(self.path).path
+
+        if path.endswith("/transitions"):
+            return self.send_json(204)
+        if path.endswith("/comment"):
+            return self.send_json(201, {"id": "1", "body": "comment"})
+        if path.endswith("/attachments"):
+            return self.send_json(
+                200, [{"id": "30001", "filename": "data.zip", "size": len(self.body)}]
+            )
+        if path.endswith("/search/jql"):
+            params = json.loads(self.body or b"{}")
+            return self.send_json(
+                200,
+                self.search_page(
+                    int(params.get("maxResults", 50)), params.get("nextPageToken")
+                ),
+            )
+        return self.send_json(200, {})
@@ -0,0 +1,227 @@
+"""
+Drive concurrent analyst sessions against the portal and report latency
+percentiles and error rates per route as concurrency grows.
+
+Every session logs in, opens the menu, pages through /data_extraction, approves
+a ticket, extracts it and logs out. Jira and Slack are local fake servers with
+configurable latency (benchmarks/fake_services.py); Redis and MySQL are the local
+instances configured by REDIS_URL / MYSQL_* (e.g. `docker compose up redis mysql`
+with REDIS_URL=redis://localhost:6379/0).
+
+usage: python -m benchmarks.loadtest [--concurrency 1 5 10 20] [--sessions 3]
+                                     [--jira-latency 0.2] [--error-rate 0.01]
+                                     [--workers 1] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from app.config import JIRA_TICKETS_PER_PAGE
+from benchmarks.bench_startup import get_free_port
+from benchmarks.fake_services import FakeJiraHandler, FakeServer, FakeSlackHandler
+
+
+# start uvicorn against the fake services and wait until /health answers
+def start_app(jira_url: str, slack_url: str, workers: int) -> tuple:
+    port = get_free_port()
+    env = {
+        **os.environ,
+        "JIRA_BASE_URL": jira_url,
+        "SLACK_WEBHOOK_URL": f"{slack_url}/services/loadtest",
+        "ENABLE_EXTRACTION_WORKER": "false",
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise TimeoutError("app did not start within 60s")
+
+
+# nearest-rank percentile of sorted latencies
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return math.nan
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+class SessionRecorder:
+    """Latency and outcome of every request, keyed by route template."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    async def request(
+        self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            is_error = response.status_code >= 400
+        except httpx.HTTPError:
+            response, is_error = None, True
+        self.samples[route].append((time.perf_counter() - start, is_error))
+        return response
+
+    def summary(self) -> dict:
+        summary = {}
+        for route, samples in sorted(self.samples.items()):
+            latencies = sorted(latency for latency, _ in samples)
+            errors = sum(is_error for _, is_error in samples)
+            summary[route] = {
+                "requests": len(samples),
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "error_rate": errors / len(samples),
+            }
+        return summary
+
+
+# one analyst session, ticket_no spreads sessions over tickets to avoid lock conflicts
+async def run_session(
+    base_url: str, recorder: SessionRecorder, ticket_no: int, pages: int, extract: bool
+):
+    ticket_key = f"DATA-{ticket_no}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        response = await recorder.request(
+            client,
+            "POST /login",
+            "POST",
+            "/login",
+            data={"email": "analyst@example.com", "jira_api_token": "token"},
+        )
+        if response is None or "session_id" not in response.cookies:
+            return
+
+        await recorder.request(client, "GET /menu", "GET", "/menu")
+        for page in range(pages):
+            params = {"page": page + 1}
+            if page:
+                params["next_page_token"] = str(page * JIRA_TICKETS_PER_PAGE)
+            await recorder.request(
+                client, "GET /data_extraction", "GET", "/data_extraction", params=params
+            )
+
+        await recorder.request(
+            client, "POST /approve/{ticket_id}", "POST", f"/approve/{ticket_key}"
+        )
+        if extract:
+            await recorder.request(
+                client, "POST /extract/{ticket_key}", "POST", f"/extract/{ticket_key}"
+            )
+        await recorder.request(client, "GET /logout", "GET", "/logout")
+
+
+# run `concurrency` virtual users, each running `sessions` sessions back to back
+async def run_level(
+    base_url: str, concurrency: int, sessions: int, pages: int, extract: bool
+) -> dict:
+    recorder = SessionRecorder()
+
+    async def virtual_user(user_no: int):
+        for session_no in range(sessions):
+            ticket_no = (user_no * sessions + session_no) % FakeJiraHandler.num_tickets
+            await run_session(base_url, recorder, ticket_no + 1, pages, extract)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"elapsed": elapsed, "routes": recorder.summary()}
+
+
+def print_level(concurrency: int, result: dict):
+    print(f"\nconcurrency {concurrency}, {result['elapsed']:.1f}s")
+    print(
+        f"  {'route':<28} {'requests':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}"
+    )
+    for route, stats in result["routes"].items():
+        print(
+            f"  {route:<28} {stats['requests']:>8} {stats['p50']:>7.3f}s "
+            f"{stats['p95']:>7.3f}s {stats['p99']:>7.3f}s {stats['error_rate']:>6.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--sessions", type=int, default=3, help="sessions per user")
+    parser.add_argument("--pages", type=int, default=3, help="ticket list pages")
+    parser.add_argument("--jira-latency", type=float, default=0.2)
+    parser.add_argument("--jira-jitter", type=float, default=0.05)
+    parser.add_argument("--slack-latency", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle", action="store_true", help="fail with 429")
+    parser.add_argument("--attachment-rows", type=int, default=1000)
+    parser.add_argument("--no-extract", action="store_true")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    FakeJiraHandler.attachment_rows = args.attachment_rows
+    jira_server = FakeServer(
+        FakeJiraHandler,
+        latency=args.jira_latency,
+        jitter=args.jira_jitter,
+        error_rate=args.error_rate,
+        throttle=args.throttle,
+    ).start()
+    slack_server = FakeServer(
+        FakeSlackHandler, latency=args.slack_latency, jitter=0
+    ).start()
+    process, base_url = start_app(jira_server.url, slack_server.url, args.workers)
+
+    results = {}
+    try:
+        for concurrency in args.concurrency:
+            result = asyncio.run(
+                run_level(
+                    base_url,
+                    concurrency,
+                    args.sessions,
+                    args.pages,
+                    not args.no_extract,
+                )
+            )
+            print_level(concurrency, result)
+            results[concurrency] = result
+    finally:
+        process.terminate()
+        process.wait()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()